@@ -8,7 +8,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database import Base, DATABASE_URL
-from models import Contact, CallLog, Callback, Booking
+import models  # noqa: F401  (registers every table on Base.metadata)
 
 config = context.config
 
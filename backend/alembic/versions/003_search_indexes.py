@@ -0,0 +1,45 @@
+"""Add trigram search indexes on contacts and targets
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must match CONTACT_DOCUMENT / TARGET_DOCUMENT in search.py
+CONTACT_DOCUMENT = (
+    "coalesce(care_home_name, '') || ' ' || coalesce(contact_person, '') || ' ' || "
+    "coalesce(telephone, '') || ' ' || coalesce(email, '') || ' ' || coalesce(postcode, '')"
+)
+TARGET_DOCUMENT = (
+    "coalesce(care_home_name, '') || ' ' || coalesce(telephone, '') || ' ' || coalesce(notes, '')"
+)
+
+
+def upgrade() -> None:
+    # pg_trgm is Postgres-only; other databases use the in-memory index in search.py
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(f"CREATE INDEX IF NOT EXISTS ix_contacts_search_trgm ON contacts USING gin (({CONTACT_DOCUMENT}) gin_trgm_ops)")
+    # Databases from before the targets table get this index in 006
+    if sa.inspect(op.get_bind()).has_table('targets'):
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_targets_search_trgm ON targets USING gin (({TARGET_DOCUMENT}) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_targets_search_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_contacts_search_trgm")
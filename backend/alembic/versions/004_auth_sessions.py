@@ -0,0 +1,35 @@
+"""Add auth_sessions table for database-backed login sessions
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Older releases may already have created the table via create_all at startup
+    if sa.inspect(op.get_bind()).has_table('auth_sessions'):
+        return
+    op.create_table(
+        'auth_sessions',
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('token_hash')
+    )
+    op.create_index('ix_auth_sessions_expires_at', 'auth_sessions', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_auth_sessions_expires_at', table_name='auth_sessions')
+    op.drop_table('auth_sessions')
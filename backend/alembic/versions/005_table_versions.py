@@ -0,0 +1,41 @@
+"""Add table_versions counters for ETags
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must match VERSIONED_TABLES in etags.py
+VERSIONED_TABLES = ['contacts', 'call_logs', 'callbacks', 'bookings', 'targets']
+
+
+def upgrade() -> None:
+    # Older releases may already have created the table via create_all at startup
+    if not sa.inspect(op.get_bind()).has_table('table_versions'):
+        op.create_table(
+            'table_versions',
+            sa.Column('table_name', sa.String(length=64), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('table_name')
+        )
+    table_versions = sa.table('table_versions', sa.column('table_name', sa.String), sa.column('version', sa.Integer))
+    existing = {row[0] for row in op.get_bind().execute(sa.select(table_versions.c.table_name))}
+    missing = [{'table_name': name, 'version': 0} for name in VERSIONED_TABLES if name not in existing]
+    if missing:
+        op.bulk_insert(table_versions, missing)
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
@@ -0,0 +1,108 @@
+"""Bring databases created before 001 (or by create_all) up to the current models
+
+Replaces the ALTER TABLE statements main.py used to run on every startup. Every step
+checks the live schema first, so this is safe on a database that already has some or
+all of these changes.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column) added to the models after their table first shipped; the foreign keys
+# get the names Postgres gave the ones the old startup ALTERs created. Built fresh on each
+# call, since a Column can only be added to one table.
+def new_columns():
+    return [
+        ('contacts', sa.Column('address', sa.Text(), nullable=True)),
+        ('contacts', sa.Column('postcode', sa.String(20), nullable=True)),
+        ('contacts', sa.Column('website', sa.String(255), nullable=True)),
+        ('bookings', sa.Column('contact_id', sa.Integer(), sa.ForeignKey('contacts.id', name='bookings_contact_id_fkey'), nullable=True)),
+        ('bookings', sa.Column('booking_from', sa.DateTime(), nullable=True)),
+        ('bookings', sa.Column('booking_to', sa.DateTime(), nullable=True)),
+        ('bookings', sa.Column('more_info', sa.Text(), nullable=True)),
+        ('callbacks', sa.Column('target_id', sa.Integer(), sa.ForeignKey('targets.id', name='callbacks_target_id_fkey'), nullable=True)),
+    ]
+
+
+# Columns of the old bookings schema
+OLD_COLUMNS = [
+    ('bookings', 'booking_date'),
+    ('bookings', 'venue'),
+]
+
+# Indexes 002 skips while their table or column is still missing (same names as 002)
+INDEXES = [
+    ('ix_targets_care_home_name', 'targets', ['care_home_name']),
+    ('ix_callbacks_target_id', 'callbacks', ['target_id']),
+    ('ix_bookings_contact_id', 'bookings', ['contact_id']),
+    ('ix_bookings_booking_from_booking_to', 'bookings', ['booking_from', 'booking_to']),
+    ('ix_bookings_fee_status_booking_from', 'bookings', ['fee_status', 'booking_from']),
+]
+
+# Must match TARGET_DOCUMENT in search.py (and 003, which skips it while targets is missing)
+TARGET_DOCUMENT = (
+    "coalesce(care_home_name, '') || ' ' || coalesce(telephone, '') || ' ' || coalesce(notes, '')"
+)
+
+
+def _columns(table: str) -> dict:
+    # A fresh inspector each time: the schema changes between steps
+    return {column['name']: column for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if not sa.inspect(bind).has_table('targets'):
+        op.create_table('targets',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('care_home_name', sa.String(255), nullable=False),
+            sa.Column('telephone', sa.String(50), nullable=True),
+            sa.Column('notes', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_targets_id', 'targets', ['id'])
+
+    for table, column in new_columns():
+        if column.name not in _columns(table):
+            # batch mode, so SQLite (which cannot add a foreign key in place) copies the table
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(column)
+
+    # Old bookings rows from before contact_id/booking_from/booking_to cannot be shown
+    op.execute("DELETE FROM bookings WHERE contact_id IS NULL OR booking_from IS NULL OR booking_to IS NULL")
+
+    for table, name in OLD_COLUMNS:
+        if name in _columns(table):
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.drop_column(name)
+
+    # Callbacks can belong to a target instead of a contact
+    if not _columns('callbacks')['contact_id']['nullable']:
+        with op.batch_alter_table('callbacks') as batch_op:
+            batch_op.alter_column('contact_id', existing_type=sa.Integer(), nullable=True)
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_targets_search_trgm ON targets USING gin (({TARGET_DOCUMENT}) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    # The old columns and rows are gone; there is nothing to put back
+    pass
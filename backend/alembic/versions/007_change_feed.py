@@ -0,0 +1,47 @@
+"""Add updated_at columns and the tombstones table for the change feed
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must match SYNCED_TABLES in changes.py
+SYNCED_TABLES = ['contacts', 'call_logs', 'callbacks', 'bookings', 'targets']
+
+
+def upgrade() -> None:
+    # Existing rows keep a NULL updated_at: clients pick them up with their first full load
+    for table in SYNCED_TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'])
+
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('table_name', sa.String(length=64), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_deleted_at', 'tombstones', ['deleted_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tombstones_deleted_at', table_name='tombstones')
+    op.drop_table('tombstones')
+    for table in reversed(SYNCED_TABLES):
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
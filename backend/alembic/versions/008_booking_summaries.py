@@ -0,0 +1,68 @@
+"""Add booking_summaries for the revenue report
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+import sqlalchemy as sa
+
+
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The feestatus type 001 created for bookings (on PostgreSQL it already exists)
+FEE_STATUS = sa.Enum('UNPAID', 'INVOICED', 'PAID', name='feestatus').with_variant(
+    postgresql.ENUM('UNPAID', 'INVOICED', 'PAID', name='feestatus', create_type=False), 'postgresql'
+)
+
+
+def upgrade() -> None:
+    summaries = op.create_table(
+        'booking_summaries',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('fee_status', FEE_STATUS, nullable=False),
+        sa.Column('contact_id', sa.Integer(), nullable=False),
+        sa.Column('booking_count', sa.Integer(), nullable=False),
+        sa.Column('fee_total', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('month', 'fee_status', 'contact_id')
+    )
+    op.create_index('ix_booking_summaries_contact_id_month', 'booking_summaries', ['contact_id', 'month'])
+
+    # Fill it from the existing bookings (the same totals as `python reports.py rebuild`)
+    bookings = sa.table(
+        'bookings',
+        sa.column('booking_from', sa.DateTime),
+        sa.column('fee_status', sa.String),
+        sa.column('contact_id', sa.Integer),
+        sa.column('fee_agreed', sa.Numeric),
+    )
+    totals = {}
+    rows = op.get_bind().execute(
+        sa.select(bookings.c.booking_from, bookings.c.fee_status, bookings.c.contact_id, bookings.c.fee_agreed)
+    )
+    for booking_from, fee_status, contact_id, fee_agreed in rows:
+        month = date(booking_from.year, booking_from.month, 1)
+        # Each booking counts towards its contact's row and the all-contacts (contact_id 0) row
+        for key in ((month, fee_status, contact_id), (month, fee_status, 0)):
+            count, amount = totals.get(key, (0, Decimal(0)))
+            totals[key] = (count + 1, amount + (Decimal(str(fee_agreed)) if fee_agreed is not None else Decimal(0)))
+    if totals:
+        op.bulk_insert(summaries, [
+            {'month': month, 'fee_status': fee_status, 'contact_id': contact_id, 'booking_count': count, 'fee_total': amount}
+            for (month, fee_status, contact_id), (count, amount) in totals.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_booking_summaries_contact_id_month', table_name='booking_summaries')
+    op.drop_table('booking_summaries')
@@ -0,0 +1,33 @@
+"""Add a GiST index on booking periods for overlap checks and availability
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must match BOOKING_PERIOD in availability.py
+BOOKING_PERIOD = "tsrange(booking_from, greatest(booking_from, booking_to), '[)')"
+
+
+def upgrade() -> None:
+    # Range types are Postgres-only; other databases use the in-memory index in availability.py
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(f"CREATE INDEX IF NOT EXISTS ix_bookings_period_gist ON bookings USING gist (({BOOKING_PERIOD}))")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_bookings_period_gist")
@@ -0,0 +1,49 @@
+"""Replace updated_at with change_version for the change feed
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must match SYNCED_TABLES in changes.py
+SYNCED_TABLES = ['contacts', 'call_logs', 'callbacks', 'bookings', 'targets']
+
+
+def upgrade() -> None:
+    # Existing rows get version 0: clients have them from their first full load. A NULL
+    # would mean "written by a transaction that has not committed yet" (see changes.py).
+    for table in SYNCED_TABLES + ['tombstones']:
+        op.add_column(table, sa.Column('change_version', sa.Integer(), nullable=True))
+        op.execute(f"UPDATE {table} SET change_version = 0")
+
+    for table in SYNCED_TABLES:
+        op.create_index(f'ix_{table}_change_version', table, ['change_version'])
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
+    op.create_index('ix_tombstones_table_name_change_version', 'tombstones', ['table_name', 'change_version'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tombstones_table_name_change_version', table_name='tombstones')
+    with op.batch_alter_table('tombstones') as batch_op:
+        batch_op.drop_column('change_version')
+
+    for table in reversed(SYNCED_TABLES):
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'])
+        op.drop_index(f'ix_{table}_change_version', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('change_version')
@@ -1,11 +1,24 @@
 import os
-import hashlib
 import secrets
 
+from session_store import DatabaseSessionBackend, MemorySessionBackend, SignedTokenBackend
+
 # Get password from environment variable (set this in Railway)
 # Default is "elise123" for development - CHANGE THIS IN PRODUCTION
 CRM_PASSWORD = os.getenv("CRM_PASSWORD", "elise123")
 
+# Where sessions are kept: "memory" (default, per process), "database" (shared by
+# all workers, survives restarts) or "signed" (stateless HMAC-signed tokens)
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory").strip().lower()
+SESSION_TTL = int(os.getenv("SESSION_TTL", str(7 * 24 * 3600)))          # seconds a login lasts
+SESSION_SWEEP_INTERVAL = int(os.getenv("SESSION_SWEEP_INTERVAL", "300"))  # memory: seconds between sweeps
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "1024"))         # database: tokens kept in the LRU cache
+SESSION_CACHE_TTL = int(os.getenv("SESSION_CACHE_TTL", "60"))             # database: seconds before re-checking a token
+
+# Signing key for SESSION_BACKEND=signed, required for it. Every worker must be given the
+# same one; changing it logs everyone out
+SESSION_SECRET = os.getenv("SESSION_SECRET", "")
+
 
 def verify_password(password: str) -> bool:
     """
@@ -15,33 +28,34 @@ def verify_password(password: str) -> bool:
     return secrets.compare_digest(password, CRM_PASSWORD)
 
 
-def generate_session_token() -> str:
-    """
-    Generate a secure random session token.
-    """
-    return secrets.token_urlsafe(32)
+def make_session_backend():
+    if SESSION_BACKEND == "memory":
+        return MemorySessionBackend(SESSION_TTL, sweep_interval=SESSION_SWEEP_INTERVAL)
+    if SESSION_BACKEND == "database":
+        return DatabaseSessionBackend(SESSION_TTL, cache_size=SESSION_CACHE_SIZE, cache_ttl=SESSION_CACHE_TTL)
+    if SESSION_BACKEND == "signed":
+        if not SESSION_SECRET:
+            raise ValueError(
+                "SESSION_BACKEND=signed needs SESSION_SECRET "
+                "(generate one with: python -c \"import secrets; print(secrets.token_hex(32))\")"
+            )
+        return SignedTokenBackend(SESSION_TTL, SESSION_SECRET.encode("utf-8"))
+    raise ValueError(f"Unknown SESSION_BACKEND {SESSION_BACKEND!r} (expected memory, database or signed)")
 
 
-# Simple in-memory session storage
-# In production, you might want to use Redis or database storage
-active_sessions: set = set()
+session_backend = make_session_backend()
 
 
-def create_session() -> str:
+async def create_session() -> str:
     """Create a new session and return the token"""
-    token = generate_session_token()
-    active_sessions.add(token)
-    return token
+    return await session_backend.create()
 
 
-def validate_session(token: str) -> bool:
+async def validate_session(token: str) -> bool:
     """Check if a session token is valid"""
-    return token in active_sessions
+    return await session_backend.validate(token)
 
 
-def invalidate_session(token: str) -> bool:
+async def invalidate_session(token: str) -> bool:
     """Remove a session token (logout)"""
-    if token in active_sessions:
-        active_sessions.remove(token)
-        return True
-    return False
+    return await session_backend.invalidate(token)
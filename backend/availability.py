@@ -0,0 +1,231 @@
+"""
+Booking overlap checks and free slots for GET /api/availability.
+
+Bookings are half-open periods [booking_from, booking_to): one may start the minute the
+previous one ends. Finding the bookings that overlap a period never scans the table:
+
+- PostgreSQL: a GiST index on BOOKING_PERIOD (alembic revision 009) answers `&&` queries,
+  inside the transaction of the write being checked.
+- Other databases: IntervalIndex, in-memory lists of bookings sorted by start. It is built
+  from the database on first use and kept current by committed booking writes, the same
+  way search.py keeps its trigram index.
+
+Both are O(log n) plus the bookings found. Overlaps are checked by the write handlers
+rather than enforced by an exclusion constraint, because existing data may already contain
+double bookings. A handler holds booking_period_lock() from the check until its commit, so
+two writes can never both pass the check: on PostgreSQL a transaction-level advisory lock,
+elsewhere an asyncio lock in this process.
+
+The in-memory index lives in this process and only hears about bookings written by it.
+With several workers, one worker does not see another's bookings, so off PostgreSQL run a
+single worker.
+"""
+from bisect import bisect_left, insort
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import event, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import object_session
+from typing import Optional
+import asyncio
+import math
+import threading
+
+from events import on_commit
+from models import Booking
+from search import is_postgres
+
+# The expression the GiST index in alembic revision 009 is built on; the two must match.
+# tsrange() rejects a lower bound above the upper one, so a booking saved ending before it
+# starts (possible before these checks) counts as an empty period instead of failing.
+BOOKING_PERIOD = "tsrange(booking_from, greatest(booking_from, booking_to), '[)')"
+
+BOOKING_PERIODS_KEY = "booking_periods"  # Session.info: {booking id: (from, to), or None if deleted}
+
+# pg_advisory_xact_lock key taken by booking writes that check their period (any fixed number)
+BOOKING_LOCK_KEY = 7301
+
+
+# ============== In-Memory Index (non-Postgres) ==============
+
+def duration_class(start: datetime, end: datetime) -> int:
+    """Bookings of class k last under 2**k seconds (and at least half that)"""
+    return math.ceil((end - start).total_seconds()).bit_length()
+
+
+class IntervalIndex:
+    """
+    Booking periods sorted by start, in one list per duration class. Within a class,
+    bookings that overlap [start, end) all start before end and no earlier than start minus
+    the class's longest duration, so one bisect per class finds the first candidate and the
+    scan stops at the first booking starting after end. A long booking only widens the
+    search of its own class, where the bookings are as long as it is and (without double
+    bookings) only a few fit in the window.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = asyncio.Lock()
+        self._built = False
+        self._starts = {}   # duration class -> sorted (booking_from, id)
+        self._periods = {}  # id -> (booking_from, booking_to)
+
+    # insort and del shift the rest of a class's list along, but that is a memmove of
+    # pointers: far cheaper than the database write each one follows
+    def _add(self, booking_id: int, start: datetime, end: datetime):
+        self._periods[booking_id] = (start, end)
+        # A booking ending before it starts is an empty period, as on Postgres
+        if end > start:
+            insort(self._starts.setdefault(duration_class(start, end), []), (start, booking_id))
+
+    def _remove(self, booking_id: int):
+        period = self._periods.pop(booking_id, None)
+        if period is not None and period[1] > period[0]:
+            key = duration_class(*period)
+            starts = self._starts[key]
+            del starts[bisect_left(starts, (period[0], booking_id))]
+            if not starts:
+                del self._starts[key]
+
+    async def _build(self, db: AsyncSession):
+        """Load every booking's period, then swap them in under the lock"""
+        rows = (await db.execute(select(Booking.id, Booking.booking_from, Booking.booking_to))).all()
+        starts, periods = {}, {}
+        for booking_id, start, end in rows:
+            periods[booking_id] = (start, end)
+            if end > start:
+                starts.setdefault(duration_class(start, end), []).append((start, booking_id))
+        for class_starts in starts.values():
+            class_starts.sort()
+        with self._lock:
+            self._starts, self._periods = starts, periods
+            self._built = True
+
+    def apply_changes(self, changes: dict):
+        """Commit hook: bring the index up to date with committed booking writes"""
+        with self._lock:
+            if not self._built:
+                return  # picked up when the index is first built
+            for booking_id, period in changes.items():
+                self._remove(booking_id)
+                if period is not None:
+                    self._add(booking_id, *period)
+
+    def reset(self):
+        """Forget everything; the index is rebuilt on next use (e.g. after a bulk load)"""
+        with self._lock:
+            self._starts, self._periods = {}, {}
+            self._built = False
+
+    async def overlapping(self, db: AsyncSession, start: datetime, end: datetime) -> list:
+        """[(id, from, to)] of the bookings overlapping [start, end), ordered by start"""
+        if not self._built:
+            async with self._build_lock:
+                if not self._built:
+                    await self._build(db)
+
+        with self._lock:
+            found = []
+            for key, starts in self._starts.items():
+                position = bisect_left(starts, (start - timedelta(seconds=2 ** key),))
+                # Index from the candidate on, rather than slicing, which would copy the tail
+                for index in range(position, len(starts)):
+                    booking_from, booking_id = starts[index]
+                    if booking_from >= end:
+                        break
+                    booking_to = self._periods[booking_id][1]
+                    if booking_to > start:
+                        found.append((booking_id, booking_from, booking_to))
+            return sorted(found, key=lambda period: (period[1], period[0]))
+
+
+interval_index = IntervalIndex()
+on_commit(BOOKING_PERIODS_KEY, interval_index.apply_changes)
+
+
+def _note(booking: Booking, period: Optional[tuple]):
+    session = object_session(booking)
+    if session is not None:
+        session.info.setdefault(BOOKING_PERIODS_KEY, {})[booking.id] = period
+
+
+@event.listens_for(Booking, "after_insert")
+@event.listens_for(Booking, "after_update")
+def _booking_written(mapper, connection, booking):
+    _note(booking, (booking.booking_from, booking.booking_to))
+
+
+@event.listens_for(Booking, "after_delete")
+def _booking_deleted(mapper, connection, booking):
+    _note(booking, None)
+
+
+# ============== Queries ==============
+
+async def booked_periods(db: AsyncSession, start: datetime, end: datetime) -> list:
+    """[(id, from, to)] of the bookings overlapping [start, end), ordered by start"""
+    if is_postgres():
+        rows = await db.execute(
+            select(Booking.id, Booking.booking_from, Booking.booking_to)
+            .filter(literal_column(BOOKING_PERIOD).op("&&")(func.tsrange(start, end, "[)")))
+            .order_by(Booking.booking_from, Booking.id)
+        )
+        return [tuple(row) for row in rows]
+
+    # This session's own writes (e.g. an autoflushed update of the booking being checked)
+    # are not committed yet, so the index has not seen them
+    pending = db.info.get(BOOKING_PERIODS_KEY, {})
+    periods = [period for period in await interval_index.overlapping(db, start, end) if period[0] not in pending]
+    periods += [
+        (booking_id, period[0], period[1]) for booking_id, period in pending.items()
+        if period is not None and period[0] < end and period[1] > max(start, period[0])
+    ]
+    return sorted(periods, key=lambda period: (period[1], period[0]))
+
+
+_period_lock = asyncio.Lock()
+
+
+@asynccontextmanager
+async def booking_period_lock(db: AsyncSession):
+    """Hold from check_booking_period() until the write has committed, so that concurrent
+    writes are checked one after another and each sees the bookings committed before it"""
+    if is_postgres():
+        # Released when the transaction commits or rolls back
+        await db.execute(select(func.pg_advisory_xact_lock(BOOKING_LOCK_KEY)))
+        yield
+    else:
+        # The index only changes on commit, so the lock must outlast it
+        async with _period_lock:
+            yield
+
+
+async def check_booking_period(db: AsyncSession, booking_from: datetime, booking_to: datetime,
+                               booking_id: Optional[int] = None):
+    """Raise a 400 for a booking that ends before it starts and a 409 for one that
+    overlaps another booking (other than booking_id, the one being updated). Call inside
+    booking_period_lock()."""
+    if booking_to <= booking_from:
+        raise HTTPException(status_code=400, detail="Booking must end after it starts")
+    overlaps = [
+        str(other_id) for other_id, _, _ in await booked_periods(db, booking_from, booking_to)
+        if other_id != booking_id
+    ]
+    if overlaps:
+        noun = "booking" if len(overlaps) == 1 else "bookings"
+        raise HTTPException(status_code=409, detail=f"Booking overlaps existing {noun} {', '.join(overlaps)}")
+
+
+def free_slots(periods: list, start: datetime, end: datetime, duration: timedelta) -> list:
+    """[(from, to)] gaps of at least duration between start and end, around the booked
+    periods [(id, from, to)] ordered by start"""
+    slots = []
+    free_from = start
+    for _, booking_from, booking_to in periods:
+        if booking_from - free_from >= duration:
+            slots.append((free_from, booking_from))
+        free_from = max(free_from, booking_to)
+    if end - free_from >= duration:
+        slots.append((free_from, end))
+    return slots
@@ -0,0 +1,390 @@
+"""
+API benchmark suite: every /api/* endpoint, driven through the real FastAPI app in-process
+(no network) against a seeded synthetic dataset (see dataset.py).
+
+Each scenario sends --requests requests from --concurrency clients and reports throughput
+and p50/p95/p99 latency. Results are saved as JSON; pass an earlier file as --baseline to
+compare, which flags scenarios whose p95 got more than --threshold percent slower and exits
+with status 1 if there are any.
+
+    pip install httpx
+    python benchmarks/api_suite.py --scale 0.01                  # quick run on 1% of the data
+    python benchmarks/api_suite.py --output baseline.json        # full size (takes a while to seed)
+    python benchmarks/api_suite.py --baseline baseline.json      # after a change
+
+Every run of the same scale starts from the same rows (the write scenarios change the row
+counts, so the next run reseeds), so runs on one machine are comparable; compare against a
+baseline from the same machine and database. The suite warns about any /api route
+it has no scenario for.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from dataset import ANCHOR, DEFAULT_DATABASE, seed, use_database
+from load_test import percentile
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+REGRESSION_FIELD = "p95_ms"  # what regressions are judged on
+MIN_REGRESSION_MS = 1.0  # smaller slowdowns are noise, whatever the percentage
+
+
+# ============== Scenarios ==============
+
+class Context:
+    """What scenarios draw on: the dataset's id ranges and the rows earlier scenarios created"""
+
+    def __init__(self, sizes: dict, seed: int):
+        self.sizes = sizes
+        self.rng = random.Random(seed)
+        self.created = {}  # resource -> ids (or login tokens) created by earlier scenarios
+        self.changes_cursor = None  # from GET /api/changes at the start of the run
+
+    def existing_id(self, table: str) -> int:
+        return self.rng.randint(1, self.sizes[table])
+
+    def created_id(self, resource: str, i: int) -> int:
+        ids = self.created[resource]
+        return ids[i % len(ids)]
+
+    def take_created_id(self, resource: str):
+        return self.created[resource].pop()
+
+    def moment(self) -> str:
+        return (ANCHOR + timedelta(days=self.rng.randint(-365, 365))).isoformat()
+
+
+class Scenario:
+    """
+    One endpoint under one kind of request. `build(ctx, i)` returns the path and the
+    keyword arguments (params, json, content, headers) for request number i.
+    `max_requests` caps heavy scenarios such as full exports. A scenario that `needs`
+    rows created by an earlier one is skipped without them, and one that `consumes`
+    them (deletes) sends at most one request per row.
+    """
+
+    def __init__(self, name: str, method: str, route: str, build, max_requests: int = 0, expect: int = 200,
+                 creates: str = None, needs: str = None, consumes: bool = False):
+        self.name = name
+        self.method = method
+        self.route = route
+        self.build = build
+        self.max_requests = max_requests
+        self.expect = expect
+        self.creates = creates
+        self.needs = needs
+        self.consumes = consumes
+
+
+def contact_body(ctx: Context, i: int) -> dict:
+    return {"care_home_name": f"Benchmark Care Home {i}", "telephone": "0141 555 0000",
+            "email": f"bench{i}@example.com", "postcode": "G1 1AA"}
+
+
+def booking_body(ctx: Context, i: int) -> dict:
+    # After the dataset's bookings and an hour apart, so the overlap check accepts every one
+    start = ANCHOR + timedelta(days=3 * 365, hours=i)
+    return {"contact_id": ctx.existing_id("contacts"), "booking_from": start.isoformat(),
+            "booking_to": (start + timedelta(hours=1)).isoformat(), "fee_agreed": 150, "fee_status": "Unpaid"}
+
+
+def callback_body(ctx: Context, i: int) -> dict:
+    return {"contact_id": ctx.existing_id("contacts"), "original_call_datetime": ctx.moment(),
+            "callback_datetime": ctx.moment(), "callback_type": "To Call Back", "notes": "Benchmark"}
+
+
+def import_csv(ctx: Context, i: int) -> str:
+    lines = ["Care Home,Contact Person,Telephone,Email,Postcode"]
+    lines += [f"Imported Home {i}-{n},Pat Smith,0141 555 {n:04d},import{i}.{n}@example.com,G2 2BB" for n in range(100)]
+    return "\n".join(lines) + "\n"
+
+
+def scenarios() -> list:
+    """In run order: reads first, then creates, updates and deletes of the rows just created"""
+    get = lambda name, route, build, **kw: Scenario(name, "GET", route, build, **kw)
+    return [
+        get("auth check", "/api/auth/check", lambda c, i: ("/api/auth/check", {})),
+        get("contacts page", "/api/contacts", lambda c, i: ("/api/contacts", {})),
+        get("contacts by letter", "/api/contacts", lambda c, i: ("/api/contacts", {"params": {"letter": "W"}})),
+        get("contacts filter q", "/api/contacts", lambda c, i: ("/api/contacts", {"params": {"q": "heather"}})),
+        get("contact", "/api/contacts/{contact_id}", lambda c, i: (f"/api/contacts/{c.existing_id('contacts')}", {})),
+        get("contact bookings", "/api/contacts/{contact_id}/bookings",
+            lambda c, i: (f"/api/contacts/{c.existing_id('contacts')}/bookings", {})),
+        get("contact callbacks", "/api/contacts/{contact_id}/callbacks",
+            lambda c, i: (f"/api/contacts/{c.existing_id('contacts')}/callbacks", {})),
+        get("contact call logs", "/api/contacts/{contact_id}/call-logs",
+            lambda c, i: (f"/api/contacts/{c.existing_id('contacts')}/call-logs", {})),
+        get("call logs page", "/api/call-logs", lambda c, i: ("/api/call-logs", {})),
+        get("call logs by contact", "/api/call-logs",
+            lambda c, i: ("/api/call-logs", {"params": {"contact_id": c.existing_id("contacts")}})),
+        get("call log", "/api/call-logs/{log_id}", lambda c, i: (f"/api/call-logs/{c.existing_id('call_logs')}", {})),
+        get("callbacks to call back", "/api/callbacks",
+            lambda c, i: ("/api/callbacks", {"params": {"callback_type": "To Call Back"}})),
+        get("callbacks by target", "/api/callbacks",
+            lambda c, i: ("/api/callbacks", {"params": {"target_id": c.existing_id("targets")}})),
+        get("callbacks due", "/api/callbacks/due", lambda c, i: ("/api/callbacks/due", {})),
+        get("callback", "/api/callbacks/{callback_id}",
+            lambda c, i: (f"/api/callbacks/{c.existing_id('callbacks')}", {})),
+        get("bookings page", "/api/bookings", lambda c, i: ("/api/bookings", {})),
+        get("bookings unpaid", "/api/bookings", lambda c, i: ("/api/bookings", {"params": {"fee_status": "Unpaid"}})),
+        get("bookings calendar month", "/api/bookings", lambda c, i: ("/api/bookings", {"params": {
+            "from": ANCHOR.isoformat(), "to": (ANCHOR + timedelta(days=31)).isoformat(), "limit": 200}})),
+        get("availability month", "/api/availability", lambda c, i: ("/api/availability", {"params": {
+            "from": (ANCHOR + timedelta(days=30)).isoformat(), "to": (ANCHOR + timedelta(days=60)).isoformat(),
+            "duration": 60}})),
+        get("booking", "/api/bookings/{booking_id}", lambda c, i: (f"/api/bookings/{c.existing_id('bookings')}", {})),
+        get("bookings backup test", "/api/bookings/backup-test", lambda c, i: ("/api/bookings/backup-test", {})),
+        get("targets page", "/api/targets", lambda c, i: ("/api/targets", {})),
+        get("targets filter q", "/api/targets", lambda c, i: ("/api/targets", {"params": {"q": "willow"}})),
+        get("target", "/api/targets/{target_id}", lambda c, i: (f"/api/targets/{c.existing_id('targets')}", {})),
+        get("search", "/api/search", lambda c, i: ("/api/search", {"params": {"q": c.rng.choice(
+            ["willow court", "heather", "G12", "campbell", "thistle lodge"])}})),
+        # A client polling with a current cursor while nothing changes: the steady state
+        get("changes since last poll", "/api/changes", lambda c, i: ("/api/changes", {"params": {
+            "since": c.changes_cursor}})),
+        get("revenue report year", "/api/reports/revenue", lambda c, i: ("/api/reports/revenue", {"params": {
+            "from": "2025-01", "to": "2025-12"}})),
+        get("revenue report by care home", "/api/reports/revenue", lambda c, i: ("/api/reports/revenue", {"params": {
+            "group_by": "contact", "contact_id": c.existing_id("contacts")}})),
+        get("dashboard stats", "/api/dashboard/stats", lambda c, i: ("/api/dashboard/stats", {})),
+        get("pool stats", "/api/internal/pool", lambda c, i: ("/api/internal/pool", {})),
+        get("export contacts", "/api/export/{name}.csv", lambda c, i: ("/api/export/contacts.csv", {}), max_requests=5),
+        get("export call logs", "/api/export/{name}.csv", lambda c, i: ("/api/export/call-logs.csv", {}), max_requests=3),
+
+        Scenario("create contact", "POST", "/api/contacts",
+                 lambda c, i: ("/api/contacts", {"json": contact_body(c, i)}), expect=201, creates="contacts"),
+        Scenario("create call log", "POST", "/api/call-logs", lambda c, i: ("/api/call-logs", {"json": {
+            "contact_id": c.existing_id("contacts"), "call_datetime": c.moment(), "notes": "Benchmark"}}),
+                 expect=201, creates="call-logs"),
+        Scenario("create callback", "POST", "/api/callbacks",
+                 lambda c, i: ("/api/callbacks", {"json": callback_body(c, i)}), expect=201, creates="callbacks"),
+        Scenario("create booking", "POST", "/api/bookings",
+                 lambda c, i: ("/api/bookings", {"json": booking_body(c, i)}), expect=201, creates="bookings"),
+        Scenario("create target", "POST", "/api/targets", lambda c, i: ("/api/targets", {"json": {
+            "care_home_name": f"Benchmark Target {i}", "notes": "Benchmark"}}), expect=201, creates="targets"),
+        Scenario("import 100 contacts", "POST", "/api/import/{kind}", lambda c, i: ("/api/import/contacts", {
+            "content": import_csv(c, i), "headers": {"Content-Type": "text/csv"}}), max_requests=20),
+
+        Scenario("update contact", "PUT", "/api/contacts/{contact_id}", lambda c, i: (
+            f"/api/contacts/{c.created_id('contacts', i)}", {"json": {"telephone": f"0141 555 {i % 10000:04d}"}}), needs="contacts"),
+        Scenario("update call log", "PUT", "/api/call-logs/{log_id}", lambda c, i: (
+            f"/api/call-logs/{c.created_id('call-logs', i)}", {"json": {"notes": f"Updated {i}"}}), needs="call-logs"),
+        Scenario("update callback", "PUT", "/api/callbacks/{callback_id}", lambda c, i: (
+            f"/api/callbacks/{c.created_id('callbacks', i)}", {"json": {"notes": f"Updated {i}"}}), needs="callbacks"),
+        Scenario("update booking", "PUT", "/api/bookings/{booking_id}", lambda c, i: (
+            f"/api/bookings/{c.created_id('bookings', i)}", {"json": {"fee_status": "Invoiced"}}), needs="bookings"),
+        Scenario("update target", "PUT", "/api/targets/{target_id}", lambda c, i: (
+            f"/api/targets/{c.created_id('targets', i)}", {"json": {"notes": f"Updated {i}"}}), needs="targets"),
+
+        # Each delete (and promote) uses up one created row; promote leaves most targets for delete
+        Scenario("promote target", "POST", "/api/targets/{target_id}/promote", lambda c, i: (
+            f"/api/targets/{c.take_created_id('targets')}/promote", {"json": contact_body(c, i)}), max_requests=25, expect=201,
+                 needs="targets", consumes=True),
+        Scenario("delete callback", "DELETE", "/api/callbacks/{callback_id}",
+                 lambda c, i: (f"/api/callbacks/{c.take_created_id('callbacks')}", {}),
+                 needs="callbacks", consumes=True),
+        Scenario("delete booking", "DELETE", "/api/bookings/{booking_id}",
+                 lambda c, i: (f"/api/bookings/{c.take_created_id('bookings')}", {}),
+                 needs="bookings", consumes=True),
+        Scenario("delete call log", "DELETE", "/api/call-logs/{log_id}",
+                 lambda c, i: (f"/api/call-logs/{c.take_created_id('call-logs')}", {}),
+                 needs="call-logs", consumes=True),
+        Scenario("delete target", "DELETE", "/api/targets/{target_id}",
+                 lambda c, i: (f"/api/targets/{c.take_created_id('targets')}", {}),
+                 needs="targets", consumes=True),
+        Scenario("delete contact", "DELETE", "/api/contacts/{contact_id}",
+                 lambda c, i: (f"/api/contacts/{c.take_created_id('contacts')}", {}),
+                 needs="contacts", consumes=True),
+
+        Scenario("login", "POST", "/api/auth/login", lambda c, i: ("/api/auth/login", {
+            "json": {"password": os.getenv("CRM_PASSWORD", "elise123")}}), creates="sessions"),
+        Scenario("logout", "POST", "/api/auth/logout", lambda c, i: ("/api/auth/logout", {
+            "headers": {"Authorization": f"Bearer {c.take_created_id('sessions')}"}}), needs="sessions", consumes=True),
+    ]
+
+
+# Routes that are not request/response, so have no scenario: the live update stream never ends
+NOT_BENCHMARKED = {("GET", "/api/events")}
+
+
+def uncovered_routes(app, scenario_list) -> list:
+    covered = {(s.method, s.route) for s in scenario_list} | NOT_BENCHMARKED
+    missing = []
+    for route in app.routes:
+        for method in sorted(getattr(route, "methods", None) or []):
+            if route.path.startswith("/api/") and method != "HEAD" and (method, route.path) not in covered:
+                missing.append(f"{method} {route.path}")
+    return missing
+
+
+# ============== Running ==============
+
+async def run_scenario(client, headers: dict, scenario: Scenario, ctx: Context, requests: int, concurrency: int) -> dict:
+    latencies, errors = [], []
+    next_index = iter(range(requests))
+
+    async def worker():
+        for i in next_index:
+            path, kwargs = scenario.build(ctx, i)
+            kwargs = dict(kwargs)
+            kwargs["headers"] = {**headers, **kwargs.get("headers", {})}
+            started = time.perf_counter()
+            response = await client.request(scenario.method, path, **kwargs)
+            await response.aread()
+            elapsed = time.perf_counter() - started
+            if response.status_code != scenario.expect:
+                errors.append(response.status_code)
+                continue
+            latencies.append(elapsed)
+            if scenario.creates:
+                body = response.json()
+                ctx.created.setdefault(scenario.creates, []).append(body.get("id", body.get("token")))
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "route": f"{scenario.method} {scenario.route}",
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_statuses": sorted(set(errors)),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+    }
+
+
+async def run_suite(app, sizes: dict, dialect: str, args) -> dict:
+    scenario_list = scenarios()
+    if args.only:
+        scenario_list = [s for s in scenario_list if any(word in s.name for word in args.only)]
+    for route in uncovered_routes(app, scenarios()):
+        print(f"warning: no benchmark scenario for {route}")
+
+    ctx = Context(sizes, args.seed)
+    # App errors come back as 500s (counted as errors) rather than aborting the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        login = await client.post("/api/auth/login", json={"password": os.getenv("CRM_PASSWORD", "elise123")})
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['token']}"}
+        ctx.changes_cursor = (await client.get("/api/changes", headers=headers)).json()["cursor"]
+
+        results = {}
+        print(f"\n{'scenario':<28}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for scenario in scenario_list:
+            requests = min(args.requests, scenario.max_requests or args.requests)
+            if scenario.method == "GET":
+                # Warm up (first-use caches, the search index), unmeasured
+                for i in range(min(args.warmup, requests)):
+                    path, kwargs = scenario.build(ctx, i)
+                    await client.get(path, headers=headers, **kwargs)
+            if scenario.needs:
+                available = len(ctx.created.get(scenario.needs, []))
+                if not available:
+                    print(f"{scenario.name:<28} skipped: needs {scenario.needs} created by an earlier scenario")
+                    continue
+                if scenario.consumes:
+                    requests = min(requests, available)
+            # SQLite allows one writer at a time; concurrent writes would only measure lock timeouts
+            concurrency = 1 if scenario.method != "GET" and dialect == "sqlite" else args.concurrency
+            result = await run_scenario(client, headers, scenario, ctx, requests, concurrency)
+            results[scenario.name] = result
+            print(f"{scenario.name:<28}{result['requests']:>9}{result['errors']:>8}{result['rps']:>9.1f}"
+                  f"{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print each scenario against the baseline; returns the names of the regressed ones"""
+    regressions = []
+    print(f"\nAgainst baseline from {baseline.get('created', '?')} (p95 regression threshold {threshold:.0f}%):")
+    print(f"{'scenario':<28}{'p50 ms':>22}{'p95 ms':>22}{'p99 ms':>22}{'req/s':>22}")
+    for name, result in results.items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            print(f"{name:<28}{'(new)':>22}")
+            continue
+        cells = []
+        for field in ("p50_ms", "p95_ms", "p99_ms", "rps"):
+            old, new = before[field], result[field]
+            change = (new - old) / old * 100 if old else 0.0
+            cells.append(f"{old:.1f}->{new:.1f} {change:+.0f}%")
+        old, new = before[REGRESSION_FIELD], result[REGRESSION_FIELD]
+        regressed = old and (new - old) / old * 100 > threshold and new - old > MIN_REGRESSION_MS
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<28}" + "".join(f"{cell:>22}" for cell in cells) + ("  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default=DEFAULT_DATABASE,
+                        help=f"database to seed and benchmark; its CRM tables are overwritten (default {DEFAULT_DATABASE})")
+    parser.add_argument("--scale", type=float, default=1.0, help="fraction of the full-size dataset (see dataset.py)")
+    parser.add_argument("--reseed", action="store_true", help="reseed even if the dataset is already there")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent clients per scenario")
+    parser.add_argument("--warmup", type=int, default=3, help="unmeasured requests before each read scenario")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the ids requested")
+    parser.add_argument("--only", action="append", help="run only scenarios whose name contains this")
+    parser.add_argument("--output", help="where to save the results (default benchmarks/results/<time>.json)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=20.0, help="p95 slowdown (percent) counted as a regression")
+    args = parser.parse_args()
+
+    use_database(args.database)
+    sizes = seed(args.scale, force=args.reseed)
+
+    import main as app_module
+    from database import check_schema_revision, engine
+    check_schema_revision()
+
+    results = asyncio.run(run_suite(app_module.app, sizes, engine.dialect.name, args))
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "dataset": {"scale": args.scale, "rows": sizes},
+        "settings": {"requests": args.requests, "concurrency": args.concurrency, "seed": args.seed},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+        },
+        "scenarios": results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"\nSaved results to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("dataset") != report["dataset"]:
+            print("warning: the baseline was run on a different dataset; the comparison is not like for like")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} scenario(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Synthetic CRM dataset for benchmarks.
+
+Fills a database with contacts, targets, call logs, callbacks and bookings at production-like
+scale. The data is generated from a fixed random seed and fixed dates, so every run at the
+same scale produces the same rows. The full size (scale 1.0) is:
+
+    contacts 100k, targets 100k, call logs 1M, callbacks 200k, bookings 200k
+
+    python benchmarks/dataset.py --database sqlite:///benchmarks/data/bench.sqlite --scale 0.1
+
+The database URL is given explicitly (never read from DATABASE_URL) because seeding deletes
+every row in the CRM tables first. api_suite.py calls seed() itself.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+# Full-size row counts (scale 1.0)
+FULL_SIZE = {
+    "contacts": 100_000,
+    "targets": 100_000,
+    "call_logs": 1_000_000,
+    "callbacks": 200_000,
+    "bookings": 200_000,
+}
+
+SEED = 20250106
+ANCHOR = datetime(2026, 1, 5, 9, 0)  # dates are spread two years either side of this
+SPREAD_MINUTES = 2 * 365 * 24 * 60
+CHUNK_SIZE = 10_000
+
+DEFAULT_DATABASE = "sqlite:///" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "bench.sqlite")
+
+NAME_PARTS = (
+    ["Oak", "Willow", "Rowan", "Heather", "Thistle", "Lavender", "Birch", "Cedar", "Maple", "Holly",
+     "Clyde", "Loch", "Glen", "Bracken", "Primrose", "Ash", "Elm", "Hawthorn", "Juniper", "Larch"],
+    ["View", "Court", "House", "Lodge", "Gardens", "Park", "Manor", "Grange", "Bank", "Brae"],
+)
+PEOPLE = ["Anne", "Brian", "Catriona", "David", "Eilidh", "Fiona", "Graham", "Heather", "Iain", "Jean"]
+SURNAMES = ["MacDonald", "Campbell", "Stewart", "Robertson", "Thomson", "Anderson", "Scott", "Murray"]
+TOWNS = ["Glasgow", "Edinburgh", "Paisley", "Stirling", "Perth", "Dundee", "Ayr", "Falkirk"]
+BOOKING_TYPES = ["Sing-along", "Afternoon concert", "Christmas party", "Dementia-friendly session", None]
+NOTES = [
+    "Spoke to the activities coordinator, call back next month",
+    "Manager on leave, try again next week",
+    "Interested in a summer concert",
+    "No answer",
+    None,
+]
+
+
+def sizes_for(scale: float) -> dict:
+    return {table: max(1, int(count * scale)) for table, count in FULL_SIZE.items()}
+
+
+def moment(rng: random.Random) -> datetime:
+    return ANCHOR + timedelta(minutes=rng.randint(-SPREAD_MINUTES, SPREAD_MINUTES))
+
+
+def care_home_name(rng: random.Random, i: int) -> str:
+    return f"{rng.choice(NAME_PARTS[0])} {rng.choice(NAME_PARTS[1])} Care Home {i}"
+
+
+# ============== Row Generators ==============
+
+def contact_rows(rng: random.Random, count: int):
+    for i in range(1, count + 1):
+        person = f"{rng.choice(PEOPLE)} {rng.choice(SURNAMES)}"
+        yield {
+            "id": i,
+            "care_home_name": care_home_name(rng, i),
+            "telephone": f"0{rng.randint(1000, 1999)} {rng.randint(100000, 999999)}",
+            "contact_person": person,
+            "email": f"manager{i}@carehome{i}.co.uk",
+            "address": f"{rng.randint(1, 200)} High Street, {rng.choice(TOWNS)}",
+            "postcode": f"G{rng.randint(1, 84)} {rng.randint(1, 9)}{rng.choice('ABDEFGHJLNPQRSTUWXYZ')}{rng.choice('ABDEFGHJLNPQRSTUWXYZ')}",
+            "website": f"https://carehome{i}.co.uk" if rng.random() < 0.6 else None,
+        }
+
+
+def target_rows(rng: random.Random, count: int):
+    for i in range(1, count + 1):
+        yield {
+            "id": i,
+            "care_home_name": care_home_name(rng, i),
+            "telephone": f"0{rng.randint(1000, 1999)} {rng.randint(100000, 999999)}",
+            "notes": rng.choice(NOTES),
+        }
+
+
+def call_log_rows(rng: random.Random, count: int, contacts: int):
+    for i in range(1, count + 1):
+        yield {"id": i, "contact_id": rng.randint(1, contacts), "call_datetime": moment(rng), "notes": rng.choice(NOTES)}
+
+
+def callback_rows(rng: random.Random, count: int, contacts: int, targets: int, callback_types):
+    for i in range(1, count + 1):
+        original = moment(rng)
+        # Most callbacks belong to a contact; the rest to a target
+        for_target = rng.random() < 0.3
+        yield {
+            "id": i,
+            "contact_id": None if for_target else rng.randint(1, contacts),
+            "target_id": rng.randint(1, targets) if for_target else None,
+            "original_call_datetime": original,
+            "notes": rng.choice(NOTES),
+            "callback_datetime": original + timedelta(days=rng.randint(1, 60)),
+            "callback_type": rng.choice(callback_types),
+        }
+
+
+def booking_rows(rng: random.Random, count: int, contacts: int, fee_statuses):
+    for i in range(1, count + 1):
+        booking_from = moment(rng).replace(minute=0)
+        yield {
+            "id": i,
+            "contact_id": rng.randint(1, contacts),
+            "booking_from": booking_from,
+            "booking_to": booking_from + timedelta(minutes=rng.choice([45, 60, 90, 120])),
+            "booking_type": rng.choice(BOOKING_TYPES),
+            "more_info": rng.choice(NOTES),
+            "fee_agreed": Decimal(rng.choice([120, 150, 180, 250])),
+            "fee_status": rng.choice(fee_statuses),
+        }
+
+
+# ============== Seeding ==============
+
+def table_counts(engine) -> dict:
+    from sqlalchemy import text
+    with engine.connect() as conn:
+        return {table: conn.execute(text(f"SELECT count(*) FROM {table}")).scalar() for table in FULL_SIZE}
+
+
+def insert_chunks(conn, table, rows) -> int:
+    inserted = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            conn.execute(table.insert(), chunk)
+            inserted += len(chunk)
+            chunk = []
+    if chunk:
+        conn.execute(table.insert(), chunk)
+        inserted += len(chunk)
+    return inserted
+
+
+def seed(scale: float, force: bool = False, log=print) -> dict:
+    """
+    Migrate the database named by DATABASE_URL (set before importing the app modules) and fill it
+    with the dataset for `scale`. A database that already holds exactly that many rows is kept.
+    Returns the row counts.
+    """
+    from alembic import command
+    from sqlalchemy import text
+
+    from database import alembic_config, engine
+    from models import Booking, CallLog, Callback, CallbackType, Contact, FeeStatus, Target
+    from reports import rebuild_summaries
+
+    command.upgrade(alembic_config(), "head")
+    sizes = sizes_for(scale)
+    if not force and table_counts(engine) == sizes:
+        log(f"Dataset at scale {scale} already present, reusing it")
+        return sizes
+
+    rng = random.Random(SEED)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for table in ("callbacks", "bookings", "call_logs", "targets", "contacts"):
+            conn.execute(text(f"DELETE FROM {table}"))
+        plan = [
+            (Contact, contact_rows(rng, sizes["contacts"])),
+            (Target, target_rows(rng, sizes["targets"])),
+            (CallLog, call_log_rows(rng, sizes["call_logs"], sizes["contacts"])),
+            (Callback, callback_rows(rng, sizes["callbacks"], sizes["contacts"], sizes["targets"], list(CallbackType))),
+            (Booking, booking_rows(rng, sizes["bookings"], sizes["contacts"], list(FeeStatus))),
+        ]
+        for model, rows in plan:
+            # Version 0, like rows from before the change feed: a NULL would mark every row as
+            # written by the next transaction to commit (see changes.py)
+            rows = ({**row, "change_version": 0} for row in rows)
+            count = insert_chunks(conn, model.__table__, rows)
+            log(f"  {model.__tablename__}: {count} rows ({time.perf_counter() - started:.0f}s)")
+        # Core inserts skip the ORM listeners that maintain the booking summaries
+        count = rebuild_summaries(conn)
+        log(f"  booking_summaries: {count} rows ({time.perf_counter() - started:.0f}s)")
+
+        if engine.dialect.name == "postgresql":
+            # Explicit ids were inserted, so move the sequences past them
+            for table in FULL_SIZE:
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+                ))
+    with engine.connect() as conn:
+        # Fresh planner statistics, as a long-lived production database would have
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+    log(f"Seeded scale {scale} in {time.perf_counter() - started:.0f}s")
+    return sizes
+
+
+def use_database(url: str):
+    """Point the app modules at `url`; must run before database.py is first imported"""
+    if url.startswith("sqlite:///"):
+        directory = os.path.dirname(url[len("sqlite:///"):])
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    os.environ["DATABASE_URL"] = url
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default=DEFAULT_DATABASE, help=f"database URL (default {DEFAULT_DATABASE})")
+    parser.add_argument("--scale", type=float, default=1.0, help="fraction of the full-size dataset")
+    parser.add_argument("--force", action="store_true", help="reseed even if the row counts already match")
+    args = parser.parse_args()
+
+    use_database(args.database)
+    seed(args.scale, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
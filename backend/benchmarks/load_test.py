@@ -0,0 +1,103 @@
+"""
+Load test for the CRM API: many concurrent clients hitting the read endpoints
+the CRM pages use, reporting requests per second and latency percentiles.
+
+Run it against a running server (or two, to compare builds), e.g.:
+
+    python benchmarks/load_test.py --target async=http://localhost:8000 --target sync=http://localhost:8001
+
+Uses CRM_PASSWORD (default elise123) to log in.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+# (path, query params) requested round-robin by every client
+WORKLOAD = [
+    ("/api/contacts", {"limit": 50}),
+    ("/api/bookings", {"limit": 50}),
+    ("/api/callbacks", {"limit": 50, "callback_type": "To Call Back"}),
+    ("/api/dashboard/stats", {}),
+]
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_client(client: httpx.AsyncClient, headers: dict, deadline: float, offset: int, latencies: list, errors: list):
+    i = offset
+    while time.perf_counter() < deadline:
+        path, params = WORKLOAD[i % len(WORKLOAD)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(path, params=params, headers=headers)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def load_test(base_url: str, concurrency: int, duration: float, password: str) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        login = await client.post("/api/auth/login", json={"password": password})
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['token']}"}
+
+        # Warm up connections and caches before measuring
+        await asyncio.gather(*[client.get(path, params=params, headers=headers) for path, params in WORKLOAD])
+
+        latencies, errors = [], []
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*[
+            run_client(client, headers, deadline, n, latencies, errors) for n in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": (statistics.fmean(latencies) * 1000) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", required=True,
+                        help="label=base_url of a running server; repeat to compare servers")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30, help="seconds per target")
+    args = parser.parse_args()
+    password = os.getenv("CRM_PASSWORD", "elise123")
+
+    results = []
+    for target in args.target:
+        label, _, url = target.partition("=")
+        print(f"{label}: {args.concurrency} clients for {args.duration:.0f}s against {url} ...")
+        results.append((label, asyncio.run(load_test(url, args.concurrency, args.duration, password))))
+
+    print()
+    print(f"{'target':<12}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for label, r in results:
+        print(f"{label:<12}{r['requests']:>10}{r['errors']:>8}{r['rps']:>10.1f}{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
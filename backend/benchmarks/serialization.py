@@ -0,0 +1,129 @@
+"""
+Per-row cost of turning list endpoint results into a JSON body, for get_call_logs and
+get_bookings pages, comparing:
+
+    response_model  what FastAPI does with a response_model: validate each ORM row into the
+                    *Page schema, dump it to a dict, encode with the json module
+    fast            the FAST_SERIALIZATION path: RowSerializer dicts encoded with orjson
+
+Rows are built in memory (with their related contact, as joinedload leaves them), so only
+serialization is measured, not the database. Both paths are checked to produce the same JSON.
+
+    python benchmarks/serialization.py                 # 10k and 100k rows
+    python benchmarks/serialization.py --rows 50000 --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")  # models import the engine; nothing connects
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from models import Booking, CallLog, Contact, FeeStatus  # noqa: E402
+from schemas import BookingPage, BookingResponse, CallLogPage, CallLogResponse  # noqa: E402
+from serializers import FastJSONResponse, RowSerializer, orjson  # noqa: E402
+
+CONTACT_COUNT = 500
+START = datetime(2025, 1, 6, 10, 0)
+
+
+def make_contacts():
+    return [
+        Contact(
+            id=i, care_home_name=f"Care Home {i}", telephone=f"0141 555 {i:04d}",
+            contact_person=f"Manager {i}", email=f"manager{i}@carehome{i}.co.uk",
+            address=f"{i} High Street, Glasgow", postcode="G1 1AA", website=f"https://carehome{i}.co.uk"
+        )
+        for i in range(1, CONTACT_COUNT + 1)
+    ]
+
+
+def make_call_logs(count: int, contacts):
+    rows = []
+    for i in range(count):
+        contact = contacts[i % len(contacts)]
+        row = CallLog(
+            id=i + 1, contact_id=contact.id, call_datetime=START + timedelta(minutes=37 * i),
+            notes="Spoke to the activities coordinator, call back next month"
+        )
+        # Set through __dict__ so the contact's call_logs backref does not grow with every row
+        row.__dict__["contact"] = contact
+        rows.append(row)
+    return rows
+
+
+def make_bookings(count: int, contacts):
+    statuses = list(FeeStatus)
+    rows = []
+    for i in range(count):
+        contact = contacts[i % len(contacts)]
+        booking_from = START + timedelta(hours=5 * i)
+        row = Booking(
+            id=i + 1, contact_id=contact.id, booking_from=booking_from,
+            booking_to=booking_from + timedelta(hours=1), booking_type="Sing-along",
+            more_info="Lounge on the ground floor", fee_agreed=Decimal("150.00"),
+            fee_status=statuses[i % len(statuses)]
+        )
+        row.__dict__["contact"] = contact
+        rows.append(row)
+    return rows
+
+
+def response_model_body(field, rows) -> bytes:
+    """What FastAPI's serialize_response plus the default JSONResponse do"""
+    value, errors = field.validate({"items": rows, "next_cursor": None}, {}, loc=("response",))
+    assert not errors, errors
+    return JSONResponse(field.serialize(value, mode="json")).body
+
+
+def fast_body(serializer, rows) -> bytes:
+    return FastJSONResponse({"items": serializer.many(rows), "next_cursor": None}).body
+
+
+def best_time(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, action="append", help="page sizes to measure (default 10000 and 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the fastest is reported")
+    args = parser.parse_args()
+    sizes = args.rows or [10_000, 100_000]
+
+    contacts = make_contacts()
+    endpoints = [
+        ("get_call_logs", make_call_logs, CallLogPage, RowSerializer(CallLogResponse)),
+        ("get_bookings", make_bookings, BookingPage, RowSerializer(BookingResponse)),
+    ]
+    print(f"JSON encoder for the fast path: {'orjson' if orjson else 'json (orjson not installed)'}\n")
+    print(f"{'endpoint':<14} {'rows':>8} {'response_model':>16} {'fast':>12} {'per row':>18} {'speedup':>8}")
+
+    for name, make_rows, page_schema, serializer in endpoints:
+        field = create_response_field(name=f"Response_{name}", type_=page_schema)
+        for size in sizes:
+            rows = make_rows(size, contacts)
+            before, after = response_model_body(field, rows), fast_body(serializer, rows)
+            if json.loads(before) != json.loads(after):
+                raise SystemExit(f"{name}: the fast path produced different JSON")
+
+            slow = best_time(lambda: response_model_body(field, rows), args.repeat)
+            fast = best_time(lambda: fast_body(serializer, rows), args.repeat)
+            per_row = f"{slow / size * 1e6:.2f} -> {fast / size * 1e6:.2f} us"
+            print(f"{name:<14} {size:>8} {slow * 1000:>13.1f} ms {fast * 1000:>9.1f} ms {per_row:>18} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
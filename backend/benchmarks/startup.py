@@ -0,0 +1,84 @@
+"""
+Cold start time: how long from launching uvicorn until the app answers its first request.
+Each run starts a fresh server process against DATABASE_URL, polls the homepage
+until it returns 200, then stops the server.
+
+Startup used to run create_all, a dozen ALTER TABLE statements and index checks on every
+boot; it now only compares the database's Alembic revision with the newest one. To compare
+the two, check out the older build next to this one and pass one --app for each:
+
+    git worktree add /tmp/elise-before <older commit>
+    python benchmarks/startup.py --app before=/tmp/elise-before/backend --app after=.
+
+The database must already be migrated (`alembic upgrade head`), or the new build refuses to start.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+READY_PATH = "/"  # the homepage: needs no login and no database
+POLL_INTERVAL = 0.01
+TIMEOUT = 60
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def is_ready(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status == 200
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return False
+
+
+def time_startup(app_dir: str) -> float:
+    """Seconds from launching the server until the homepage answers"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}{READY_PATH}"
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    started = time.perf_counter()
+    server = subprocess.Popen(command, cwd=app_dir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        while not is_ready(url):
+            if server.poll() is not None:
+                raise SystemExit(f"server in {app_dir} exited during startup:\n{server.stderr.read().decode()}")
+            if time.perf_counter() - started > TIMEOUT:
+                raise SystemExit(f"server in {app_dir} did not answer within {TIMEOUT}s")
+            time.sleep(POLL_INTERVAL)
+        return time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", action="append", metavar="LABEL=DIR",
+                        help="backend directory to start (default: this build)")
+    parser.add_argument("--runs", type=int, default=5, help="server starts per build")
+    args = parser.parse_args()
+
+    this_build = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    apps = [app.split("=", 1) if "=" in app else (app, app) for app in args.app or [f"current={this_build}"]]
+
+    print(f"{'build':<12} {'runs':>5} {'median':>10} {'min':>10} {'max':>10}")
+    for label, app_dir in apps:
+        times = [time_startup(os.path.abspath(app_dir)) for _ in range(args.runs)]
+        print(
+            f"{label:<12} {len(times):>5} {statistics.median(times) * 1000:>7.0f} ms "
+            f"{min(times) * 1000:>7.0f} ms {max(times) * 1000:>7.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Build resized WebP and AVIF versions of the public site images and point index.html at them.
+
+For every PNG/JPEG in frontend/images used by an <img> in index.html, this writes frontend/images/optimized/<name>-<width>.<hash>.<ext>
+at each width in WIDTHS (never wider than the original), then rewrites each matching <img> in
+index.html as a <picture> with AVIF and WebP srcsets. The original image stays as the <img> fallback
+and as the poster download link.
+
+File names contain a hash of their contents, so main.py serves the optimized folder with an
+immutable Cache-Control header. The variants, the manifest and the rewritten index.html are
+build output, not source: the deploy's build command runs this, and the repository keeps
+index.html with plain <img> tags.
+
+    pip install Pillow
+    python build_images.py          # build (again after an image or index.html changes)
+    python build_images.py --clean  # undo a local build before committing index.html
+
+Unchanged images are not re-encoded (see image_manifest.json), variants that are no
+longer used are deleted, and running it twice in a row changes nothing.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+
+from PIL import Image, features
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(BASE_DIR, "frontend", "images")
+OUTPUT_DIR = os.path.join(IMAGES_DIR, "optimized")
+INDEX_HTML = os.path.join(BASE_DIR, "frontend", "index.html")
+MANIFEST = os.path.join(BASE_DIR, "image_manifest.json")  # kept outside the served folder
+
+IMAGES_URL = "/images"
+OUTPUT_URL = "/images/optimized"
+
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+WIDTHS = (320, 480, 768, 1080)
+
+# (extension, MIME type, Pillow save options); AVIF first so browsers that support it pick it
+FORMATS = [
+    ("avif", "image/avif", {"quality": 55, "speed": 6}),
+    ("webp", "image/webp", {"quality": 80, "method": 6}),
+]
+
+# How wide each kind of image is drawn, from the gallery and about-section rules in styles.css
+SIZES_BY_CLASS = {
+    "poster-image": "(min-width: 992px) 380px, (min-width: 768px) 33vw, 50vw",
+    "about-photo": "(min-width: 768px) 40vw, 100vw",
+}
+DEFAULT_SIZES = "100vw"
+
+PICTURE_PATTERN = re.compile(
+    r'<picture data-optimized>\s*(?:<source\b[^>]*>\s*)*(<img\b[^>]*>)\s*</picture>', re.IGNORECASE
+)
+IMG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+ATTRIBUTE_PATTERN = re.compile(r'([\w-]+)="([^"]*)"')
+
+
+# ============== Encoding ==============
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def encode_variant(image: Image.Image, stem: str, width: int, extension: str, options: dict) -> str:
+    """Resize and encode one variant; returns its file name (which includes a content hash)"""
+    height = round(image.height * width / image.width)
+    resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+
+    temp_path = os.path.join(OUTPUT_DIR, f".{stem}-{width}.{extension}.tmp")
+    resized.save(temp_path, format=extension.upper(), **options)
+    digest = file_hash(temp_path)[:10]
+    name = f"{stem}-{width}.{digest}.{extension}"
+    os.replace(temp_path, os.path.join(OUTPUT_DIR, name))
+    return name
+
+
+def build_variants(filename: str, previous: dict, force: bool) -> dict:
+    """Manifest entry for one source image, re-encoding only if the source has changed"""
+    path = os.path.join(IMAGES_DIR, filename)
+    source_hash = file_hash(path)
+    if not force and previous.get("source_hash") == source_hash and all(
+        os.path.exists(os.path.join(OUTPUT_DIR, variant["file"]))
+        for variants in previous["formats"].values() for variant in variants
+    ):
+        return previous
+
+    stem = os.path.splitext(filename)[0]
+    with Image.open(path) as image:
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        converted = image.convert("RGBA" if has_alpha else "RGB")
+        # Every width below the original, plus the original (or largest) width itself
+        widths = sorted({w for w in WIDTHS if w < image.width} | {min(image.width, WIDTHS[-1])})
+
+        formats = {}
+        for extension, _, options in FORMATS:
+            formats[extension] = [
+                {"width": width, "file": encode_variant(converted, stem, width, extension, options)}
+                for width in widths
+            ]
+        print(f"  {filename}: {len(widths)} widths x {len(FORMATS)} formats")
+        return {
+            "source_hash": source_hash,
+            "width": image.width,
+            "height": image.height,
+            "formats": formats,
+        }
+
+
+def build_all(filenames: list, force: bool = False) -> dict:
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    previous = {}
+    if os.path.exists(MANIFEST):
+        with open(MANIFEST) as f:
+            previous = json.load(f)
+
+    manifest = {}
+    for filename in sorted(filenames):
+        manifest[filename] = build_variants(filename, previous.get(filename, {}), force)
+
+    # Remove variants of images that changed or were deleted
+    keep = {
+        variant["file"]
+        for entry in manifest.values() for variants in entry["formats"].values() for variant in variants
+    }
+    for name in os.listdir(OUTPUT_DIR):
+        if name not in keep:
+            os.remove(os.path.join(OUTPUT_DIR, name))
+
+    with open(MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return manifest
+
+
+# ============== index.html ==============
+
+def image_name(img_tag: str):
+    """File name in frontend/images that an <img> shows, or None if it is not a local PNG/JPEG"""
+    src = html.unescape(dict(ATTRIBUTE_PATTERN.findall(img_tag)).get("src", ""))
+    if not src.startswith(IMAGES_URL + "/"):
+        return None
+    filename = src[len(IMAGES_URL) + 1:]
+    if "/" in filename or not filename.lower().endswith(SOURCE_EXTENSIONS):
+        return None
+    if not os.path.isfile(os.path.join(IMAGES_DIR, filename)):
+        return None
+    return filename
+
+
+def read_index() -> str:
+    """index.html with the pictures from an earlier build unwrapped back to their <img>"""
+    with open(INDEX_HTML, encoding="utf-8") as f:
+        return PICTURE_PATTERN.sub(lambda m: m.group(1), f.read())
+
+
+def referenced_images() -> set:
+    return {name for name in map(image_name, IMG_PATTERN.findall(read_index())) if name}
+
+
+def srcset(variants: list) -> str:
+    return ", ".join(f"{OUTPUT_URL}/{variant['file']} {variant['width']}w" for variant in variants)
+
+
+def add_attributes(img_tag: str, attributes: dict) -> str:
+    """Add attributes the tag does not already have (so a rebuild leaves existing ones alone)"""
+    present = {name.lower() for name, _ in ATTRIBUTE_PATTERN.findall(img_tag)}
+    extra = "".join(f' {name}="{value}"' for name, value in attributes.items() if name not in present)
+    closing = "/>" if img_tag.endswith("/>") else ">"
+    return img_tag[:-len(closing)].rstrip() + extra + closing
+
+
+def picture_for(img_tag: str, indent: str, manifest: dict) -> str:
+    entry = manifest.get(image_name(img_tag))
+    if entry is None:
+        return img_tag
+
+    classes = dict(ATTRIBUTE_PATTERN.findall(img_tag)).get("class", "").split()
+    sizes = next((SIZES_BY_CLASS[c] for c in classes if c in SIZES_BY_CLASS), DEFAULT_SIZES)
+    # width/height let the browser reserve space before the image loads (no layout shift).
+    # Every image is below the hero (a CSS background), so all of them can wait until scrolled near.
+    img_tag = add_attributes(img_tag, {
+        "width": entry["width"],
+        "height": entry["height"],
+        "loading": "lazy",
+        "decoding": "async",
+    })
+
+    lines = ["<picture data-optimized>"]
+    for extension, mime_type, _ in FORMATS:
+        lines.append(
+            f'{indent}    <source type="{mime_type}" sizes="{sizes}"\n'
+            f'{indent}        srcset="{srcset(entry["formats"][extension])}">'
+        )
+    lines.append(f"{indent}    {img_tag}")
+    lines.append(f"{indent}</picture>")
+    return "\n".join(lines)
+
+
+def rewrite_index(manifest: dict) -> bool:
+    """Wrap each optimized <img> in index.html in a <picture>; returns True if the file changed"""
+    with open(INDEX_HTML, encoding="utf-8") as f:
+        original = f.read()
+
+    # Unwrap pictures from an earlier build first, so the srcsets are always regenerated
+    text = read_index()
+
+    def replace(match):
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        prefix = text[line_start:match.start()]
+        indent = prefix if not prefix.strip() else re.match(r"[ \t]*", prefix).group(0)
+        return picture_for(match.group(0), indent, manifest)
+
+    text = IMG_PATTERN.sub(replace, text)
+    if text == original:
+        return False
+    with open(INDEX_HTML, "w", encoding="utf-8") as f:
+        f.write(text)
+    return True
+
+
+def clean():
+    """Put index.html back to plain <img> tags and delete the variants and the manifest"""
+    text = read_index()
+    with open(INDEX_HTML, "w", encoding="utf-8") as f:
+        f.write(text)
+    if os.path.isdir(OUTPUT_DIR):
+        for name in os.listdir(OUTPUT_DIR):
+            os.remove(os.path.join(OUTPUT_DIR, name))
+        os.rmdir(OUTPUT_DIR)
+    if os.path.exists(MANIFEST):
+        os.remove(MANIFEST)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--force", action="store_true", help="re-encode every image, even unchanged ones")
+    parser.add_argument("--clean", action="store_true", help="undo a build: restore index.html, delete the variants")
+    args = parser.parse_args()
+
+    if args.clean:
+        clean()
+        print("Removed the image variants; index.html restored")
+        return
+
+    for extension, _, _ in FORMATS:
+        if not features.check(extension):
+            parser.error(f"this Pillow build cannot write {extension.upper()} (pip install -U Pillow)")
+
+    print(f"Building image variants in {OUTPUT_DIR}")
+    manifest = build_all(referenced_images(), force=args.force)
+    changed = rewrite_index(manifest)
+    print(f"{len(manifest)} images; index.html {'updated' if changed else 'unchanged'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache where entries expire after `ttl` seconds.
+    Each worker process has its own copy, so writes handled by another worker
+    only become visible here once the entry expires.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        """Drop every entry (call after writes that change the cached data)"""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,148 @@
+"""
+Change feed for GET /api/changes.
+
+Every synced row carries a change_version: the version of its table's counter (see
+etags.py) that the transaction which last wrote it committed as. Inserts and updates set it
+to NULL, and as the last step of the transaction, right after bumping the table's counter,
+stamp_changes() stamps the new version on the rows still at NULL. Every ORM delete of a
+synced row (cascades included) leaves a row in tombstones, stamped the same way.
+
+A cursor holds the counters as they were when it was handed out. The counter row stays
+locked from its bump until the commit, so versions become visible in the order they were
+given out: a row with a version above the cursor's is always one the client has not seen,
+however long its transaction took, and there is no window in which a commit can slip
+behind a cursor. Rows committed while a feed request runs may be sent again on the next
+call; clients apply changes idempotently, so the repeats are harmless.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import delete, event, literal, or_, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import base64
+import json
+import time
+
+from models import Contact, CallLog, Callback, Booking, TableVersion, Target, Tombstone
+
+# Tables in the feed, by the name clients see (the table name)
+SYNCED_TABLES = {
+    "contacts": Contact,
+    "call_logs": CallLog,
+    "callbacks": Callback,
+    "bookings": Booking,
+    "targets": Target,
+}
+
+# Tombstones older than this are pruned; a client whose cursor is older must reload everything.
+# Cursors expire a day sooner, so a delete stamped at flush time but committed after a cursor
+# was handed out is still there for it.
+TOMBSTONE_RETENTION = timedelta(days=30)
+CURSOR_LIFETIME = TOMBSTONE_RETENTION - timedelta(days=1)
+PRUNE_INTERVAL = 3600  # seconds between prunes, per process
+
+# More changes than this and a full reload is cheaper than the delta
+MAX_CHANGES = 1000
+
+
+# ============== Cursors ==============
+
+def encode_cursor(issued_at: datetime, versions: dict) -> str:
+    raw = json.dumps([issued_at.isoformat(timespec="seconds"), versions]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Optional[tuple]:
+    """(issued_at, versions) of a cursor, or None if it is not one this version handed out:
+    the client has to start over, just as with an expired cursor"""
+    try:
+        issued_at, versions = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        issued_at = datetime.fromisoformat(issued_at)
+        versions = {table: int(versions[table]) for table in SYNCED_TABLES}
+    except (ValueError, TypeError, KeyError):
+        return None
+    return issued_at, versions
+
+
+async def current_versions(db: AsyncSession) -> dict:
+    """The committed counters of the synced tables (0 for any that has none yet)"""
+    rows = (await db.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(SYNCED_TABLES))
+    )).all()
+    return {table: 0 for table in SYNCED_TABLES} | dict(rows)
+
+
+def is_expired(issued_at: datetime, now: datetime) -> bool:
+    """True if tombstones from after the cursor may already have been pruned"""
+    return issued_at < now - CURSOR_LIFETIME
+
+
+# ============== Change Versions ==============
+
+def stamp_changes(session, table: str, version: int):
+    """Stamp the rows of `table` written by this transaction, and its deletes, with the
+    version it is committing as. Called by etags.py right after bumping the counter."""
+    model = SYNCED_TABLES.get(table)
+    if model is None:
+        return
+    session.execute(
+        update(model.__table__).where(model.change_version.is_(None)).values(change_version=version)
+    )
+    session.execute(
+        update(Tombstone.__table__)
+        .where(Tombstone.table_name == table, Tombstone.change_version.is_(None))
+        .values(change_version=version)
+    )
+
+
+# ============== Tombstones ==============
+
+_next_prune = 0.0
+
+
+def _record_tombstone(mapper, connection, target):
+    global _next_prune
+    now = datetime.utcnow()
+    connection.execute(
+        Tombstone.__table__.insert().values(table_name=mapper.local_table.name, row_id=target.id, deleted_at=now)
+    )
+    # Deletes are rare, so this is a cheap place to clear out expired tombstones
+    if time.monotonic() >= _next_prune:
+        _next_prune = time.monotonic() + PRUNE_INTERVAL
+        connection.execute(delete(Tombstone).where(Tombstone.deleted_at < now - TOMBSTONE_RETENTION))
+
+
+for _model in SYNCED_TABLES.values():
+    event.listen(_model, "after_delete", _record_tombstone)
+
+
+# ============== Changed Rows ==============
+
+async def changed_ids(db: AsyncSession, since: dict) -> Optional[dict]:
+    """
+    Ids changed after the versions `since`, as {table: (upserted ids, deleted ids)} for the
+    tables with any changes, in a single query. Returns None if there are more than MAX_CHANGES.
+    A row deleted and then re-created with the same id is reported as upserted only.
+    """
+    parts = [
+        select(literal(table).label("table_name"), model.id.label("row_id"), literal(False).label("deleted"))
+        .where(model.change_version > since[table])
+        for table, model in SYNCED_TABLES.items()
+    ]
+    parts.append(
+        select(Tombstone.table_name, Tombstone.row_id, literal(True)).where(or_(*(
+            (Tombstone.table_name == table) & (Tombstone.change_version > since[table])
+            for table in SYNCED_TABLES
+        )))
+    )
+    rows = (await db.execute(union_all(*parts).limit(MAX_CHANGES + 1))).all()
+    if len(rows) > MAX_CHANGES:
+        return None
+
+    changes = {}
+    for table, row_id, deleted in rows:
+        upserted, removed = changes.setdefault(table, (set(), set()))
+        (removed if deleted else upserted).add(row_id)
+    return {
+        table: (sorted(upserted), sorted(removed - upserted))
+        for table, (upserted, removed) in changes.items()
+    }
@@ -0,0 +1,305 @@
+"""
+Response compression.
+
+API responses are compressed on the fly by CompressionMiddleware (brotli when the client
+accepts it and the brotli package is installed, otherwise gzip). Static files are compressed
+ahead of time by precompress_static(), and PrecompressedStaticFiles serves the resulting
+.br/.gz siblings, so serving them costs no CPU per request.
+
+Run `python compression.py` as a build or deploy step to precompress the frontend. The server
+never writes them itself (the deployed tree may be read-only): it serves the siblings that
+exist and falls back to the plain file for the rest.
+"""
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.staticfiles import StaticFiles
+from typing import Optional
+import anyio
+import gzip
+import mimetypes
+import os
+import stat
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional: without it everything falls back to gzip
+    brotli = None
+
+# Responses smaller than this are sent as they are; compressing them saves too little
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Per-request compression favours speed; build-time compression uses the maximum levels
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+
+# In order of preference
+STATIC_ENCODINGS = {"br": ".br", "gzip": ".gz"}
+PRECOMPRESS_EXTENSIONS = (".html", ".css", ".js", ".json", ".svg", ".txt")
+
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/javascript", "application/x-ndjson", "image/svg+xml"
+)
+
+# Sent a message at a time; buffering them up to minimum_size would hold them back
+STREAMED_TYPES = ("text/event-stream",)
+
+
+def api_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith("+json")
+
+
+def negotiate_encoding(accept_encoding: str, available) -> Optional[str]:
+    """
+    The encoding from `available` (in order of preference) the client ranks highest
+    in its Accept-Encoding header, or None to send the response uncompressed.
+    """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def add_vary(headers: MutableHeaders):
+    vary = headers.get("vary", "")
+    if "accept-encoding" not in vary.lower():
+        headers["vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+
+
+def weaken_etag(headers: MutableHeaders):
+    """A compressed body is a different representation, so a strong ETag no longer holds;
+    weak ETags still match If-None-Match (etags.py compares them weakly)"""
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["etag"] = f"W/{etag}"
+
+
+# ============== API Responses ==============
+
+class StreamCompressor:
+    """Incremental gzip or brotli encoder; each chunk is flushed so streamed responses keep streaming"""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)  # gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    Compress responses under `prefix` when the client accepts br or gzip and the body is
+    at least `minimum_size` bytes. The start of the body is buffered until that size is
+    reached (or the body ends), so a streamed body (e.g. a CSV export) is compressed chunk
+    by chunk while a small one, even if sent in several pieces, goes out as it is.
+    """
+
+    def __init__(self, app, prefix: str = "/api/", minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.prefix = prefix
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), api_encodings())
+        start_message = None
+        buffered = b""
+        compressor = None
+
+        async def send_compressed(message):
+            nonlocal start_message, buffered, compressor
+            if message["type"] == "http.response.start":
+                if Headers(raw=message["headers"]).get("content-type", "").startswith(STREAMED_TYPES):
+                    await send(message)  # start_message stays None: the body passes straight through
+                    return
+                # Hold the headers back until enough of the body has arrived to decide
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            more_body = message.get("more_body", False)
+            if start_message is None:
+                # Headers already sent: pass through, compressing if that was decided
+                if compressor is not None:
+                    body = compressor.compress(message.get("body", b""))
+                    if not more_body:
+                        body += compressor.finish()
+                    message = {"type": "http.response.body", "body": body, "more_body": more_body}
+                await send(message)
+                return
+
+            buffered += message.get("body", b"")
+            if more_body and len(buffered) < self.minimum_size:
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            status = start_message["status"]
+            compressible = (
+                is_compressible(headers.get("content-type", ""))
+                and "content-encoding" not in headers
+                and status not in (204, 206, 304)
+            )
+            if compressible:
+                add_vary(headers)
+            body = buffered
+            if compressible and encoding and len(buffered) >= self.minimum_size:
+                compressor = StreamCompressor(encoding)
+                headers["content-encoding"] = encoding
+                weaken_etag(headers)
+                body = compressor.compress(buffered)
+                if more_body:
+                    del headers["content-length"]
+                else:
+                    body += compressor.finish()
+                    headers["content-length"] = str(len(body))
+            elif encoding and status == 304:
+                # Must carry the same ETag as the (compressed) full response would
+                weaken_etag(headers)
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+            start_message = None
+            buffered = b""
+
+        await self.app(scope, receive, send_compressed)
+
+
+# ============== Static Files ==============
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that answers with a file's .br or .gz sibling (made by precompress_static)
+    when the client accepts that encoding. A sibling older than its file is ignored, so
+    an edit without a rebuild is served uncompressed rather than stale.
+    """
+
+    def __init__(self, *args, cache_control: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+
+    async def get_response(self, path: str, scope):
+        response = None
+        encoding = None
+        if scope["method"] in ("GET", "HEAD") and path.endswith(PRECOMPRESS_EXTENSIONS):
+            accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+            encoding = negotiate_encoding(accept_encoding, tuple(STATIC_ENCODINGS))
+        if encoding:
+            response = await self.precompressed_response(path, encoding, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if path.endswith(PRECOMPRESS_EXTENSIONS):
+            add_vary(response.headers)
+        if self.cache_control and response.status_code in (200, 304):
+            response.headers["cache-control"] = self.cache_control
+        return response
+
+    async def precompressed_response(self, path: str, encoding: str, scope):
+        full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path)
+        encoded_path, encoded_stat = await anyio.to_thread.run_sync(
+            self.lookup_path, path + STATIC_ENCODINGS[encoding]
+        )
+        if not (stat_result and stat.S_ISREG(stat_result.st_mode)):
+            return None
+        if not (encoded_stat and stat.S_ISREG(encoded_stat.st_mode)):
+            return None
+        if encoded_stat.st_mtime < stat_result.st_mtime:
+            return None
+
+        response = self.file_response(encoded_path, encoded_stat, scope)
+        if response.status_code == 200:
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            if media_type.startswith("text/"):
+                media_type += "; charset=utf-8"
+            response.headers["content-type"] = media_type
+            response.headers["content-encoding"] = encoding
+        return response
+
+
+# ============== Build Step ==============
+
+def write_if_smaller(path: str, source: bytes, compressed: bytes) -> bool:
+    """Write a compressed sibling (atomically), or remove it if compressing does not help"""
+    if len(compressed) >= len(source):
+        if os.path.exists(path):
+            os.remove(path)
+        return False
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(compressed)
+    os.replace(temp_path, path)
+    return True
+
+
+def precompress_static(directory: str, force: bool = False) -> int:
+    """Write .gz (and .br, if brotli is installed) next to every text asset under `directory`
+    that lacks an up-to-date one; returns how many files were written"""
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(PRECOMPRESS_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            source_mtime = os.stat(path).st_mtime
+            targets = [(".gz", lambda data: gzip.compress(data, STATIC_GZIP_LEVEL, mtime=0))]
+            if brotli is not None:
+                targets.append((".br", lambda data: brotli.compress(data, quality=STATIC_BROTLI_QUALITY)))
+
+            data = None
+            for suffix, compress in targets:
+                target = path + suffix
+                if not force and os.path.exists(target) and os.stat(target).st_mtime >= source_mtime:
+                    continue
+                if data is None:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                written += write_if_smaller(target, data, compress(data))
+    return written
+
+
+if __name__ == "__main__":
+    frontend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+    if brotli is None:
+        print("brotli is not installed - writing .gz files only (pip install brotli)")
+    count = precompress_static(frontend_dir, force=True)
+    print(f"Wrote {count} precompressed files in {frontend_dir}")
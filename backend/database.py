@@ -1,7 +1,16 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
 import os
+import re
+import time
+
+from pool_metrics import PoolStats, env_bool, pool_options, track_pool
 
 # Get database URL from environment variable
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost/elise_crm")
@@ -10,23 +19,183 @@ DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost/elise_crm")
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(DATABASE_URL)
+
+def async_database_url(url: str) -> str:
+    """Same database, through an async driver (asyncpg for PostgreSQL, aiosqlite for SQLite)"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+# The API handlers use the async engine; the sync engine is kept for the startup
+# schema check, Alembic and the bulk importer (which runs in a worker thread).
+# Pool size, overflow, timeouts, recycle and pre-ping come from DB_POOL_* (see pool_metrics.py).
+DRIVER = DATABASE_URL.split(":", 1)[0].split("+", 1)[0]
+engine = create_engine(DATABASE_URL, **pool_options(DRIVER, is_async=False))
+async_engine = create_async_engine(async_database_url(DATABASE_URL), **pool_options(DRIVER, is_async=True))
+
+pool_stats = {"async": PoolStats(), "sync": PoolStats()}
+track_pool(async_engine.sync_engine, pool_stats["async"])
+track_pool(engine, pool_stats["sync"])
+
+
+def get_pool_stats() -> dict:
+    """Live pool statistics for both engines"""
+    return {
+        "async": pool_stats["async"].snapshot(async_engine.sync_engine.pool),
+        "sync": pool_stats["sync"].snapshot(engine.pool),
+    }
+
+if engine.dialect.name == "sqlite":
+    # The sqlite drivers' own transaction handling breaks SAVEPOINTs; let SQLAlchemy
+    # emit BEGIN itself instead
+    for sqlite_engine in (engine, async_engine.sync_engine):
+        @event.listens_for(sqlite_engine, "connect")
+        def _disable_driver_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(sqlite_engine, "begin")
+        def _begin_sqlite_transaction(connection):
+            connection.exec_driver_sql("BEGIN")
+
+
+# ============== Query Counting ==============
+
+class QueryCounter:
+    """Number of SQL statements executed while the counter is active, and the time spent on them"""
+
+    def __init__(self, parent: Optional["QueryCounter"] = None):
+        self.count = 0
+        self.duration = 0.0  # seconds
+        # Counters nest (e.g. a test's counter around the request metrics); outer ones see every statement too
+        self.parent = parent
+
+    def record(self, duration: float):
+        counter = self
+        while counter is not None:
+            counter.count += 1
+            counter.duration += duration
+            counter = counter.parent
+
+
+# Per-request counter; a context variable so concurrent requests don't mix their counts
+_active_counter: ContextVar[Optional[QueryCounter]] = ContextVar("active_query_counter", default=None)
+
+
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_started = time.perf_counter()
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _active_counter.get()
+    # The explicit BEGIN emitted for SQLite (see above) is not a query worth budgeting
+    if counter is not None and statement != "BEGIN":
+        started = getattr(context, "query_started", None)
+        counter.record(time.perf_counter() - started if started is not None else 0.0)
+
+
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", _start_statement)
+    event.listen(_engine, "after_cursor_execute", _count_statement)
+
+
+@contextmanager
+def count_queries():
+    """Count and time the SQL statements executed inside the block (including in threadpool work)"""
+    counter = QueryCounter(parent=_active_counter.get())
+    reset_token = _active_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _active_counter.reset(reset_token)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False: objects stay readable after commit, since an async
+# session cannot lazy-load expired attributes during response serialization
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def init_db():
-    """Initialize database tables"""
-    from models import Contact, CallLog, Callback, Booking
-    Base.metadata.create_all(bind=engine)
+# ============== Schema Revision ==============
+
+# Run `alembic upgrade head` from startup when the database is behind, instead of refusing to start
+DB_AUTO_MIGRATE = env_bool("DB_AUTO_MIGRATE", False)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def alembic_config():
+    """Alembic config for this project that works from any working directory"""
+    from alembic.config import Config
+    # No ini file: alembic.ini's logging setup would replace the server's loggers
+    config = Config()
+    config.set_main_option("script_location", os.path.join(BASE_DIR, "alembic"))
+    return config
+
+
+# Lines like `revision: str = '006'` and `down_revision: Union[str, None] = '005'` in a revision file
+REVISION_LINE = re.compile(r"^(revision|down_revision)\b[^=]*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+
+
+def schema_revisions() -> tuple:
+    """
+    (head revision, every known revision) of the migration scripts. Read from the files
+    directly: loading them through Alembic's ScriptDirectory would add a quarter of a
+    second to every startup.
+    """
+    revisions, parents = set(), set()
+    versions_dir = os.path.join(BASE_DIR, "alembic", "versions")
+    for name in os.listdir(versions_dir):
+        if name.endswith(".py"):
+            with open(os.path.join(versions_dir, name), encoding="utf-8") as f:
+                for key, value in REVISION_LINE.findall(f.read()):
+                    (revisions if key == "revision" else parents).add(value)
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise RuntimeError(f"Expected one alembic head revision, found {sorted(heads)}")
+    return heads.pop(), revisions
+
+
+def current_revision() -> Optional[str]:
+    """The revision the database is stamped with (None for a database Alembic has never touched)"""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        return None
+
+
+def check_schema_revision():
+    """
+    Schema changes live in Alembic revisions, applied before the app starts
+    (`alembic upgrade head`), so startup costs one query instead of a round of DDL.
+    Refuses to start on a database that is behind; a database that is ahead
+    (a newer release has migrated it) is allowed, as the new columns are unused here.
+    """
+    head, known = schema_revisions()
+    current = current_revision()
+    if current == head:
+        return
+    if current is not None and current not in known:
+        print(f"Database schema is at revision {current}, newer than this release's {head}")
+        return
+    if DB_AUTO_MIGRATE:
+        from alembic import command
+        print(f"Migrating database schema from revision {current} to {head}")
+        command.upgrade(alembic_config(), "head")
+        return
+    raise RuntimeError(
+        f"Database schema is at revision {current}, expected {head}: run `alembic upgrade head` "
+        f"(or set DB_AUTO_MIGRATE=true)"
+    )
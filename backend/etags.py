@@ -0,0 +1,98 @@
+from fastapi import Request, Response, status
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Iterable, Optional
+import hashlib
+
+from changes import stamp_changes
+from events import CHANGED_TABLES_KEY
+from models import TableVersion
+
+# Tables with a version counter. Write handlers mark the tables they change, and the
+# counters are bumped as the last step of the transaction (so a rolled-back write never
+# bumps), and the rows written stamped with the new version for the change feed; GET endpoints hash the versions of every table their response reads into a
+# strong ETag.
+VERSIONED_TABLES = ("contacts", "call_logs", "callbacks", "bookings", "targets")
+
+# Clients may keep a copy, but must revalidate it before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+# ============== Version Counters ==============
+
+def bump_versions(db: AsyncSession, *tables: str):
+    """Mark tables as changed by the caller's transaction: their counters are bumped when it
+    commits (and events.py announces the write once it has)"""
+    db.info.setdefault(CHANGED_TABLES_KEY, set()).update(tables)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_marked_versions(session):
+    # Each counter row is locked from its UPDATE until the commit, so bumping them last keeps
+    # writers to the same table from waiting on each other for more than a commit, and
+    # bumping in name order means two transactions never lock them in opposite orders
+    tables = session.info.get(CHANGED_TABLES_KEY)
+    if not tables:
+        return
+    session.flush()
+    for table in sorted(tables):
+        session.execute(
+            update(TableVersion)
+            .where(TableVersion.table_name == table)
+            .values(version=TableVersion.version + 1)
+        )
+        version = session.scalar(select(TableVersion.version).where(TableVersion.table_name == table))
+        if version is not None:
+            stamp_changes(session, table, version)
+
+
+async def get_versions(db: AsyncSession, tables: Iterable[str]) -> Optional[dict]:
+    """Current counters for the given tables, or None if any is missing"""
+    tables = tuple(tables)
+    rows = (await db.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(tables))
+    )).all()
+    versions = dict(rows)
+    if len(versions) != len(tables):
+        return None
+    return versions
+
+
+# ============== Conditional GET ==============
+
+def make_etag(request: Request, versions: dict) -> str:
+    """Strong ETag for this URL (path and query) at these table versions"""
+    state = ",".join(f"{table}={versions[table]}" for table in sorted(versions))
+    key = f"{request.url.path}?{request.url.query}|{state}"
+    return '"' + hashlib.blake2s(key.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    candidates = (value.strip() for value in if_none_match.split(","))
+    return any(value.removeprefix("W/") == etag for value in candidates)
+
+
+async def check_etag(db: AsyncSession, request: Request, response: Response, tables: Iterable[str]) -> Optional[Response]:
+    """
+    Call at the top of a GET handler, before running its query.
+    Returns a 304 response if the client's cached copy is current; otherwise sets the
+    ETag on `response` and returns None so the handler carries on.
+    Versions are read before the handler's own query, so a write racing the request
+    can only make the ETag older than the data (a harmless extra 200), never newer.
+    """
+    versions = await get_versions(db, tables)
+    if versions is None:
+        return None
+
+    etag = make_etag(request, versions)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
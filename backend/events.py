@@ -0,0 +1,166 @@
+"""
+Live updates for GET /api/events (Server-Sent Events).
+
+Every committed write that changes a versioned table (see etags.bump_versions) is announced to
+the open CRM tabs as one small event:
+
+    data: {"type": "changes", "tables": ["bookings"], "stats": {...dashboard stats...}}
+
+Tabs fetch the rows themselves from GET /api/changes. reminders.py sends `callback_due`
+events through the same hub. Writes arriving within EVENT_DELAY
+of each other share one event, and the dashboard stats in it are computed once for all
+subscribers. An idle connection costs a keepalive comment every KEEPALIVE seconds and no
+queries.
+
+The hub lives in this process: with several workers, a tab only hears about writes
+handled by the worker it is connected to. main.py's lifespan opens it on startup and ends
+the streams on shutdown. uvicorn only runs the shutdown once the responses in progress have
+finished, and an event stream never finishes by itself, so start uvicorn with
+--timeout-graceful-shutdown to have it cut them off instead of waiting forever.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Awaitable, Callable, Optional
+import asyncio
+import json
+
+# Seconds to wait for more writes before announcing them
+EVENT_DELAY = 0.2
+# Seconds between keepalive comments, so proxies don't close an idle stream
+KEEPALIVE = 25
+# Events a slow subscriber may fall behind by before its backlog is replaced by a resync
+QUEUE_SIZE = 100
+# How long a disconnected browser waits before reconnecting (ms, sent as the SSE retry field)
+RETRY_MS = 5000
+
+# Tables the dashboard stats are counted from
+STATS_TABLES = {"contacts", "bookings", "callbacks"}
+
+
+def format_event(data: dict) -> bytes:
+    return f"data: {json.dumps(data, separators=(',', ':'), default=str)}\n\n".encode("utf-8")
+
+
+RESYNC = format_event({"type": "resync"})
+
+
+class EventHub:
+    """Fans events out to every connected subscriber, each with its own bounded queue"""
+
+    def __init__(self, delay: float = EVENT_DELAY, queue_size: int = QUEUE_SIZE):
+        self.delay = delay
+        self.queue_size = queue_size
+        self.stats_source: Optional[Callable[[], Awaitable[dict]]] = None  # set by main.py
+        self._subscribers = set()
+        self._pending = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def publish(self, data: dict):
+        """Send an event to every subscriber (encoded once, whatever their number)"""
+        message = format_event(data)
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too far behind to catch up event by event: tell it to resync instead
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+    def open(self):
+        """Accept streams (the app is starting up)"""
+        self._closed = False
+
+    def close(self):
+        """End every stream (the app is shutting down) and refuse new ones"""
+        self._closed = True
+        for queue in self._subscribers:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    def tables_changed(self, tables):
+        """Announce a committed write; runs on the event loop (from a session's after_commit)"""
+        if not self._subscribers:
+            return
+        self._pending.update(tables)
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush())
+
+    async def _flush(self):
+        await asyncio.sleep(self.delay)
+        tables, self._pending = self._pending, set()
+        self._flush_task = None
+
+        data = {"type": "changes", "tables": sorted(tables)}
+        if self.stats_source is not None and tables & STATS_TABLES:
+            try:
+                data["stats"] = await self.stats_source()
+            except Exception as e:
+                print(f"Live update stats error: {e}")
+        self.publish(data)
+
+    async def stream(self):
+        """The body of one subscriber's text/event-stream response"""
+        if self._closed:
+            return
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode("utf-8")
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), KEEPALIVE)
+                except asyncio.TimeoutError:
+                    message = b": keepalive\n\n"
+                if message is None:
+                    return
+                yield message
+        finally:
+            self._subscribers.discard(queue)
+
+
+hub = EventHub()
+
+
+# ============== Commit Hooks ==============
+
+# Session.info key -> function called with what the unit of work left under that key, once
+# it has committed. Work that rolls back is forgotten, so nothing is announced for it.
+_commit_hooks = {}
+
+
+def on_commit(info_key: str, hook: Callable):
+    _commit_hooks[info_key] = hook
+
+
+def run_commit_hooks(info: dict):
+    """Hand a committed unit of work's notes to their hooks, and forget them"""
+    for key, hook in _commit_hooks.items():
+        value = info.pop(key, None)
+        if not value:
+            continue
+        try:
+            hook(value)
+        except RuntimeError:
+            pass  # no running event loop (a sync session in a worker thread): nobody to tell
+
+
+CHANGED_TABLES_KEY = "changed_tables"  # filled by etags.bump_versions
+on_commit(CHANGED_TABLES_KEY, hub.tables_changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    run_commit_hooks(session.info)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    for key in _commit_hooks:
+        session.info.pop(key, None)
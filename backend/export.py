@@ -0,0 +1,107 @@
+from sqlalchemy import select
+from decimal import Decimal
+import csv
+import io
+
+from database import AsyncSessionLocal
+from models import Contact, CallLog, Callback, Booking, Target
+
+# Rows fetched from the database cursor (and written to the response) at a time
+EXPORT_BATCH_SIZE = 500
+
+
+# ============== Cell Formatting ==============
+# These match the formatting of the old client-side export in crm.js
+
+def format_datetime(value) -> str:
+    """e.g. '03 Jan 2025, 14:00' (same as formatDateTime in crm.js)"""
+    if value is None:
+        return "-"
+    return value.strftime("%d %b %Y, %H:%M")
+
+
+def format_fee(value) -> str:
+    if not value:
+        return ""
+    return f"£{Decimal(value):.2f}"
+
+
+def format_enum(value) -> str:
+    return value.value if value is not None else ""
+
+
+def text_cell(value) -> str:
+    return "" if value is None else str(value)
+
+
+# ============== Export Definitions ==============
+# Each export: filename, header row, SELECT statement, and a function turning a result row into cells
+
+EXPORTS = {
+    "contacts": (
+        "contacts_export.csv",
+        ["Care Home", "Contact Person", "Telephone", "Email", "Address", "Postcode", "Website"],
+        select(
+            Contact.care_home_name, Contact.contact_person, Contact.telephone, Contact.email,
+            Contact.address, Contact.postcode, Contact.website
+        ).order_by(Contact.care_home_name, Contact.id),
+        lambda row: [text_cell(value) for value in row],
+    ),
+    "bookings": (
+        "bookings_export.csv",
+        ["Date From", "Date To", "Care Home", "Type", "Fee Agreed", "Fee Status"],
+        select(
+            Booking.booking_from, Booking.booking_to, Contact.care_home_name,
+            Booking.booking_type, Booking.fee_agreed, Booking.fee_status
+        ).outerjoin(Contact, Booking.contact_id == Contact.id).order_by(Booking.booking_from, Booking.id),
+        lambda row: [
+            format_datetime(row.booking_from), format_datetime(row.booking_to), text_cell(row.care_home_name),
+            text_cell(row.booking_type), format_fee(row.fee_agreed), format_enum(row.fee_status)
+        ],
+    ),
+    "call-logs": (
+        "call_logs_export.csv",
+        ["Date", "Care Home", "Notes"],
+        select(
+            CallLog.call_datetime, Contact.care_home_name, CallLog.notes
+        ).outerjoin(Contact, CallLog.contact_id == Contact.id).order_by(CallLog.call_datetime.desc(), CallLog.id.desc()),
+        lambda row: [format_datetime(row.call_datetime), text_cell(row.care_home_name), text_cell(row.notes)],
+    ),
+    "callbacks": (
+        "callbacks_export.csv",
+        ["Callback Date", "Original Call", "Care Home", "Type", "Notes"],
+        select(
+            Callback.callback_datetime, Callback.original_call_datetime,
+            Contact.care_home_name.label("contact_name"), Target.care_home_name.label("target_name"),
+            Callback.callback_type, Callback.notes
+        ).outerjoin(Contact, Callback.contact_id == Contact.id)
+         .outerjoin(Target, Callback.target_id == Target.id)
+         .order_by(Callback.callback_datetime, Callback.id),
+        lambda row: [
+            format_datetime(row.callback_datetime), format_datetime(row.original_call_datetime),
+            text_cell(row.contact_name or row.target_name), format_enum(row.callback_type), text_cell(row.notes)
+        ],
+    ),
+}
+
+
+async def stream_csv(name: str):
+    """
+    Generate the CSV for an export chunk by chunk.
+    Rows come from a server-side cursor (stream + yield_per), so memory use does not grow with the table.
+    Uses its own session because the response body is produced after the request handler returns.
+    """
+    _, headers, statement, to_cells = EXPORTS[name]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator="\n")
+
+    yield ",".join(headers) + "\n"
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            for row in rows:
+                writer.writerow(to_cells(row))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
@@ -13,18 +13,22 @@ let deleteTarget = { type: null, id: null };
 
 // Pagination state
 const PAGE_SIZE = 10;
-let contactsPage = 1;
+const MAX_PAGE_SIZE = 500;
+const SEARCH_LIMIT = 50;  // results shown for a contact/target search
 let callbacksPage = 1;
 let bookingsPage = 1;
+let callbacksCursors = [null];  // cursor for the start of each callbacks page
+let bookingsCursors = [null];   // cursor for the start of each bookings page
 let allCallbacks = [];
 let allBookings = [];
-let filteredContacts = null;
-let contactsLetter = null;
+let contactsLetter = 'A';
+let contactsCursor = null;      // cursor for the next batch of contacts
+let searchTimer = null;
 
 // Targets state
 let targets = [];
-let filteredTargets = null;
-let targetsLetter = null;
+let targetsLetter = 'A';
+let targetsCursor = null;
 
 // ========================================
 // ACTION DROPDOWN
@@ -50,109 +54,359 @@ document.addEventListener('click', function (e) {
 });
 
 // ========================================
-// PAGINATION
+// API HELPERS
 // ========================================
 
-function paginate(items, page, pageSize = PAGE_SIZE) {
-    const start = (page - 1) * pageSize;
-    return items.slice(start, start + pageSize);
+function buildQuery(params) {
+    const query = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+        if (value !== null && value !== undefined && value !== '') query.set(key, value);
+    });
+    const queryString = query.toString();
+    return queryString ? `?${queryString}` : '';
+}
+
+// Last response body and ETag per GET URL. The server answers 304 Not Modified when
+// the ETag is still current, and the cached body is reused instead.
+const ETAG_CACHE_SIZE = 200;
+const etagCache = new Map();
+
+async function apiGet(path, params = {}) {
+    const url = `${API_URL}${path}${buildQuery(params)}`;
+    const cached = etagCache.get(url);
+    const headers = { 'Authorization': `Bearer ${authToken}` };
+    if (cached) headers['If-None-Match'] = cached.etag;
+
+    // no-store: revalidation is done here, so keep the browser's HTTP cache out of it
+    const response = await fetch(url, { headers, cache: 'no-store' });
+    if (response.status === 304 && cached) {
+        // Re-insert so the Map stays in least-recently-used order
+        etagCache.delete(url);
+        etagCache.set(url, cached);
+        return JSON.parse(cached.body);
+    }
+    if (!response.ok) throw new Error(`Failed to load ${path}`);
+
+    // Keep the raw text and parse it on every use, so callers can modify what they get back
+    const body = await response.text();
+    const etag = response.headers.get('ETag');
+    etagCache.delete(url);
+    if (etag) {
+        etagCache.set(url, { etag, body });
+        if (etagCache.size > ETAG_CACHE_SIZE) etagCache.delete(etagCache.keys().next().value);
+    }
+    return JSON.parse(body);
+}
+
+// Send a partial update; resolves to the saved row, which the update endpoints return
+async function apiPut(path, data) {
+    const response = await fetch(`${API_URL}${path}`, {
+        method: 'PUT',
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${authToken}`
+        },
+        body: JSON.stringify(data)
+    });
+    if (!response.ok) throw new Error(`Failed to save ${path}`);
+    return response.json();
 }
 
-function renderPagination(containerId, totalItems, currentPage, onPageChange, pageSize = PAGE_SIZE) {
-    const container = document.getElementById(containerId);
-    if (!container) return;
+// Fetch one page of a list endpoint: resolves to { items, next_cursor }
+function fetchPage(path, params = {}) {
+    return apiGet(path, params);
+}
 
-    const totalPages = Math.ceil(totalItems / pageSize);
+// Walk every page of a list endpoint - only for views that genuinely need the full list
+async function fetchAllPages(path, params = {}) {
+    let items = [];
+    let cursor = null;
+    do {
+        const page = await fetchPage(path, { ...params, cursor, limit: MAX_PAGE_SIZE });
+        items = items.concat(page.items);
+        cursor = page.next_cursor;
+    } while (cursor);
+    return items;
+}
 
-    if (totalPages <= 1) {
-        container.innerHTML = '';
-        return;
+// ========================================
+// CHANGE FEED
+// ========================================
+
+// GET /changes lists the rows created, updated or deleted since a cursor, so after a write
+// (or on a live update event, or every CHANGES_POLL_INTERVAL while live updates are down)
+// the lists on screen are patched with just those rows instead of being reloaded
+const CHANGES_POLL_INTERVAL = 30000;
+let changesCursor = null;       // cursor from the last sync; null until the feed is started
+let changesTimer = null;
+let changesQueue = Promise.resolve();
+
+// Take a cursor before the lists first load, so nothing written while they load is missed
+async function startChangeFeed() {
+    stopChangeFeed();
+    try {
+        changesCursor = (await apiGet('/changes')).cursor;
+    } catch (error) {
+        console.error('Failed to start change feed:', error);
     }
+    changesTimer = setInterval(() => {
+        if (!document.hidden && !liveUpdatesConnected) syncChanges();
+    }, CHANGES_POLL_INTERVAL);
+}
 
-    let html = '';
+function stopChangeFeed() {
+    clearInterval(changesTimer);
+    changesTimer = null;
+    changesCursor = null;
+}
 
-    // Previous button
-    html += `<button class="pagination-btn" ${currentPage === 1 ? 'disabled' : ''} onclick="${onPageChange}(${currentPage - 1})">&laquo; Prev</button>`;
+// Syncs run one at a time, so two never apply the same changes.
+// Pass refreshStats=false when the dashboard stats are already current.
+function syncChanges(refreshStats = true) {
+    changesQueue = changesQueue.then(() => runSync(refreshStats));
+    return changesQueue;
+}
 
-    // Page numbers with ellipsis logic
-    const pages = [];
-    if (totalPages <= 7) {
-        for (let i = 1; i <= totalPages; i++) pages.push(i);
-    } else {
-        pages.push(1);
-        if (currentPage > 3) pages.push('...');
-        const start = Math.max(2, currentPage - 1);
-        const end = Math.min(totalPages - 1, currentPage + 1);
-        for (let i = start; i <= end; i++) pages.push(i);
-        if (currentPage < totalPages - 2) pages.push('...');
-        pages.push(totalPages);
-    }
-
-    pages.forEach(p => {
-        if (p === '...') {
-            html += `<span class="pagination-ellipsis">...</span>`;
+async function runSync(refreshStats) {
+    if (!changesCursor) return;
+    try {
+        const feed = await apiGet('/changes', { since: changesCursor });
+        if (!changesCursor) return;  // logged out meanwhile
+        changesCursor = feed.cursor;
+        if (feed.reset) {
+            reloadAll();
+        } else if (Object.keys(feed.changes).length > 0) {
+            applyChanges(feed.changes, refreshStats);
+        }
+    } catch (error) {
+        console.error('Failed to sync changes:', error);
+    }
+}
+
+function isSectionActive(section) {
+    const el = document.getElementById(section);
+    return !!el && el.classList.contains('active');
+}
+
+// The server's letter filter: first character of the trimmed name, '#' for anything but A-Z
+function nameLetter(name) {
+    const first = (name || '').trimStart().charAt(0).toUpperCase();
+    return first >= 'A' && first <= 'Z' ? first : '#';
+}
+
+// Contacts and targets are listed by care home name, then id
+function compareByName(a, b) {
+    if (a.care_home_name !== b.care_home_name) return a.care_home_name < b.care_home_name ? -1 : 1;
+    return a.id - b.id;
+}
+
+// Apply one table's changes to a list sorted by name: drop deleted rows, replace updated
+// ones and add rows that now belong. While more pages remain to be loaded, rows sorting
+// after the last loaded one are left for those pages.
+function mergeByName(rows, change, belongs, hasMore) {
+    const changed = new Set(change.deleted.concat(change.upserted.map(row => row.id)));
+    const last = rows[rows.length - 1];
+    const added = change.upserted.filter(row =>
+        belongs(row) && !(hasMore && last && compareByName(row, last) > 0));
+    return rows.filter(row => !changed.has(row.id)).concat(added).sort(compareByName);
+}
+
+// Search results keep their order: update the rows shown and drop deleted ones, but add none
+function patchRows(rows, change) {
+    const deleted = new Set(change.deleted);
+    const updated = new Map(change.upserted.map(row => [row.id, row]));
+    return rows.filter(row => !deleted.has(row.id)).map(row => updated.get(row.id) || row);
+}
+
+function applyChanges(changes, refreshStats = true) {
+    const contactChanges = changes.contacts;
+    if (contactChanges) {
+        const searching = !!document.getElementById('contactSearch')?.value.trim();
+        contacts = searching
+            ? patchRows(contacts, contactChanges)
+            : mergeByName(contacts, contactChanges, row => nameLetter(row.care_home_name) === contactsLetter, !!contactsCursor);
+        renderContactsTable(searching);
+    }
+
+    const targetChanges = changes.targets;
+    if (targetChanges) {
+        const searching = !!document.getElementById('targetSearch')?.value.trim();
+        targets = searching
+            ? patchRows(targets, targetChanges)
+            : mergeByName(targets, targetChanges, row => nameLetter(row.care_home_name) === targetsLetter, !!targetsCursor);
+        renderTargetsTable(searching);
+    }
+
+    // Callback and booking pages are ordered by date and embed their contact (and target),
+    // so when any of those change the visible page is fetched again - one page, not the table
+    if ((changes.callbacks || contactChanges || targetChanges) && isSectionActive('callbacks')) {
+        loadCallbacks();
+    }
+    if (changes.bookings || contactChanges) {
+        if (isSectionActive('bookings')) loadBookings();
+        if (isSectionActive('calendar')) {
+            loadCalendar();
         } else {
-            html += `<button class="pagination-btn ${p === currentPage ? 'active' : ''}" onclick="${onPageChange}(${p})">${p}</button>`;
+            calendarMonthCache.clear();
         }
-    });
+    }
+    if (refreshStats) loadDashboard();
+}
 
-    // Next button
-    html += `<button class="pagination-btn" ${currentPage === totalPages ? 'disabled' : ''} onclick="${onPageChange}(${currentPage + 1})">Next &raquo;</button>`;
+// The feed could not list the changes (too many, or the cursor is too old): start over
+function reloadAll() {
+    calendarMonthCache.clear();
+    loadContacts();
+    loadTargets();
+    if (isSectionActive('callbacks')) loadCallbacks();
+    if (isSectionActive('bookings')) loadBookings();
+    if (isSectionActive('calendar')) loadCalendar();
+    loadDashboard();
+}
+
+// ========================================
+// LIVE UPDATES
+// ========================================
+
+// GET /events is a Server-Sent Events stream with one small event after every save, by
+// anyone: which tables changed, plus fresh dashboard stats. Read with fetch() rather than
+// EventSource so the session token can go in the Authorization header.
+const LIVE_RETRY_DELAY = 5000;
+let liveUpdatesController = null;
+let liveUpdatesConnected = false;
+
+async function startLiveUpdates() {
+    stopLiveUpdates();
+    const controller = new AbortController();
+    liveUpdatesController = controller;
+
+    while (!controller.signal.aborted) {
+        try {
+            const response = await fetch(`${API_URL}/events`, {
+                headers: { 'Authorization': `Bearer ${authToken}` },
+                cache: 'no-store',
+                signal: controller.signal
+            });
+            if (response.status === 401) return;  // session over: nothing to listen for
+            if (!response.ok || !response.body) throw new Error('Failed to connect to live updates');
 
-    container.innerHTML = html;
+            liveUpdatesConnected = true;
+            syncChanges();  // catch up on anything saved while disconnected
+            await readEvents(response.body, handleLiveEvent);
+        } catch (error) {
+            if (controller.signal.aborted) return;
+            console.error('Live updates disconnected:', error);
+        } finally {
+            liveUpdatesConnected = false;
+        }
+        await new Promise(resolve => setTimeout(resolve, LIVE_RETRY_DELAY));
+    }
 }
 
-function goToContactsPage(page) {
-    contactsPage = page;
-    renderContactsTable(filteredContacts);
+function stopLiveUpdates() {
+    if (liveUpdatesController) liveUpdatesController.abort();
+    liveUpdatesController = null;
+    liveUpdatesConnected = false;
+}
+
+// Parse a text/event-stream body, calling onEvent with each event's JSON data
+async function readEvents(body, onEvent) {
+    const reader = body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) return;
+        buffer += value;
+        let end;
+        while ((end = buffer.indexOf('\n\n')) >= 0) {
+            const block = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            const data = block.split('\n')
+                .filter(line => line.startsWith('data:'))
+                .map(line => line.slice(5).trim())
+                .join('\n');
+            if (data) onEvent(JSON.parse(data));
+        }
+    }
 }
 
-function goToContactsLetter(letter) {
-    contactsLetter = letter;
-    renderContactsTable(filteredContacts);
+function handleLiveEvent(event) {
+    if (event.type === 'callback_due') {
+        // Sent by the server as each To Call Back callback falls due (textContent: no escaping needed)
+        event.callbacks.forEach(cb => {
+            const name = cb.contact?.care_home_name || cb.target?.care_home_name || 'Unknown';
+            showToast(`Callback due: ${name}`);
+        });
+        return;
+    }
+    if (event.stats) renderDashboardStats(event.stats);
+    // 'changes' or 'resync' (this tab fell behind): either way the change feed catches up.
+    // A changes event carries the stats whenever the tables it lists affect them.
+    syncChanges(event.type === 'resync');
 }
 
-function renderLetterPagination(containerId, items, currentLetter, onLetterChange) {
+// ========================================
+// PAGINATION
+// ========================================
+
+function renderCursorPagination(containerId, currentPage, hasNext, onPageChange) {
     const container = document.getElementById(containerId);
     if (!container) return;
 
-    const letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'.split('');
+    if (currentPage === 1 && !hasNext) {
+        container.innerHTML = '';
+        return;
+    }
+
+    container.innerHTML = `
+        <button class="pagination-btn" ${currentPage === 1 ? 'disabled' : ''} onclick="${onPageChange}(${currentPage - 1})">&laquo; Prev</button>
+        <button class="pagination-btn active">${currentPage}</button>
+        <button class="pagination-btn" ${hasNext ? '' : 'disabled'} onclick="${onPageChange}(${currentPage + 1})">Next &raquo;</button>
+    `;
+}
+
+function goToContactsLetter(letter) {
+    contactsLetter = letter;
+    loadContacts();
+}
 
-    // Figure out which letters have entries
-    const lettersWithItems = new Set(
-        items
-            .map(it => (it.care_home_name || '').trim().charAt(0).toUpperCase())
-            .filter(l => l)
-    );
+function renderLetterPagination(containerId, currentLetter, onLetterChange) {
+    const container = document.getElementById(containerId);
+    if (!container) return;
 
-    // Also catch anything starting with a number or symbol
-    const hasNonAlpha = items.some(it => {
-        const first = (it.care_home_name || '').trim().charAt(0).toUpperCase();
-        return first && !letters.includes(first);
-    });
+    const letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ#'.split('');
 
-    let html = letters.map(letter => {
-        const hasItems = lettersWithItems.has(letter);
+    container.innerHTML = letters.map(letter => {
         const isActive = letter === currentLetter;
-        return `<button class="pagination-btn ${isActive ? 'active' : ''}" ${hasItems ? '' : 'disabled'} onclick="${onLetterChange}('${letter}')">${letter}</button>`;
+        return `<button class="pagination-btn ${isActive ? 'active' : ''}" onclick="${onLetterChange}('${letter}')">${letter}</button>`;
     }).join('');
+}
 
-    if (hasNonAlpha) {
-        const isActive = currentLetter === '#';
-        html += `<button class="pagination-btn ${isActive ? 'active' : ''}" onclick="${onLetterChange}('#')">#</button>`;
-    }
-
-    container.innerHTML = html;
+function renderLoadMore(containerId, hasMore, onLoadMore) {
+    const container = document.getElementById(containerId);
+    if (!container || !hasMore) return;
+    container.insertAdjacentHTML('beforeend',
+        `<button class="pagination-btn" onclick="${onLoadMore}()">Load more &raquo;</button>`);
 }
 
 function goToCallbacksPage(page) {
     callbacksPage = page;
-    renderCallbacksTable(allCallbacks);
+    loadCallbacks();
 }
 
 function goToBookingsPage(page) {
     bookingsPage = page;
-    renderBookingsTable(allBookings);
+    loadBookings();
+}
+
+function resetCallbacksPaging() {
+    callbacksPage = 1;
+    callbacksCursors = [null];
+}
+
+function resetBookingsPaging() {
+    bookingsPage = 1;
+    bookingsCursors = [null];
 }
 // ========================================
 // INITIALIZATION
@@ -213,14 +467,14 @@ function setupEventListeners() {
             document.querySelectorAll('.tab-btn').forEach(b => b.classList.remove('active'));
             this.classList.add('active');
             currentCallbackTab = this.dataset.tab;
-            callbacksPage = 1;
+            resetCallbacksPaging();
             loadCallbacks();
         });
     });
 
     const bookingStatusFilter = document.getElementById('bookingStatusFilter');
     if (bookingStatusFilter) bookingStatusFilter.addEventListener('change', () => {
-        bookingsPage = 1;
+        resetBookingsPaging();
         loadBookings();
     });
 
@@ -230,6 +484,11 @@ function setupEventListeners() {
     const receiptForm = document.getElementById('receiptForm');
     if (receiptForm) receiptForm.addEventListener('submit', handleReceiptSubmit);
 
+    // Catch up as soon as the tab is shown again rather than at the next poll
+    document.addEventListener('visibilitychange', () => {
+        if (!document.hidden) syncChanges();
+    });
+
     initCalendar();
 }
 
@@ -242,9 +501,11 @@ function showLoginScreen() {
     document.getElementById('crmApp').style.display = 'none';
 }
 
-function showCRM() {
+async function showCRM() {
     document.getElementById('loginScreen').style.display = 'none';
     document.getElementById('crmApp').style.display = 'flex';
+    await startChangeFeed();
+    startLiveUpdates();
     loadDashboard();
     loadContacts();
 }
@@ -306,6 +567,9 @@ async function handleLogout(e) {
     }
     authToken = null;
     localStorage.removeItem('crm_token');
+    stopLiveUpdates();
+    stopChangeFeed();
+    etagCache.clear();
     showLoginScreen();
     document.getElementById('password').value = '';
 }
@@ -337,6 +601,7 @@ function navigateToSection(section) {
 
 function navigateToCallbacks(tab) {
     currentCallbackTab = tab;
+    resetCallbacksPaging();
     document.querySelectorAll('.tab-btn').forEach(btn => {
         btn.classList.remove('active');
         if (btn.dataset.tab === tab) {
@@ -351,6 +616,7 @@ function navigateToBookings(status) {
     if (statusFilter) {
         statusFilter.value = status;
     }
+    resetBookingsPaging();
     navigateToSection('bookings');
 }
 
@@ -364,79 +630,78 @@ async function loadDashboard() {
             headers: { 'Authorization': `Bearer ${authToken}` }
         });
         if (response.ok) {
-            const stats = await response.json();
-            document.getElementById('statContacts').textContent = stats.total_contacts;
-            document.getElementById('statUpcoming').textContent = stats.upcoming_bookings;
-            document.getElementById('statAwaitingCallback').textContent = stats.awaiting_callbacks;
-            document.getElementById('statToCallBack').textContent = stats.to_call_back;
-            document.getElementById('statUnpaid').textContent = stats.unpaid_bookings;
-            document.getElementById('statInvoiced').textContent = stats.invoiced_bookings;
+            renderDashboardStats(await response.json());
         }
     } catch (error) {
         console.error('Failed to load dashboard:', error);
     }
 }
 
+function renderDashboardStats(stats) {
+    document.getElementById('statContacts').textContent = stats.total_contacts;
+    document.getElementById('statUpcoming').textContent = stats.upcoming_bookings;
+    document.getElementById('statAwaitingCallback').textContent = stats.awaiting_callbacks;
+    document.getElementById('statToCallBack').textContent = stats.to_call_back;
+    document.getElementById('statUnpaid').textContent = stats.unpaid_bookings;
+    document.getElementById('statInvoiced').textContent = stats.invoiced_bookings;
+}
+
 // ========================================
 // CONTACTS
 // ========================================
 
-async function loadContacts() {
+// Loads the first batch of contacts for the current letter (or search term);
+// pass append=true to fetch the next batch and add it to the table
+async function loadContacts(append = false) {
+    const searchEl = document.getElementById('contactSearch');
+    const searchTerm = searchEl ? searchEl.value.trim() : '';
+
     try {
-        const response = await fetch(`${API_URL}/contacts`, {
-            headers: { 'Authorization': `Bearer ${authToken}` }
-        });
-        if (response.ok) {
-            contacts = await response.json();
-            renderContactsTable();
-            populateContactDropdowns();
+        if (searchTerm) {
+            // Fuzzy server-side search, best matches first (no further pages)
+            const results = await apiGet('/search', { q: searchTerm, type: 'contact', limit: SEARCH_LIMIT });
+            if (searchEl.value.trim() !== searchTerm) return;  // a newer keystroke has taken over
+            contacts = results.map(r => r.contact);
+            contactsCursor = null;
+            renderContactsTable(true);
+            return;
         }
+
+        const page = await fetchPage('/contacts', { letter: contactsLetter, cursor: append ? contactsCursor : null });
+        contacts = append ? contacts.concat(page.items) : page.items;
+        contactsCursor = page.next_cursor;
+        renderContactsTable(!!searchTerm);
     } catch (error) {
         console.error('Failed to load contacts:', error);
     }
 }
 
-function renderContactsTable(filtered = null) {
+function loadMoreContacts() {
+    loadContacts(true);
+}
+
+function renderContactsTable(searching = false) {
     const tbody = document.getElementById('contactsTable');
-    filteredContacts = filtered;
-    const displayContacts = (filtered || contacts)
-        .slice()
-        .sort((a, b) => (a.care_home_name || '').localeCompare(b.care_home_name || ''));
 
-    if (displayContacts.length === 0) {
+    if (searching) {
+        document.getElementById('contactsPagination').innerHTML = '';
+    } else {
+        renderLetterPagination('contactsPagination', contactsLetter, 'goToContactsLetter');
+    }
+
+    if (contacts.length === 0) {
         tbody.innerHTML = `
             <tr>
                 <td colspan="5" class="empty-state">
                     <div class="empty-state-icon">👥</div>
-                    <p>${filtered ? 'No contacts match your search.' : 'No contacts yet. Add your first contact!'}</p>
+                    <p>${searching ? 'No contacts match your search.' : 'No contacts under this letter.'}</p>
                 </td>
             </tr>
         `;
-        document.getElementById('contactsPagination').innerHTML = '';
         return;
     }
 
-    // Figure out which letters have contacts
-    const lettersWithContacts = new Set(
-        displayContacts
-            .map(c => (c.care_home_name || '').trim().charAt(0).toUpperCase())
-            .filter(l => l)
-    );
-
-    // Default to first letter that has contacts, if none selected or selected has none
-    if (!contactsLetter || !lettersWithContacts.has(contactsLetter)) {
-        contactsLetter = displayContacts[0].care_home_name.trim().charAt(0).toUpperCase();
-    }
-
-    // Filter to just those starting with that letter (or non-alpha for '#')
-    const letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ';
-    const pageContacts = displayContacts.filter(c => {
-        const first = (c.care_home_name || '').trim().charAt(0).toUpperCase();
-        if (contactsLetter === '#') return first && !letters.includes(first);
-        return first === contactsLetter;
-    });
-
-    tbody.innerHTML = pageContacts.map(contact => `
+    tbody.innerHTML = contacts.map(contact => `
         <tr>
             <td data-label="Care Home">${escapeHtml(contact.care_home_name)}</td>
             <td data-label="Contact Person">${escapeHtml(contact.contact_person || '-')}</td>
@@ -455,36 +720,57 @@ function renderContactsTable(filtered = null) {
         </tr>
     `).join('');
 
-    renderLetterPagination('contactsPagination', displayContacts, contactsLetter, 'goToContactsLetter');
+    renderLoadMore('contactsPagination', !!contactsCursor, 'loadMoreContacts');
 }
 
+// Search runs server-side, so wait for a pause in typing before querying
 function filterContacts() {
-    const searchTerm = document.getElementById('contactSearch').value.toLowerCase();
-    contactsPage = 1;
-    contactsLetter = null;
-    if (!searchTerm) {
-        renderContactsTable();
-        return;
-    }
-    const filtered = contacts.filter(contact =>
-        contact.care_home_name.toLowerCase().includes(searchTerm) ||
-        (contact.contact_person && contact.contact_person.toLowerCase().includes(searchTerm)) ||
-        (contact.telephone && contact.telephone.includes(searchTerm)) ||
-        (contact.email && contact.email.toLowerCase().includes(searchTerm))
-    );
-    renderContactsTable(filtered);
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => loadContacts(), 150);
+}
+
+// The contact dropdowns hold only the contacts matching what is typed into the search box
+// above them (GET /search), plus the contact already chosen - never the whole table
+const CONTACT_OPTIONS_LIMIT = 20;
+const contactOptionTimers = {};
+
+function setContactOptions(selectId, options, selected = null) {
+    const select = document.getElementById(selectId);
+    if (!select) return;
+    if (selected && !options.some(c => c.id === selected.id)) options = [selected, ...options];
+    const placeholder = options.length ? 'Select a contact' : 'Search for a contact above';
+    select.innerHTML = `
+        <option value="">${placeholder}</option>
+        ${options.map(c => `<option value="${c.id}">${escapeHtml(c.care_home_name)}</option>`).join('')}
+    `;
+    select.value = selected ? selected.id : '';
 }
 
-function populateContactDropdowns() {
-    const dropdowns = ['callbackContact', 'bookingContact'];
-    const optionsHtml = `
-        <option value="">Select a contact</option>
-        ${contacts.map(c => `<option value="${c.id}">${escapeHtml(c.care_home_name)}</option>`).join('')}
-    `;
-    dropdowns.forEach(id => {
-        const el = document.getElementById(id);
-        if (el) el.innerHTML = optionsHtml;
-    });
+// Clear a contact dropdown and its search box, optionally showing the contact already chosen
+function resetContactPicker(selectId, contact = null) {
+    const search = document.getElementById(`${selectId}Search`);
+    if (search) search.value = '';
+    setContactOptions(selectId, [], contact);
+}
+
+function searchContactOptions(selectId) {
+    clearTimeout(contactOptionTimers[selectId]);
+    contactOptionTimers[selectId] = setTimeout(async () => {
+        const select = document.getElementById(selectId);
+        const option = select.selectedOptions[0];
+        const selected = option && option.value ? { id: parseInt(option.value), care_home_name: option.textContent } : null;
+        const q = document.getElementById(`${selectId}Search`).value.trim();
+        if (!q) {
+            setContactOptions(selectId, [], selected);
+            return;
+        }
+        try {
+            const results = await apiGet('/search', { q, type: 'contact', limit: CONTACT_OPTIONS_LIMIT });
+            setContactOptions(selectId, results.map(result => result.contact), selected);
+        } catch (error) {
+            console.error('Failed to search contacts:', error);
+        }
+    }, 150);
 }
 
 async function handleContactSubmit(e) {
@@ -515,9 +801,7 @@ async function handleContactSubmit(e) {
                 closeModal('contactModal');
                 const wasPromoting = promotingTargetId;
                 promotingTargetId = null;
-                loadTargets();
-                loadContacts();
-                loadDashboard();
+                syncChanges();
                 showToast('Target promoted to Contact!', 'success');
             } else {
                 showToast('Failed to promote target', 'error');
@@ -543,8 +827,7 @@ async function handleContactSubmit(e) {
 
         if (response.ok) {
             closeModal('contactModal');
-            loadContacts();
-            loadDashboard();
+            syncChanges();
             showToast(id ? 'Contact updated!' : 'Contact added!', 'success');
         } else {
             showToast('Failed to save contact', 'error');
@@ -602,6 +885,79 @@ function viewContact(id) {
 
     loadContactCallbacks(id);
     loadContactBookings(id);
+    loadContactCallLogs(id);
+}
+
+// Each list in the contact details modal shows a page at a time. A section remembers its
+// endpoint, the rows loaded so far and the next cursor, so "Load more" can append a page.
+let contactSections = {};
+
+async function loadContactSection(name, path, params, render) {
+    const page = await fetchPage(path, params);
+    contactSections[name] = { path, params, render, items: page.items, cursor: page.next_cursor };
+}
+
+async function loadMoreContactSection(name) {
+    const section = contactSections[name];
+    if (!section || !section.cursor) return;
+    try {
+        const page = await fetchPage(section.path, { ...section.params, cursor: section.cursor });
+        section.items = section.items.concat(page.items);
+        section.cursor = page.next_cursor;
+        section.render();
+    } catch (error) {
+        console.error(`Error loading more ${name}:`, error);
+    }
+}
+
+function renderContactSectionLoadMore(name) {
+    const section = contactSections[name];
+    if (!section || !section.cursor) return '';
+    return `<button class="pagination-btn" style="margin-bottom: 10px;" onclick="loadMoreContactSection('${name}')">Load more &raquo;</button>`;
+}
+
+async function loadContactCallLogs(contactId) {
+    const container = document.getElementById('contactCallLogsList');
+    if (!container) return;
+
+    try {
+        await loadContactSection('callLogs', `/contacts/${contactId}/call-logs`, {}, renderContactCallLogs);
+        renderContactCallLogs();
+    } catch (error) {
+        console.error('Error loading contact call logs:', error);
+        container.innerHTML = '<p>Failed to load call logs.</p>';
+    }
+}
+
+function renderContactCallLogs() {
+    const container = document.getElementById('contactCallLogsList');
+    if (!container) return;
+
+    const logs = contactSections.callLogs.items;
+    if (logs.length === 0) {
+        container.innerHTML = '<p style="color: #666; font-style: italic;">No call logs for this contact.</p>';
+        return;
+    }
+
+    const rows = logs.map(log => `
+        <tr>
+            <td>${formatDateTime(log.call_datetime)}</td>
+            <td>${escapeHtml(log.notes || '-')}</td>
+        </tr>
+    `).join('');
+
+    container.innerHTML = `
+        <table class="data-table" style="margin-bottom: 10px;">
+            <thead>
+                <tr>
+                    <th style="width: 140px;">Date/Time</th>
+                    <th>Notes</th>
+                </tr>
+            </thead>
+            <tbody>${rows}</tbody>
+        </table>
+        ${renderContactSectionLoadMore('callLogs')}
+    `;
 }
 
 function editContact(id) {
@@ -625,59 +981,58 @@ function editContact(id) {
 // TARGETS
 // ========================================
 
-async function loadTargets() {
+// Loads the first batch of targets for the current letter (or search term);
+// pass append=true to fetch the next batch and add it to the table
+async function loadTargets(append = false) {
+    const searchEl = document.getElementById('targetSearch');
+    const searchTerm = searchEl ? searchEl.value.trim() : '';
+
     try {
-        const response = await fetch(`${API_URL}/targets`, {
-            headers: { 'Authorization': `Bearer ${authToken}` }
-        });
-        if (response.ok) {
-            targets = await response.json();
-            renderTargetsTable();
+        if (searchTerm) {
+            // Fuzzy server-side search, best matches first (no further pages)
+            const results = await apiGet('/search', { q: searchTerm, type: 'target', limit: SEARCH_LIMIT });
+            if (searchEl.value.trim() !== searchTerm) return;  // a newer keystroke has taken over
+            targets = results.map(r => r.target);
+            targetsCursor = null;
+            renderTargetsTable(true);
+            return;
         }
+
+        const page = await fetchPage('/targets', { letter: targetsLetter, cursor: append ? targetsCursor : null });
+        targets = append ? targets.concat(page.items) : page.items;
+        targetsCursor = page.next_cursor;
+        renderTargetsTable(!!searchTerm);
     } catch (error) {
         console.error('Failed to load targets:', error);
     }
 }
 
-function renderTargetsTable(filtered = null) {
+function loadMoreTargets() {
+    loadTargets(true);
+}
+
+function renderTargetsTable(searching = false) {
     const tbody = document.getElementById('targetsTable');
-    filteredTargets = filtered;
-    const displayTargets = (filtered || targets)
-        .slice()
-        .sort((a, b) => (a.care_home_name || '').localeCompare(b.care_home_name || ''));
 
-    if (displayTargets.length === 0) {
+    if (searching) {
+        document.getElementById('targetsPagination').innerHTML = '';
+    } else {
+        renderLetterPagination('targetsPagination', targetsLetter, 'goToTargetsLetter');
+    }
+
+    if (targets.length === 0) {
         tbody.innerHTML = `
             <tr>
                 <td colspan="4" class="empty-state">
                     <div class="empty-state-icon">🎯</div>
-                    <p>${filtered ? 'No targets match your search.' : 'No targets yet. Add your first target!'}</p>
+                    <p>${searching ? 'No targets match your search.' : 'No targets under this letter.'}</p>
                 </td>
             </tr>
         `;
-        document.getElementById('targetsPagination').innerHTML = '';
         return;
     }
 
-    // Figure out which letters have targets
-    const lettersWithTargets = new Set(
-        displayTargets
-            .map(t => (t.care_home_name || '').trim().charAt(0).toUpperCase())
-            .filter(l => l)
-    );
-
-    if (!targetsLetter || !lettersWithTargets.has(targetsLetter)) {
-        targetsLetter = displayTargets[0].care_home_name.trim().charAt(0).toUpperCase();
-    }
-
-    const letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ';
-    const pageTargets = displayTargets.filter(t => {
-        const first = (t.care_home_name || '').trim().charAt(0).toUpperCase();
-        if (targetsLetter === '#') return first && !letters.includes(first);
-        return first === targetsLetter;
-    });
-
-    tbody.innerHTML = pageTargets.map(target => `
+    tbody.innerHTML = targets.map(target => `
         <tr>
             <td>${escapeHtml(target.care_home_name)}</td>
             <td>${target.telephone ? `<a href="tel:${target.telephone}" class="phone-link">${escapeHtml(target.telephone)}</a>` : '-'}</td>
@@ -695,27 +1050,17 @@ function renderTargetsTable(filtered = null) {
         </tr>
     `).join('');
 
-    renderLetterPagination('targetsPagination', displayTargets, targetsLetter, 'goToTargetsLetter');
+    renderLoadMore('targetsPagination', !!targetsCursor, 'loadMoreTargets');
 }
 
 function goToTargetsLetter(letter) {
     targetsLetter = letter;
-    renderTargetsTable(filteredTargets);
+    loadTargets();
 }
 
 function filterTargets() {
-    const searchTerm = document.getElementById('targetSearch').value.toLowerCase();
-    targetsLetter = null;
-    if (!searchTerm) {
-        renderTargetsTable();
-        return;
-    }
-    const filtered = targets.filter(t =>
-        t.care_home_name.toLowerCase().includes(searchTerm) ||
-        (t.telephone && t.telephone.includes(searchTerm)) ||
-        (t.notes && t.notes.toLowerCase().includes(searchTerm))
-    );
-    renderTargetsTable(filtered);
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => loadTargets(), 150);
 }
 
 async function handleTargetSubmit(e) {
@@ -741,7 +1086,7 @@ async function handleTargetSubmit(e) {
 
         if (response.ok) {
             closeModal('targetModal');
-            loadTargets();
+            syncChanges();
             showToast(id ? 'Target updated!' : 'Target added!', 'success');
         } else {
             showToast('Failed to save target', 'error');
@@ -794,19 +1139,24 @@ function promoteTarget(id) {
 async function loadCallbacks() {
     const type = currentCallbackTab === 'awaiting' ? 'Awaiting Callback' : 'To Call Back';
     try {
-        const response = await fetch(`${API_URL}/callbacks?callback_type=${encodeURIComponent(type)}`, {
-            headers: { 'Authorization': `Bearer ${authToken}` }
+        const page = await fetchPage('/callbacks', {
+            callback_type: type,
+            cursor: callbacksCursors[callbacksPage - 1],
+            limit: PAGE_SIZE
         });
-        if (response.ok) {
-            const callbacks = await response.json();
-            renderCallbacksTable(callbacks);
+        // The last row on this page was deleted - step back a page
+        if (page.items.length === 0 && callbacksPage > 1) {
+            goToCallbacksPage(callbacksPage - 1);
+            return;
         }
+        callbacksCursors[callbacksPage] = page.next_cursor;
+        renderCallbacksTable(page.items, page.next_cursor);
     } catch (error) {
         console.error('Failed to load callbacks:', error);
     }
 }
 
-function renderCallbacksTable(callbacks) {
+function renderCallbacksTable(callbacks, nextCursor = null) {
     const tbody = document.getElementById('callbacksTable');
     allCallbacks = callbacks;
 
@@ -823,14 +1173,7 @@ function renderCallbacksTable(callbacks) {
         return;
     }
 
-    // Ensure current page is in range
-    const totalPages = Math.ceil(callbacks.length / PAGE_SIZE);
-    if (callbacksPage > totalPages) callbacksPage = totalPages;
-    if (callbacksPage < 1) callbacksPage = 1;
-
-    const pageCallbacks = paginate(callbacks, callbacksPage);
-
-    tbody.innerHTML = pageCallbacks.map(cb => `
+    tbody.innerHTML = callbacks.map(cb => `
         <tr>
             <td>${escapeHtml(cb.contact?.care_home_name || 'Unknown')}</td>
             <td>${formatDateTime(cb.original_call_datetime)}</td>
@@ -849,7 +1192,7 @@ function renderCallbacksTable(callbacks) {
         </tr>
     `).join('');
 
-    renderPagination('callbacksPagination', callbacks.length, callbacksPage, 'goToCallbacksPage');
+    renderCursorPagination('callbacksPagination', callbacksPage, !!nextCursor, 'goToCallbacksPage');
 }
 
 async function handleCallbackSubmit(e) {
@@ -877,8 +1220,7 @@ async function handleCallbackSubmit(e) {
 
         if (response.ok) {
             closeModal('callbackModal');
-            loadCallbacks();
-            loadDashboard();
+            syncChanges();
             showToast(id ? 'Callback updated!' : 'Callback added!', 'success');
         } else {
             showToast('Failed to save callback', 'error');
@@ -890,10 +1232,7 @@ async function handleCallbackSubmit(e) {
 }
 
 function viewCallback(id) {
-    fetch(`${API_URL}/callbacks/${id}`, {
-        headers: { 'Authorization': `Bearer ${authToken}` }
-    })
-        .then(response => response.json())
+    apiGet(`/callbacks/${id}`)
         .then(cb => {
             document.getElementById('callbackDetailsContent').innerHTML = `
                 <div class="details-grid">
@@ -914,14 +1253,11 @@ function viewCallback(id) {
 }
 
 function editCallback(id) {
-    fetch(`${API_URL}/callbacks/${id}`, {
-        headers: { 'Authorization': `Bearer ${authToken}` }
-    })
-        .then(response => response.json())
+    apiGet(`/callbacks/${id}`)
         .then(cb => {
             document.getElementById('callbackModalTitle').textContent = 'Edit Callback';
             document.getElementById('callbackId').value = cb.id;
-            document.getElementById('callbackContact').value = cb.contact_id;
+            resetContactPicker('callbackContact', cb.contact);
             document.getElementById('callbackType').value = cb.callback_type;
             document.getElementById('originalCallDateTime').value = formatDateTimeForInput(cb.original_call_datetime);
             document.getElementById('callbackDateTime').value = formatDateTimeForInput(cb.callback_datetime);
@@ -936,34 +1272,38 @@ async function loadContactCallbacks(contactId) {
     if (!container) return;
 
     try {
-        const response = await fetch(`${API_URL}/callbacks`, {
-            headers: { 'Authorization': `Bearer ${authToken}` }
-        });
-        if (!response.ok) {
-            container.innerHTML = '<p>Failed to load callbacks.</p>';
-            return;
-        }
-        const allCallbacks = await response.json();
-        const callbacks = allCallbacks.filter(cb => cb.contact_id === contactId);
-
-        if (callbacks.length === 0) {
-            container.innerHTML = '<p style="color: #666; font-style: italic;">No callbacks for this contact.</p>';
-            return;
-        }
-
-        const awaiting = callbacks.filter(cb => cb.callback_type === 'Awaiting Callback');
-        const toCallBack = callbacks.filter(cb => cb.callback_type === 'To Call Back');
-
-        container.innerHTML = `
-            ${renderCallbackSubSection('Awaiting Callback', awaiting, contactId)}
-            ${renderCallbackSubSection('To Call Back', toCallBack, contactId)}
-        `;
+        const path = `/contacts/${contactId}/callbacks`;
+        const render = () => renderContactCallbacks(contactId);
+        await Promise.all([
+            loadContactSection('awaitingCallbacks', path, { callback_type: 'Awaiting Callback' }, render),
+            loadContactSection('toCallBackCallbacks', path, { callback_type: 'To Call Back' }, render)
+        ]);
+        render();
     } catch (error) {
         console.error('Error loading contact callbacks:', error);
         container.innerHTML = '<p>Failed to load callbacks.</p>';
     }
 }
 
+function renderContactCallbacks(contactId) {
+    const container = document.getElementById('contactCallbacksList');
+    if (!container) return;
+
+    const awaiting = contactSections.awaitingCallbacks.items;
+    const toCallBack = contactSections.toCallBackCallbacks.items;
+    if (awaiting.length === 0 && toCallBack.length === 0) {
+        container.innerHTML = '<p style="color: #666; font-style: italic;">No callbacks for this contact.</p>';
+        return;
+    }
+
+    container.innerHTML = `
+        ${renderCallbackSubSection('Awaiting Callback', awaiting, contactId)}
+        ${renderContactSectionLoadMore('awaitingCallbacks')}
+        ${renderCallbackSubSection('To Call Back', toCallBack, contactId)}
+        ${renderContactSectionLoadMore('toCallBackCallbacks')}
+    `;
+}
+
 function renderCallbackSubSection(title, items, contactId) {
     if (items.length === 0) {
         return `
@@ -1020,11 +1360,10 @@ function deleteCallbackFromContact(callbackId, contactId) {
 // BOOKINGS
 // ========================================
 
-function showBookingConfirmation(bookingId) {
-    fetch(`${API_URL}/bookings/${bookingId}`, {
-        headers: { 'Authorization': `Bearer ${authToken}` }
-    })
-        .then(response => response.json())
+// Pass the booking when the caller already has it (e.g. straight after saving) to skip the fetch
+function showBookingConfirmation(bookingId, loadedBooking = null) {
+    const request = loadedBooking ? Promise.resolve(loadedBooking) : apiGet(`/bookings/${bookingId}`);
+    request
         .then(booking => {
             const careHome = booking.contact?.care_home_name || 'your care home';
             const contactPerson = booking.contact?.contact_person?.trim();
@@ -1111,43 +1450,43 @@ async function loadContactBookings(contactId) {
     if (!container) return;
 
     try {
-        const response = await fetch(`${API_URL}/bookings`, {
-            headers: { 'Authorization': `Bearer ${authToken}` }
-        });
-        if (!response.ok) {
-            container.innerHTML = '<p>Failed to load bookings.</p>';
-            return;
-        }
-        const allBookings = await response.json();
-        const bookings = allBookings.filter(b => b.contact_id === contactId);
+        const path = `/contacts/${contactId}/bookings`;
+        await Promise.all([
+            loadContactSection('upcomingBookings', path, { when: 'upcoming' }, () => renderUpcomingBookings(contactId)),
+            loadContactSection('pastBookings', path, { when: 'past' }, () => renderPastBookings(contactId))
+        ]);
 
-        if (bookings.length === 0) {
+        if (contactSections.upcomingBookings.items.length === 0 && contactSections.pastBookings.items.length === 0) {
             container.innerHTML = '<p style="color: #666; font-style: italic;">No bookings for this contact.</p>';
             return;
         }
 
-        const now = new Date();
-        const upcoming = bookings
-            .filter(b => new Date(b.booking_from) >= now)
-            .sort((a, b) => new Date(a.booking_from) - new Date(b.booking_from));
-        const past = bookings
-            .filter(b => new Date(b.booking_from) < now)
-            .sort((a, b) => new Date(b.booking_from) - new Date(a.booking_from));
-
-        // Store past bookings on the container so the filter can re-render
-        container._pastBookings = past;
-        container._contactId = contactId;
-
         container.innerHTML = `
-            ${renderBookingSubSection('Upcoming', upcoming, contactId)}
-            ${renderPastBookingsSection(past, contactId)}
+            <div id="upcomingBookingsContainer"></div>
+            ${renderPastBookingsSection(contactId)}
         `;
+        renderUpcomingBookings(contactId);
+        renderPastBookings(contactId);
     } catch (error) {
         console.error('Error loading contact bookings:', error);
         container.innerHTML = '<p>Failed to load bookings.</p>';
     }
 }
 
+function renderUpcomingBookings(contactId) {
+    const container = document.getElementById('upcomingBookingsContainer');
+    if (!container) return;
+    container.innerHTML = renderBookingSubSection('Upcoming', contactSections.upcomingBookings.items, contactId) +
+        renderContactSectionLoadMore('upcomingBookings');
+}
+
+function renderPastBookings(contactId) {
+    const container = document.getElementById('pastBookingsContainer');
+    if (!container) return;
+    container.innerHTML = renderPastBookingsTable(contactSections.pastBookings.items, contactId) +
+        renderContactSectionLoadMore('pastBookings');
+}
+
 function renderBookingSubSection(title, items, contactId) {
     if (items.length === 0) {
         return `
@@ -1194,7 +1533,7 @@ function renderBookingSubSection(title, items, contactId) {
     `;
 }
 
-function renderPastBookingsSection(past, contactId) {
+function renderPastBookingsSection(contactId) {
     return `
         <div style="display: flex; align-items: center; justify-content: space-between; margin-top: 20px; margin-bottom: 8px;">
             <h4 style="margin: 0; font-size: 14px;">Past</h4>
@@ -1205,9 +1544,7 @@ function renderPastBookingsSection(past, contactId) {
                 <option value="Paid">Paid</option>
             </select>
         </div>
-        <div id="pastBookingsContainer">
-            ${renderPastBookingsTable(past, contactId)}
-        </div>
+        <div id="pastBookingsContainer"></div>
     `;
 }
 
@@ -1253,17 +1590,16 @@ function renderPastBookingsTable(past, contactId) {
     `;
 }
 
-function filterPastBookings(contactId) {
-    const container = document.getElementById('contactBookingsList');
-    const filterValue = document.getElementById('pastBookingsFilter').value;
-    const past = container._pastBookings || [];
-
-    const filtered = filterValue
-        ? past.filter(b => b.fee_status === filterValue)
-        : past;
-
-    document.getElementById('pastBookingsContainer').innerHTML =
-        renderPastBookingsTable(filtered, contactId);
+// The fee status filter is applied by the server, so it covers every past booking
+async function filterPastBookings(contactId) {
+    const feeStatus = document.getElementById('pastBookingsFilter').value;
+    const params = feeStatus ? { when: 'past', fee_status: feeStatus } : { when: 'past' };
+    try {
+        await loadContactSection('pastBookings', `/contacts/${contactId}/bookings`, params, () => renderPastBookings(contactId));
+        renderPastBookings(contactId);
+    } catch (error) {
+        console.error('Error filtering past bookings:', error);
+    }
 }
 
 function editBookingFromContact(bookingId, contactId) {
@@ -1279,22 +1615,26 @@ function deleteBookingFromContact(bookingId, contactId) {
 async function loadBookings() {
     const statusFilter = document.getElementById('bookingStatusFilter');
     const status = statusFilter ? statusFilter.value : '';
-    const url = status ? `${API_URL}/bookings?fee_status=${encodeURIComponent(status)}` : `${API_URL}/bookings`;
 
     try {
-        const response = await fetch(url, {
-            headers: { 'Authorization': `Bearer ${authToken}` }
+        const page = await fetchPage('/bookings', {
+            fee_status: status,
+            cursor: bookingsCursors[bookingsPage - 1],
+            limit: PAGE_SIZE
         });
-        if (response.ok) {
-            const bookings = await response.json();
-            renderBookingsTable(bookings);
+        // The last row on this page was deleted - step back a page
+        if (page.items.length === 0 && bookingsPage > 1) {
+            goToBookingsPage(bookingsPage - 1);
+            return;
         }
+        bookingsCursors[bookingsPage] = page.next_cursor;
+        renderBookingsTable(page.items, page.next_cursor);
     } catch (error) {
         console.error('Failed to load bookings:', error);
     }
 }
 
-function renderBookingsTable(bookings) {
+function renderBookingsTable(bookings, nextCursor = null) {
     const tbody = document.getElementById('bookingsTable');
     allBookings = bookings;
 
@@ -1311,15 +1651,8 @@ function renderBookingsTable(bookings) {
         return;
     }
 
-    // Ensure current page is in range
-    const totalPages = Math.ceil(bookings.length / PAGE_SIZE);
-    if (bookingsPage > totalPages) bookingsPage = totalPages;
-    if (bookingsPage < 1) bookingsPage = 1;
-
-    const pageBookings = paginate(bookings, bookingsPage);
-
     const now = new Date();
-    tbody.innerHTML = pageBookings.map(booking => {
+    tbody.innerHTML = bookings.map(booking => {
         const bookingDate = new Date(booking.booking_from);
         const isPast = bookingDate < now;
         let rowClass = '';
@@ -1351,7 +1684,7 @@ function renderBookingsTable(bookings) {
         `;
     }).join('');
 
-    renderPagination('bookingsPagination', bookings.length, bookingsPage, 'goToBookingsPage');
+    renderCursorPagination('bookingsPagination', bookingsPage, !!nextCursor, 'goToBookingsPage');
 }
 
 async function handleBookingSubmit(e) {
@@ -1392,17 +1725,17 @@ async function handleBookingSubmit(e) {
         if (response.ok) {
             const savedBooking = await response.json();
             closeModal('bookingModal');
-            loadBookings();
-            loadCalendar();
-            loadDashboard();
+            syncChanges();
             showToast(id ? 'Booking updated!' : 'Booking added!', 'success');
 
             // Auto-open confirmation modal only for NEW bookings
             if (!id && savedBooking.id) {
-                showBookingConfirmation(savedBooking.id);
+                showBookingConfirmation(savedBooking.id, savedBooking);
             }
         } else {
-            showToast('Failed to save booking', 'error');
+            // e.g. 409 when the time overlaps another booking
+            const error = await response.json().catch(() => ({}));
+            showToast(typeof error.detail === 'string' ? error.detail : 'Failed to save booking', 'error');
         }
     } catch (error) {
         console.error('Error saving booking:', error);
@@ -1411,10 +1744,7 @@ async function handleBookingSubmit(e) {
 }
 
 function editBooking(id) {
-    fetch(`${API_URL}/bookings/${id}`, {
-        headers: { 'Authorization': `Bearer ${authToken}` }
-    })
-        .then(response => response.json())
+    apiGet(`/bookings/${id}`)
         .then(booking => {
             const fromDate = new Date(booking.booking_from);
             const toDate = new Date(booking.booking_to);
@@ -1428,7 +1758,7 @@ function editBooking(id) {
 
             document.getElementById('bookingModalTitle').textContent = 'Edit Booking';
             document.getElementById('bookingId').value = booking.id;
-            document.getElementById('bookingContact').value = booking.contact_id;
+            resetContactPicker('bookingContact', booking.contact);
             document.getElementById('bookingDate').value = dateStr;
             document.getElementById('bookingFromHour').value = fromHour;
             document.getElementById('bookingFromMinute').value = fromMinute;
@@ -1472,13 +1802,7 @@ async function confirmDelete() {
         if (response.ok) {
             closeModal('deleteModal');
             showToast('Item deleted!', 'success');
-            switch (type) {
-                case 'contact': loadContacts(); break;
-                case 'callback': loadCallbacks(); break;
-                case 'booking': loadBookings(); loadCalendar(); break;
-                case 'target': loadTargets(); break;
-            }
-            loadDashboard();
+            syncChanges();
 
             if (returnToContact) {
                 viewContact(returnToContact);
@@ -1512,7 +1836,7 @@ function openModal(modalId) {
     } else if (modalId === 'callbackModal') {
         document.getElementById('callbackModalTitle').textContent = 'Add Callback';
         document.getElementById('callbackId').value = '';
-        document.getElementById('callbackContact').value = '';
+        resetContactPicker('callbackContact');
         document.getElementById('callbackType').value = 'Awaiting Callback';
         document.getElementById('originalCallDateTime').value = formatDateTimeForInput(new Date().toISOString());
         document.getElementById('callbackDateTime').value = formatDateTimeForInput(new Date().toISOString());
@@ -1529,7 +1853,7 @@ function openModal(modalId) {
 
         document.getElementById('bookingModalTitle').textContent = 'Add Booking';
         document.getElementById('bookingId').value = '';
-        document.getElementById('bookingContact').value = '';
+        resetContactPicker('bookingContact');
         const today = new Date().toISOString().slice(0, 10);
         document.getElementById('bookingDate').value = today;
         document.getElementById('bookingFromHour').value = '14';
@@ -1610,75 +1934,75 @@ function escapeHtml(text) {
 // CSV EXPORT FUNCTIONS
 // ========================================
 
-function exportContactsCSV() {
-    if (contacts.length === 0) {
-        showToast('No contacts to export', 'error');
-        return;
+// The CSV is built and streamed by the server; the browser only saves the file
+async function downloadExport(name, label) {
+    try {
+        const response = await fetch(`${API_URL}/export/${name}.csv`, {
+            headers: { 'Authorization': `Bearer ${authToken}` }
+        });
+        if (!response.ok) {
+            showToast(`Failed to export ${label}`, 'error');
+            return;
+        }
+
+        const blob = await response.blob();
+        const link = document.createElement('a');
+        link.href = URL.createObjectURL(blob);
+        link.download = `${name.replace('-', '_')}_export.csv`;
+        link.click();
+        URL.revokeObjectURL(link.href);
+        showToast(`${label.charAt(0).toUpperCase() + label.slice(1)} exported successfully!`, 'success');
+    } catch (error) {
+        console.error('Export failed:', error);
+        showToast(`Failed to export ${label}`, 'error');
     }
+}
 
-    const headers = ['Care Home', 'Contact Person', 'Telephone', 'Email', 'Address', 'Postcode', 'Website'];
-    const rows = contacts.map(c => [
-        c.care_home_name || '',
-        c.contact_person || '',
-        c.telephone || '',
-        c.email || '',
-        c.address || '',
-        c.postcode || '',
-        c.website || ''
-    ]);
+function exportContactsCSV() {
+    downloadExport('contacts', 'contacts');
+}
 
-    downloadCSV(headers, rows, 'contacts_export.csv');
-    showToast('Contacts exported successfully!', 'success');
+function exportBookingsCSV() {
+    downloadExport('bookings', 'bookings');
 }
 
-async function exportBookingsCSV() {
+// The file is sent as is; the server validates and inserts it in chunks
+async function importFile(kind, input) {
+    const file = input.files[0];
+    input.value = '';
+    if (!file) return;
+
+    const isCSV = !/\.(ndjson|jsonl)$/i.test(file.name);
     try {
-        const response = await fetch(`${API_URL}/bookings`, {
-            headers: { 'Authorization': `Bearer ${authToken}` }
+        const response = await fetch(`${API_URL}/import/${kind}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': isCSV ? 'text/csv' : 'application/x-ndjson',
+                'Authorization': `Bearer ${authToken}`
+            },
+            body: file
         });
         if (!response.ok) {
-            showToast('Failed to load bookings', 'error');
+            const error = await response.json().catch(() => ({}));
+            showToast(error.detail || `Failed to import ${kind}`, 'error');
             return;
         }
-        const bookings = await response.json();
 
-        if (bookings.length === 0) {
-            showToast('No bookings to export', 'error');
-            return;
+        const result = await response.json();
+        if (result.failed > 0) {
+            console.warn(`Import of ${kind}: rows skipped`, result.errors);
+            showToast(`Imported ${result.imported} of ${result.total} ${kind}; ${result.failed} rows skipped (see console)`, 'error');
+        } else {
+            showToast(`Imported ${result.imported} ${kind}`, 'success');
         }
 
-        const headers = ['Date From', 'Date To', 'Care Home', 'Type', 'Fee Agreed', 'Fee Status'];
-        const rows = bookings.map(b => [
-            formatDateTime(b.booking_from),
-            formatDateTime(b.booking_to),
-            b.contact?.care_home_name || '',
-            b.booking_type || '',
-            b.fee_agreed ? `£${parseFloat(b.fee_agreed).toFixed(2)}` : '',
-            b.fee_status || ''
-        ]);
-
-        downloadCSV(headers, rows, 'bookings_export.csv');
-        showToast('Bookings exported successfully!', 'success');
+        syncChanges();
     } catch (error) {
-        console.error('Export failed:', error);
-        showToast('Failed to export bookings', 'error');
+        console.error('Import failed:', error);
+        showToast(`Failed to import ${kind}`, 'error');
     }
 }
 
-function downloadCSV(headers, rows, filename) {
-    const csvContent = [
-        headers.join(','),
-        ...rows.map(row => row.map(cell => `"${String(cell).replace(/"/g, '""')}"`).join(','))
-    ].join('\n');
-
-    const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
-    const link = document.createElement('a');
-    link.href = URL.createObjectURL(blob);
-    link.download = filename;
-    link.click();
-    URL.revokeObjectURL(link.href);
-}
-
 // ========================================
 // INVOICE GENERATION
 // ========================================
@@ -1692,23 +2016,16 @@ async function generateInvoice(bookingId) {
             showToast('Failed to load booking details', 'error');
             return;
         }
-        const booking = await response.json();
+        let booking = await response.json();
 
         // If not already invoiced or paid, ask whether to mark as invoiced
         if (booking.fee_status === 'Unpaid') {
             const shouldMark = confirm('Mark this booking as Invoiced?');
             if (shouldMark) {
-                await fetch(`${API_URL}/bookings/${bookingId}`, {
-                    method: 'PUT',
-                    headers: {
-                        'Content-Type': 'application/json',
-                        'Authorization': `Bearer ${authToken}`
-                    },
-                    body: JSON.stringify({ fee_status: 'Invoiced' })
-                });
+                // The update returns the saved booking, so there is no need to fetch it again
+                booking = await apiPut(`/bookings/${bookingId}`, { fee_status: 'Invoiced' });
                 showToast('Booking marked as Invoiced', 'success');
-                loadBookings();
-                loadDashboard();
+                syncChanges();
             }
         }
 
@@ -2070,21 +2387,13 @@ async function generateReceipt(bookingId, receiptDate, paymentMethod, chequeNumb
             showToast('Failed to load booking details', 'error');
             return;
         }
-        const booking = await response.json();
+        let booking = await response.json();
 
         // Auto-mark booking as Paid when receipt is generated
         if (booking.fee_status !== 'Paid') {
-            await fetch(`${API_URL}/bookings/${bookingId}`, {
-                method: 'PUT',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'Authorization': `Bearer ${authToken}`
-                },
-                body: JSON.stringify({ fee_status: 'Paid' })
-            });
+            booking = await apiPut(`/bookings/${bookingId}`, { fee_status: 'Paid' });
             showToast('Booking marked as Paid', 'success');
-            loadBookings();
-            loadDashboard();
+            syncChanges();
         }
 
         const receiptNumber = `REC-${new Date().getFullYear()}-${String(bookingId).padStart(4, '0')}`;
@@ -2248,6 +2557,7 @@ function showToast(message, type = 'success') {
 
 let currentCalendarDate = new Date();
 let calendarBookings = [];
+const calendarMonthCache = new Map();  // 'year-month' -> promise of that month's bookings
 
 function initCalendar() {
     const prevBtn = document.getElementById('prevMonth');
@@ -2256,13 +2566,13 @@ function initCalendar() {
     if (prevBtn) {
         prevBtn.addEventListener('click', () => {
             currentCalendarDate.setMonth(currentCalendarDate.getMonth() - 1);
-            renderCalendar();
+            showCalendarMonth();
         });
     }
     if (nextBtn) {
         nextBtn.addEventListener('click', () => {
             currentCalendarDate.setMonth(currentCalendarDate.getMonth() + 1);
-            renderCalendar();
+            showCalendarMonth();
         });
     }
 
@@ -2272,34 +2582,70 @@ function initCalendar() {
     if (prevYearBtn) {
         prevYearBtn.addEventListener('click', () => {
             currentCalendarDate.setFullYear(currentCalendarDate.getFullYear() - 1);
-            renderCalendar();
+            showCalendarMonth();
         });
     }
     if (nextYearBtn) {
         nextYearBtn.addEventListener('click', () => {
             currentCalendarDate.setFullYear(currentCalendarDate.getFullYear() + 1);
-            renderCalendar();
+            showCalendarMonth();
         });
     }
 }
 
 function jumpToMonth(monthIndex) {
     currentCalendarDate.setMonth(monthIndex);
-    renderCalendar();
+    showCalendarMonth();
 }
 
-async function loadCalendar() {
-    try {
-        const response = await fetch(`${API_URL}/bookings`, {
-            headers: { 'Authorization': `Bearer ${authToken}` }
+// Bookings may have changed, so drop every cached month and reload the visible one
+function loadCalendar() {
+    calendarMonthCache.clear();
+    return showCalendarMonth();
+}
+
+function formatLocalDateTime(date) {
+    const pad = n => String(n).padStart(2, '0');
+    return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}T00:00`;
+}
+
+// Fetch only the bookings overlapping one month, sharing any request already in flight
+function fetchCalendarMonth(year, month) {
+    const from = new Date(year, month, 1);
+    const to = new Date(year, month + 1, 1);
+    const key = `${from.getFullYear()}-${from.getMonth()}`;
+
+    if (!calendarMonthCache.has(key)) {
+        const request = fetchAllPages('/bookings', {
+            from: formatLocalDateTime(from),
+            to: formatLocalDateTime(to)
+        }).catch(error => {
+            calendarMonthCache.delete(key);
+            throw error;
         });
-        if (response.ok) {
-            calendarBookings = await response.json();
-        }
+        calendarMonthCache.set(key, request);
+    }
+    return calendarMonthCache.get(key);
+}
+
+async function showCalendarMonth() {
+    const year = currentCalendarDate.getFullYear();
+    const month = currentCalendarDate.getMonth();
+
+    try {
+        calendarBookings = await fetchCalendarMonth(year, month);
     } catch (error) {
         console.error('Failed to load bookings for calendar:', error);
+        calendarBookings = [];
     }
+
+    // The user may have moved on to another month while this one was loading
+    if (year !== currentCalendarDate.getFullYear() || month !== currentCalendarDate.getMonth()) return;
     renderCalendar();
+
+    // Warm the neighbouring months so prev/next render instantly
+    fetchCalendarMonth(year, month - 1).catch(() => {});
+    fetchCalendarMonth(year, month + 1).catch(() => {});
 }
 
 // Palette of 12 colours for care home events on the calendar
@@ -2417,10 +2763,7 @@ function isSameDay(date1, date2) {
 }
 
 function showBookingDetails(bookingId) {
-    fetch(`${API_URL}/bookings/${bookingId}`, {
-        headers: { 'Authorization': `Bearer ${authToken}` }
-    })
-        .then(response => response.json())
+    apiGet(`/bookings/${bookingId}`)
         .then(booking => {
             const content = document.getElementById('bookingDetailsContent');
             content.innerHTML = `
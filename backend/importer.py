@@ -0,0 +1,155 @@
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+import csv
+import io
+import json
+
+from database import SessionLocal
+from models import Contact, Target
+from schemas import ContactCreate, TargetCreate
+
+# Rows validated and inserted per transaction
+IMPORT_CHUNK_SIZE = 1000
+
+# Only the first few errors are returned in full
+MAX_REPORTED_ERRORS = 1000
+
+# kind -> (model, create schema, CSV header aliases)
+# The aliases let a file produced by the CSV export be imported again as is.
+IMPORTS = {
+    "contacts": (Contact, ContactCreate, {
+        "care home": "care_home_name",
+        "contact person": "contact_person",
+        "telephone": "telephone",
+        "email": "email",
+        "address": "address",
+        "postcode": "postcode",
+        "website": "website",
+    }),
+    "targets": (Target, TargetCreate, {
+        "care home": "care_home_name",
+        "telephone": "telephone",
+        "notes": "notes",
+    }),
+}
+
+
+# ============== Parsing ==============
+
+def parse_csv(body: str, aliases: dict):
+    """Yield one dict per CSV row, keyed by model field name"""
+    reader = csv.reader(io.StringIO(body))
+    header = next(reader, None)
+    if header is None:
+        return
+    fields = [aliases.get(name.strip().lower(), name.strip().lower().replace(" ", "_")) for name in header]
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue  # skip blank lines
+        yield dict(zip(fields, values))
+
+
+def parse_ndjson(body: str):
+    """Yield one dict per non-blank line. Lines that are not JSON objects are yielded as errors."""
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+            continue
+        yield record if isinstance(record, dict) else ValueError("Each line must be a JSON object")
+
+
+def clean_record(record: dict, schema) -> dict:
+    """Drop unknown columns and blank values"""
+    cleaned = {}
+    for field in schema.model_fields:
+        value = record.get(field)
+        if isinstance(value, str):
+            value = value.strip() or None
+        if value is not None:
+            cleaned[field] = value
+    return cleaned
+
+
+def validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+# ============== Import ==============
+
+def insert_chunk(model, rows):
+    """
+    Insert a chunk as one multi-row INSERT in its own transaction.
+    If the database rejects it, retry row by row so only the bad rows are reported.
+    Returns (inserted count, [(row number, error)]).
+    """
+    db = SessionLocal()
+    try:
+        db.execute(insert(model), [values for _, values in rows])
+        db.commit()
+        return len(rows), []
+    except SQLAlchemyError:
+        db.rollback()
+    finally:
+        db.close()
+
+    inserted, errors = 0, []
+    db = SessionLocal()
+    try:
+        for row_number, values in rows:
+            try:
+                db.execute(insert(model), [values])
+                db.commit()
+                inserted += 1
+            except SQLAlchemyError as e:
+                db.rollback()
+                errors.append((row_number, str(e.orig) if getattr(e, "orig", None) else str(e)))
+    finally:
+        db.close()
+    return inserted, errors
+
+
+def import_records(kind: str, body: str, is_csv: bool) -> dict:
+    """Validate and insert every record in the upload, in chunks. Bad rows are skipped and reported."""
+    model, schema, aliases = IMPORTS[kind]
+    records = parse_csv(body, aliases) if is_csv else parse_ndjson(body)
+
+    total, imported, errors = 0, 0, []
+    chunk = []
+
+    def flush():
+        nonlocal imported
+        count, chunk_errors = insert_chunk(model, chunk)
+        imported += count
+        errors.extend(chunk_errors)
+        chunk.clear()
+
+    for row_number, record in enumerate(records, start=1):
+        total += 1
+        if isinstance(record, Exception):
+            errors.append((row_number, str(record)))
+            continue
+        try:
+            values = schema.model_validate(clean_record(record, schema)).model_dump()
+        except ValidationError as e:
+            errors.append((row_number, validation_message(e)))
+            continue
+        chunk.append((row_number, values))
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            flush()
+    if chunk:
+        flush()
+
+    errors.sort()
+    return {
+        "total": total,
+        "imported": imported,
+        "failed": len(errors),
+        "errors": [{"row": row, "error": message} for row, message in errors[:MAX_REPORTED_ERRORS]],
+    }
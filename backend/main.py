@@ -1,71 +1,84 @@
-from fastapi import FastAPI, Depends, HTTPException, Header, status
+from fastapi import FastAPI, Depends, HTTPException, Header, Query, Request, status
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import case, func, or_, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from datetime import date, datetime, timedelta
+from contextlib import asynccontextmanager, nullcontext
 from typing import List, Optional
+import hmac
 import os
 
-from database import get_db, init_db, SessionLocal
-from models import Contact, CallLog, Callback, Booking, Target, CallbackType, FeeStatus
+from database import (
+    AsyncSessionLocal, get_async_db, check_schema_revision,
+    get_pool_stats
+)
+from models import Contact, CallLog, Callback, Booking, BookingSummary, Target, CallbackType, FeeStatus
 from schemas import (
     ContactCreate, ContactUpdate, ContactResponse,
     CallLogCreate, CallLogUpdate, CallLogResponse,
     CallbackCreate, CallbackUpdate, CallbackResponse,
     BookingCreate, BookingUpdate, BookingResponse,
     TargetCreate, TargetUpdate, TargetResponse,
+    ContactPage, TargetPage, CallLogPage, CallbackPage, BookingPage,
+    SearchResult, ImportResult,
+    ChangeFeed, RevenueReport, Availability,
     PasswordCheck
 )
 from auth import verify_password, create_session, validate_session, invalidate_session
+from pagination import keyset_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from cache import TTLCache
+from search import LIKE_ESCAPE, contains_pattern, search, search_index
+from export import EXPORTS, stream_csv
+from importer import IMPORTS, import_records
+from etags import check_etag, bump_versions
+from changes import changed_ids, current_versions, decode_cursor, encode_cursor, is_expired
+from events import hub
+from compression import CompressionMiddleware, PrecompressedStaticFiles
+from serializers import FAST_SERIALIZATION, FastJSONResponse, RowSerializer
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, TimedRoute, mark_serialization_start, render_metrics
+)
+from reports import ALL_CONTACTS  # importing reports also registers its booking_summaries listeners
+from reminders import CALLBACK_REMINDERS, scheduler as reminder_scheduler
+from availability import booked_periods, booking_period_lock, check_booking_period, free_slots
 
-app = FastAPI(title="Elise CRM", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema changes are Alembic revisions applied at deploy time; this only checks the revision
+    check_schema_revision()
+    hub.open()
+    if CALLBACK_REMINDERS:
+        reminder_scheduler.start()
+    yield
+    hub.close()
+    await reminder_scheduler.stop()
 
-# Initialize database on startup
-@app.on_event("startup")
-def startup():
-    from sqlalchemy import text
-    
-    # Ensure all tables exist FIRST (creates any new tables like 'targets')
-    init_db()
-    
-    # Then add missing columns to existing tables
-    db = SessionLocal()
-    try:
-        # Add address column to contacts if it doesn't exist
-        db.execute(text("ALTER TABLE contacts ADD COLUMN IF NOT EXISTS address TEXT"))
-        # Add postcode column to contacts if it doesn't exist
-        db.execute(text("ALTER TABLE contacts ADD COLUMN IF NOT EXISTS postcode VARCHAR(20)"))
-        # Add website column to contacts if it doesn't exist
-        db.execute(text("ALTER TABLE contacts ADD COLUMN IF NOT EXISTS website VARCHAR(255)"))
-        # Add contact_id column to bookings if it doesn't exist
-        db.execute(text("ALTER TABLE bookings ADD COLUMN IF NOT EXISTS contact_id INTEGER REFERENCES contacts(id)"))
-        # Add booking_from column to bookings if it doesn't exist
-        db.execute(text("ALTER TABLE bookings ADD COLUMN IF NOT EXISTS booking_from TIMESTAMP"))
-        # Add booking_to column to bookings if it doesn't exist
-        db.execute(text("ALTER TABLE bookings ADD COLUMN IF NOT EXISTS booking_to TIMESTAMP"))
-       # Add more_info column to bookings if it doesn't exist
-        db.execute(text("ALTER TABLE bookings ADD COLUMN IF NOT EXISTS more_info TEXT"))
-        # Drop old booking_date column if it exists
-        db.execute(text("ALTER TABLE bookings DROP COLUMN IF EXISTS booking_date"))
-        # Make callbacks.contact_id nullable (callbacks can belong to a target instead)
-        db.execute(text("ALTER TABLE callbacks ALTER COLUMN contact_id DROP NOT NULL"))
-        # Add target_id column to callbacks if it doesn't exist
-        db.execute(text("ALTER TABLE callbacks ADD COLUMN IF NOT EXISTS target_id INTEGER REFERENCES targets(id)"))
-        # Drop old venue column if it exists
-        db.execute(text("ALTER TABLE bookings DROP COLUMN IF EXISTS venue"))
-        # Delete old bookings with NULL values in required fields
-        db.execute(text("DELETE FROM bookings WHERE contact_id IS NULL OR booking_from IS NULL OR booking_to IS NULL"))
-        db.commit()
-        print("Database columns updated successfully")
-    except Exception as e:
-        print(f"Column update error: {e}")
-        db.rollback()
-    finally:
-        db.close()
+
+app = FastAPI(title="Elise CRM", version="1.0.0", lifespan=lifespan)
+# Routes note when their endpoint returns, for the serialize time in Server-Timing (metrics.py)
+app.router.route_class = TimedRoute
+
+
+# ============== Compression ==============
+
+app.add_middleware(CompressionMiddleware)
+
+
+# ============== Metrics ==============
+
+# Outermost, so request latency includes every other middleware
+app.add_middleware(MetricsMiddleware)
+
+# Prometheus can scrape /metrics with this as a bearer token; a CRM session works too
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
 
 
 # ============== Authentication ==============
 
-def get_current_session(authorization: Optional[str] = Header(None)):
+async def get_current_session(authorization: Optional[str] = Header(None)):
     """Dependency to check if user is authenticated"""
     if not authorization:
         raise HTTPException(
@@ -74,7 +87,7 @@ def get_current_session(authorization: Optional[str] = Header(None)):
         )
     
     token = authorization.replace("Bearer ", "")
-    if not validate_session(token):
+    if not await validate_session(token):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired session"
@@ -83,10 +96,10 @@ def get_current_session(authorization: Optional[str] = Header(None)):
 
 
 @app.post("/api/auth/login")
-def login(data: PasswordCheck):
+async def login(data: PasswordCheck):
     """Login with password and get session token"""
     if verify_password(data.password):
-        token = create_session()
+        token = await create_session()
         return {"success": True, "token": token}
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -95,65 +108,162 @@ def login(data: PasswordCheck):
 
 
 @app.post("/api/auth/logout")
-def logout(token: str = Depends(get_current_session)):
+async def logout(token: str = Depends(get_current_session)):
     """Logout and invalidate session"""
-    invalidate_session(token)
+    await invalidate_session(token)
     return {"success": True, "message": "Logged out"}
 
 
 @app.get("/api/auth/check")
-def check_auth(token: str = Depends(get_current_session)):
+async def check_auth(token: str = Depends(get_current_session)):
     """Check if current session is valid"""
     return {"authenticated": True}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    """Request and SQL metrics in the Prometheus text format"""
+    token = (authorization or "").replace("Bearer ", "")
+    if not (METRICS_TOKEN and hmac.compare_digest(token.encode("utf-8"), METRICS_TOKEN.encode("utf-8"))):
+        await get_current_session(authorization)
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+# ============== Loading Strategies ==============
+
+# Response schemas embed the related contact (and target, for callbacks), so
+# load them in the same SELECT (an async session cannot lazy-load them later)
+CALL_LOG_OPTIONS = (joinedload(CallLog.contact),)
+CALLBACK_OPTIONS = (joinedload(Callback.contact), joinedload(Callback.target))
+BOOKING_OPTIONS = (joinedload(Booking.contact),)
+
+
+# ============== Conditional GET ==============
+
+# Tables each resource's responses are built from (embedded contacts and targets included),
+# so e.g. renaming a contact changes the ETag of every booking list that shows it
+CONTACT_TABLES = ("contacts",)
+CALL_LOG_TABLES = ("call_logs", "contacts")
+CALLBACK_TABLES = ("callbacks", "contacts", "targets")
+BOOKING_TABLES = ("bookings", "contacts")
+TARGET_TABLES = ("targets",)
+
+
+# ============== List Serialization ==============
+
+serialize_contact = RowSerializer(ContactResponse)
+serialize_call_log = RowSerializer(CallLogResponse)
+serialize_callback = RowSerializer(CallbackResponse)
+serialize_booking = RowSerializer(BookingResponse)
+serialize_target = RowSerializer(TargetResponse)
+
+
+def page_response(response: Response, items, next_cursor: Optional[str], serializer: RowSerializer):
+    """A list endpoint's page. With FAST_SERIALIZATION the rows are turned into dicts directly
+    and encoded with orjson, instead of being validated against the response_model one by one."""
+    if not FAST_SERIALIZATION:
+        return {"items": items, "next_cursor": next_cursor}
+    mark_serialization_start()
+    # A returned Response bypasses `response`, so carry its headers (ETag) over
+    return FastJSONResponse(
+        {"items": serializer.many(items), "next_cursor": next_cursor},
+        headers=dict(response.headers)
+    )
+
+
+# ============== List Filters ==============
+
+def filter_by_letter(query, column, letter: str):
+    """Filter to names starting with a letter, or with a number/symbol for '#'"""
+    first = func.upper(func.substr(func.ltrim(column), 1, 1))
+    if letter == "#":
+        return query.filter(or_(first < "A", first > "Z"))
+    return query.filter(first == letter.upper())
+
+
+def filter_by_search(query, columns, q: str):
+    """Case-insensitive substring match across any of the given columns"""
+    term = contains_pattern(q)
+    return query.filter(or_(*[column.ilike(term, escape=LIKE_ESCAPE) for column in columns]))
+
+
 # ============== Contacts ==============
 
-@app.get("/api/contacts", response_model=List[ContactResponse])
-def get_contacts(
-    db: Session = Depends(get_db),
+@app.get("/api/contacts", response_model=ContactPage)
+async def get_contacts(
+    request: Request,
+    response: Response,
+    q: Optional[str] = None,
+    letter: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
-    """Get all contacts"""
-    return db.query(Contact).order_by(Contact.care_home_name).all()
+    """Get a page of contacts sorted by care home name, optionally filtered
+    by a search term or by the first letter of the care home name."""
+    not_modified = await check_etag(db, request, response, CONTACT_TABLES)
+    if not_modified:
+        return not_modified
+
+    query = select(Contact)
+
+    if q:
+        query = filter_by_search(query, [
+            Contact.care_home_name, Contact.contact_person, Contact.telephone, Contact.email
+        ], q)
+    if letter:
+        query = filter_by_letter(query, Contact.care_home_name, letter)
+
+    items, next_cursor = await keyset_page(db, query, Contact.care_home_name, Contact.id, cursor, limit)
+    return page_response(response, items, next_cursor, serialize_contact)
 
 
 @app.get("/api/contacts/{contact_id}", response_model=ContactResponse)
-def get_contact(
+async def get_contact(
     contact_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Get a single contact by ID"""
-    contact = db.query(Contact).filter(Contact.id == contact_id).first()
+    not_modified = await check_etag(db, request, response, CONTACT_TABLES)
+    if not_modified:
+        return not_modified
+
+    contact = await db.get(Contact, contact_id)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     return contact
 
 
 @app.post("/api/contacts", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
-def create_contact(
+async def create_contact(
     contact: ContactCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Create a new contact"""
     db_contact = Contact(**contact.model_dump())
     db.add(db_contact)
-    db.commit()
-    db.refresh(db_contact)
+    bump_versions(db, "contacts")
+    await db.commit()
+    dashboard_cache.clear()
+    await db.refresh(db_contact)
+    search_index.upsert("contact", db_contact)
     return db_contact
 
 
 @app.put("/api/contacts/{contact_id}", response_model=ContactResponse)
-def update_contact(
+async def update_contact(
     contact_id: int,
     contact: ContactUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Update a contact"""
-    db_contact = db.query(Contact).filter(Contact.id == contact_id).first()
+    db_contact = await db.get(Contact, contact_id)
     if not db_contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     
@@ -161,79 +271,216 @@ def update_contact(
     for field, value in update_data.items():
         setattr(db_contact, field, value)
     
-    db.commit()
-    db.refresh(db_contact)
+    bump_versions(db, "contacts")
+    await db.commit()
+    dashboard_cache.clear()
+    await db.refresh(db_contact)
+    search_index.upsert("contact", db_contact)
     return db_contact
 
 
 @app.delete("/api/contacts/{contact_id}")
-def delete_contact(
+async def delete_contact(
     contact_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Delete a contact"""
-    db_contact = db.query(Contact).filter(Contact.id == contact_id).first()
+    db_contact = await db.get(Contact, contact_id)
     if not db_contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     
-    db.delete(db_contact)
-    db.commit()
+    await db.delete(db_contact)
+    bump_versions(db, "contacts", "call_logs", "callbacks", "bookings")
+    await db.commit()
+    dashboard_cache.clear()
+    search_index.remove("contact", contact_id)
     return {"success": True, "message": "Contact deleted"}
 
 
+async def get_contact_or_404(db: AsyncSession, contact_id: int) -> Contact:
+    contact = await db.get(Contact, contact_id)
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return contact
+
+
+@app.get("/api/contacts/{contact_id}/bookings", response_model=BookingPage)
+async def get_contact_bookings(
+    contact_id: int,
+    request: Request,
+    response: Response,
+    when: str = Query("upcoming", pattern="^(upcoming|past)$"),
+    fee_status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(get_current_session)
+):
+    """Get a page of a contact's upcoming bookings (soonest first) or past bookings
+    (latest first), optionally filtered by fee status"""
+    not_modified = await check_etag(db, request, response, BOOKING_TABLES)
+    if not_modified:
+        return not_modified
+
+    await get_contact_or_404(db, contact_id)
+    now = datetime.now()
+    query = select(Booking).options(*BOOKING_OPTIONS).filter(Booking.contact_id == contact_id)
+    if when == "upcoming":
+        query = query.filter(Booking.booking_from >= now)
+    else:
+        query = query.filter(Booking.booking_from < now)
+    if fee_status:
+        try:
+            query = query.filter(Booking.fee_status == FeeStatus(fee_status))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid fee status")
+
+    items, next_cursor = await keyset_page(
+        db, query, Booking.booking_from, Booking.id, cursor, limit,
+        descending=when == "past", is_datetime=True
+    )
+    return page_response(response, items, next_cursor, serialize_booking)
+
+
+@app.get("/api/contacts/{contact_id}/callbacks", response_model=CallbackPage)
+async def get_contact_callbacks(
+    contact_id: int,
+    request: Request,
+    response: Response,
+    callback_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(get_current_session)
+):
+    """Get a page of a contact's callbacks ordered by callback date, optionally of one type"""
+    not_modified = await check_etag(db, request, response, CALLBACK_TABLES)
+    if not_modified:
+        return not_modified
+
+    await get_contact_or_404(db, contact_id)
+    query = select(Callback).options(*CALLBACK_OPTIONS).filter(Callback.contact_id == contact_id)
+    if callback_type:
+        try:
+            query = query.filter(Callback.callback_type == CallbackType(callback_type))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid callback type")
+
+    items, next_cursor = await keyset_page(
+        db, query, Callback.callback_datetime, Callback.id, cursor, limit, is_datetime=True
+    )
+    return page_response(response, items, next_cursor, serialize_callback)
+
+
+@app.get("/api/contacts/{contact_id}/call-logs", response_model=CallLogPage)
+async def get_contact_call_logs(
+    contact_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(get_current_session)
+):
+    """Get a page of a contact's call logs, newest first"""
+    not_modified = await check_etag(db, request, response, CALL_LOG_TABLES)
+    if not_modified:
+        return not_modified
+
+    await get_contact_or_404(db, contact_id)
+    query = select(CallLog).options(*CALL_LOG_OPTIONS).filter(CallLog.contact_id == contact_id)
+
+    items, next_cursor = await keyset_page(
+        db, query, CallLog.call_datetime, CallLog.id, cursor, limit,
+        descending=True, is_datetime=True
+    )
+    return page_response(response, items, next_cursor, serialize_call_log)
+
+
 # ============== Call Logs ==============
 
-@app.get("/api/call-logs", response_model=List[CallLogResponse])
-def get_call_logs(
-    db: Session = Depends(get_db),
+@app.get("/api/call-logs", response_model=CallLogPage)
+async def get_call_logs(
+    request: Request,
+    response: Response,
+    contact_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
-    """Get all call logs"""
-    return db.query(CallLog).order_by(CallLog.call_datetime.desc()).all()
+    """Get a page of call logs, newest first, optionally filtered by contact and date range"""
+    not_modified = await check_etag(db, request, response, CALL_LOG_TABLES)
+    if not_modified:
+        return not_modified
+
+    query = select(CallLog).options(*CALL_LOG_OPTIONS)
+
+    if contact_id:
+        query = query.filter(CallLog.contact_id == contact_id)
+    if date_from:
+        query = query.filter(CallLog.call_datetime >= date_from)
+    if date_to:
+        query = query.filter(CallLog.call_datetime < date_to)
+
+    items, next_cursor = await keyset_page(
+        db, query, CallLog.call_datetime, CallLog.id, cursor, limit,
+        descending=True, is_datetime=True
+    )
+    return page_response(response, items, next_cursor, serialize_call_log)
 
 
 @app.get("/api/call-logs/{log_id}", response_model=CallLogResponse)
-def get_call_log(
+async def get_call_log(
     log_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Get a single call log by ID"""
-    log = db.query(CallLog).filter(CallLog.id == log_id).first()
+    not_modified = await check_etag(db, request, response, CALL_LOG_TABLES)
+    if not_modified:
+        return not_modified
+
+    log = await db.get(CallLog, log_id, options=[*CALL_LOG_OPTIONS])
     if not log:
         raise HTTPException(status_code=404, detail="Call log not found")
     return log
 
 
 @app.post("/api/call-logs", response_model=CallLogResponse, status_code=status.HTTP_201_CREATED)
-def create_call_log(
+async def create_call_log(
     log: CallLogCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Create a new call log"""
     # Verify contact exists
-    contact = db.query(Contact).filter(Contact.id == log.contact_id).first()
+    contact = await db.get(Contact, log.contact_id)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     
     db_log = CallLog(**log.model_dump())
     db.add(db_log)
-    db.commit()
-    db.refresh(db_log)
+    bump_versions(db, "call_logs")
+    await db.commit()
+    await db.refresh(db_log, ["contact"])
     return db_log
 
 
 @app.put("/api/call-logs/{log_id}", response_model=CallLogResponse)
-def update_call_log(
+async def update_call_log(
     log_id: int,
     log: CallLogUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Update a call log"""
-    db_log = db.query(CallLog).filter(CallLog.id == log_id).first()
+    db_log = await db.get(CallLog, log_id)
     if not db_log:
         raise HTTPException(status_code=404, detail="Call log not found")
     
@@ -241,64 +488,146 @@ def update_call_log(
     for field, value in update_data.items():
         setattr(db_log, field, value)
     
-    db.commit()
-    db.refresh(db_log)
+    bump_versions(db, "call_logs")
+    await db.commit()
+    await db.refresh(db_log, ["contact"])
     return db_log
 
 
 @app.delete("/api/call-logs/{log_id}")
-def delete_call_log(
+async def delete_call_log(
     log_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Delete a call log"""
-    db_log = db.query(CallLog).filter(CallLog.id == log_id).first()
+    db_log = await db.get(CallLog, log_id)
     if not db_log:
         raise HTTPException(status_code=404, detail="Call log not found")
     
-    db.delete(db_log)
-    db.commit()
+    await db.delete(db_log)
+    bump_versions(db, "call_logs")
+    await db.commit()
     return {"success": True, "message": "Call log deleted"}
 
 
 # ============== Callbacks ==============
 
-@app.get("/api/callbacks", response_model=List[CallbackResponse])
-def get_callbacks(
+@app.get("/api/callbacks", response_model=CallbackPage)
+async def get_callbacks(
+    request: Request,
+    response: Response,
     callback_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    contact_id: Optional[int] = None,
+    target_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
-    """Get all callbacks, optionally filtered by type"""
-    query = db.query(Callback)
+    """Get a page of callbacks ordered by callback date, optionally filtered
+    by type, contact, target and callback date range"""
+    not_modified = await check_etag(db, request, response, CALLBACK_TABLES)
+    if not_modified:
+        return not_modified
+
+    query = select(Callback).options(*CALLBACK_OPTIONS)
     
     if callback_type:
         if callback_type == "Awaiting Callback":
             query = query.filter(Callback.callback_type == CallbackType.AWAITING_CALLBACK)
         elif callback_type == "To Call Back":
             query = query.filter(Callback.callback_type == CallbackType.TO_CALL_BACK)
+    if contact_id:
+        query = query.filter(Callback.contact_id == contact_id)
+    if target_id:
+        query = query.filter(Callback.target_id == target_id)
+    if date_from:
+        query = query.filter(Callback.callback_datetime >= date_from)
+    if date_to:
+        query = query.filter(Callback.callback_datetime < date_to)
     
-    return query.order_by(Callback.callback_datetime).all()
+    items, next_cursor = await keyset_page(
+        db, query, Callback.callback_datetime, Callback.id, cursor, limit, is_datetime=True
+    )
+    return page_response(response, items, next_cursor, serialize_callback)
+
+
+@app.get("/api/callbacks/due", response_model=CallbackPage)
+async def get_due_callbacks(
+    request: Request,
+    response: Response,
+    before: Optional[datetime] = None,
+    callback_type: str = CallbackType.TO_CALL_BACK.value,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(get_current_session)
+):
+    """Get a page of the callbacks of a type (To Call Back by default) due before a time
+    (now by default), earliest first - a range scan of the (type, callback date) index"""
+    try:
+        wanted_type = CallbackType(callback_type)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid callback type")
+
+    if before is None:
+        before = datetime.now()
+    else:
+        # Without an explicit time the answer changes with the clock, not just with writes
+        not_modified = await check_etag(db, request, response, CALLBACK_TABLES)
+        if not_modified:
+            return not_modified
+
+    query = select(Callback).options(*CALLBACK_OPTIONS).filter(
+        Callback.callback_type == wanted_type,
+        Callback.callback_datetime < before
+    )
+    items, next_cursor = await keyset_page(
+        db, query, Callback.callback_datetime, Callback.id, cursor, limit, is_datetime=True
+    )
+    return page_response(response, items, next_cursor, serialize_callback)
+
+
+async def load_due_callbacks(ids: list) -> list:
+    """The callbacks for a reminder, among ids, that are still To Call Back and due now"""
+    async with AsyncSessionLocal() as db:
+        callbacks = (await db.scalars(select(Callback).options(*CALLBACK_OPTIONS).filter(
+            Callback.id.in_(ids),
+            Callback.callback_type == CallbackType.TO_CALL_BACK,
+            Callback.callback_datetime <= datetime.now()
+        ).order_by(Callback.callback_datetime, Callback.id))).unique().all()
+        return [CallbackResponse.model_validate(callback).model_dump(mode="json") for callback in callbacks]
+
+
+reminder_scheduler.due_source = load_due_callbacks
 
 
 @app.get("/api/callbacks/{callback_id}", response_model=CallbackResponse)
-def get_callback(
+async def get_callback(
     callback_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Get a single callback by ID"""
-    callback = db.query(Callback).filter(Callback.id == callback_id).first()
+    not_modified = await check_etag(db, request, response, CALLBACK_TABLES)
+    if not_modified:
+        return not_modified
+
+    callback = await db.get(Callback, callback_id, options=[*CALLBACK_OPTIONS])
     if not callback:
         raise HTTPException(status_code=404, detail="Callback not found")
     return callback
 
 
 @app.post("/api/callbacks", response_model=CallbackResponse, status_code=status.HTTP_201_CREATED)
-def create_callback(
+async def create_callback(
     callback: CallbackCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Create a new callback - must link to either a Contact or a Target."""
@@ -310,10 +639,10 @@ def create_callback(
 
     # Verify the linked entity exists
     if callback.contact_id:
-        if not db.query(Contact).filter(Contact.id == callback.contact_id).first():
+        if not await db.get(Contact, callback.contact_id):
             raise HTTPException(status_code=404, detail="Contact not found")
     else:
-        if not db.query(Target).filter(Target.id == callback.target_id).first():
+        if not await db.get(Target, callback.target_id):
             raise HTTPException(status_code=404, detail="Target not found")
 
     callback_data = callback.model_dump()
@@ -322,20 +651,22 @@ def create_callback(
 
     db_callback = Callback(**callback_data)
     db.add(db_callback)
-    db.commit()
-    db.refresh(db_callback)
+    bump_versions(db, "callbacks")
+    await db.commit()
+    dashboard_cache.clear()
+    await db.refresh(db_callback, ["contact", "target"])
     return db_callback
 
 
 @app.put("/api/callbacks/{callback_id}", response_model=CallbackResponse)
-def update_callback(
+async def update_callback(
     callback_id: int,
     callback: CallbackUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Update a callback"""
-    db_callback = db.query(Callback).filter(Callback.id == callback_id).first()
+    db_callback = await db.get(Callback, callback_id)
     if not db_callback:
         raise HTTPException(status_code=404, detail="Callback not found")
     
@@ -346,170 +677,280 @@ def update_callback(
     for field, value in update_data.items():
         setattr(db_callback, field, value)
     
-    db.commit()
-    db.refresh(db_callback)
+    bump_versions(db, "callbacks")
+    await db.commit()
+    dashboard_cache.clear()
+    await db.refresh(db_callback, ["contact", "target"])
     return db_callback
 
 
 @app.delete("/api/callbacks/{callback_id}")
-def delete_callback(
+async def delete_callback(
     callback_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Delete a callback"""
-    db_callback = db.query(Callback).filter(Callback.id == callback_id).first()
+    db_callback = await db.get(Callback, callback_id)
     if not db_callback:
         raise HTTPException(status_code=404, detail="Callback not found")
     
-    db.delete(db_callback)
-    db.commit()
+    await db.delete(db_callback)
+    bump_versions(db, "callbacks")
+    await db.commit()
+    dashboard_cache.clear()
     return {"success": True, "message": "Callback deleted"}
 
 
 # ============== Bookings ==============
 
-@app.get("/api/bookings", response_model=List[BookingResponse])
-def get_bookings(
+@app.get("/api/bookings", response_model=BookingPage)
+async def get_bookings(
+    request: Request,
+    response: Response,
     fee_status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    contact_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    window_from: Optional[datetime] = Query(None, alias="from"),
+    window_to: Optional[datetime] = Query(None, alias="to"),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
-    """Get all bookings, optionally filtered by fee status.
-    'Unpaid' filter shows both Unpaid AND Invoiced (anything not yet paid)."""
-    query = db.query(Booking)
+    """Get a page of bookings ordered by start date, optionally filtered by fee status,
+    contact and start date range.
+    'Unpaid' filter shows both Unpaid AND Invoiced (anything not yet paid).
+    'from'/'to' return only bookings that overlap that window (used by the calendar)."""
+    not_modified = await check_etag(db, request, response, BOOKING_TABLES)
+    if not_modified:
+        return not_modified
+
+    query = select(Booking).options(*BOOKING_OPTIONS)
     
     if fee_status == "Unpaid":
         query = query.filter(Booking.fee_status.in_([FeeStatus.UNPAID, FeeStatus.INVOICED]))
     elif fee_status:
-        query = query.filter(Booking.fee_status == FeeStatus(fee_status))
+        try:
+            query = query.filter(Booking.fee_status == FeeStatus(fee_status))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid fee status")
+    if contact_id:
+        query = query.filter(Booking.contact_id == contact_id)
+    if date_from:
+        query = query.filter(Booking.booking_from >= date_from)
+    if date_to:
+        query = query.filter(Booking.booking_from < date_to)
+    if window_from:
+        query = query.filter(Booking.booking_to > window_from)
+    if window_to:
+        query = query.filter(Booking.booking_from < window_to)
     
-    return query.order_by(Booking.booking_from).all()
+    items, next_cursor = await keyset_page(
+        db, query, Booking.booking_from, Booking.id, cursor, limit, is_datetime=True
+    )
+    return page_response(response, items, next_cursor, serialize_booking)
+
+
+# Declared before /api/bookings/{booking_id}, which would otherwise match it first
+@app.get("/api/bookings/backup-test")
+async def bookings_backup_test(token: str = Depends(get_current_session)):
+    """Simple test endpoint to verify backup wiring"""
+    return {"status": "ok", "message": "Backup endpoint is working"}
+
 
 @app.get("/api/bookings/{booking_id}", response_model=BookingResponse)
-def get_booking(
+async def get_booking(
     booking_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Get a single booking by ID"""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    not_modified = await check_etag(db, request, response, BOOKING_TABLES)
+    if not_modified:
+        return not_modified
+
+    booking = await db.get(Booking, booking_id, options=[*BOOKING_OPTIONS])
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     return booking
 
 
 @app.post("/api/bookings", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
-def create_booking(
+async def create_booking(
     booking: BookingCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
-    """Create a new booking"""
+    """Create a new booking (409 if it overlaps another booking)"""
     booking_data = booking.model_dump()
     booking_data['fee_status'] = FeeStatus(booking_data['fee_status'])
-    
-    db_booking = Booking(**booking_data)
-    db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
+    async with booking_period_lock(db):
+        await check_booking_period(db, booking_data['booking_from'], booking_data['booking_to'])
+        db_booking = Booking(**booking_data)
+        db.add(db_booking)
+        bump_versions(db, "bookings")
+        await db.commit()
+    dashboard_cache.clear()
+    await db.refresh(db_booking, ["contact"])
     return db_booking
 
 
 @app.put("/api/bookings/{booking_id}", response_model=BookingResponse)
-def update_booking(
+async def update_booking(
     booking_id: int,
     booking: BookingUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
-    """Update a booking"""
-    db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    """Update a booking (409 if its new time overlaps another booking)"""
+    db_booking = await db.get(Booking, booking_id)
     if not db_booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
     update_data = booking.model_dump(exclude_unset=True)
     if 'fee_status' in update_data and update_data['fee_status']:
         update_data['fee_status'] = FeeStatus(update_data['fee_status'])
-    
-    for field, value in update_data.items():
-        setattr(db_booking, field, value)
-    
-    db.commit()
-    db.refresh(db_booking)
+
+    # Only a change of time is checked, so bookings that already overlap can still be edited
+    booking_from = update_data.get('booking_from') or db_booking.booking_from
+    booking_to = update_data.get('booking_to') or db_booking.booking_to
+    moved = (booking_from, booking_to) != (db_booking.booking_from, db_booking.booking_to)
+    async with booking_period_lock(db) if moved else nullcontext():
+        if moved:
+            await check_booking_period(db, booking_from, booking_to, booking_id)
+        for field, value in update_data.items():
+            setattr(db_booking, field, value)
+        bump_versions(db, "bookings")
+        await db.commit()
+    dashboard_cache.clear()
+    await db.refresh(db_booking, ["contact"])
     return db_booking
 
 
 @app.delete("/api/bookings/{booking_id}")
-def delete_booking(
+async def delete_booking(
     booking_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Delete a booking"""
-    db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    db_booking = await db.get(Booking, booking_id)
     if not db_booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
-    db.delete(db_booking)
-    db.commit()
+    await db.delete(db_booking)
+    bump_versions(db, "bookings")
+    await db.commit()
+    dashboard_cache.clear()
     return {"success": True, "message": "Booking deleted"}
 
-# ============== Bookings Backup (Test) ==============
 
-@app.get("/api/bookings/backup-test")
-def bookings_backup_test(token: str = Depends(get_current_session)):
-    """Simple test endpoint to verify backup wiring"""
-    return {"status": "ok", "message": "Backup endpoint is working"}
+# Longest window /api/availability searches in one request
+MAX_AVAILABILITY_DAYS = 366
+
+
+@app.get("/api/availability", response_model=Availability)
+async def get_availability(
+    request: Request,
+    response: Response,
+    window_from: datetime = Query(..., alias="from"),
+    window_to: datetime = Query(..., alias="to"),
+    duration: int = Query(60, ge=1, le=MAX_AVAILABILITY_DAYS * 24 * 60),
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(get_current_session)
+):
+    """Free slots of at least `duration` minutes between 'from' and 'to', earliest first"""
+    if window_to <= window_from:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    if window_to - window_from > timedelta(days=MAX_AVAILABILITY_DAYS):
+        raise HTTPException(status_code=400, detail=f"Availability is limited to {MAX_AVAILABILITY_DAYS} days at a time")
 
+    not_modified = await check_etag(db, request, response, BOOKING_TABLES)
+    if not_modified:
+        return not_modified
+
+    periods = await booked_periods(db, window_from, window_to)
+    slots = free_slots(periods, window_from, window_to, timedelta(minutes=duration))
+    return {"duration": duration, "slots": [{"start": start, "end": end} for start, end in slots]}
 
 # ============== Targets ==============
 
-@app.get("/api/targets", response_model=List[TargetResponse])
-def get_targets(
-    db: Session = Depends(get_db),
+@app.get("/api/targets", response_model=TargetPage)
+async def get_targets(
+    request: Request,
+    response: Response,
+    q: Optional[str] = None,
+    letter: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
-    """Get all targets, sorted alphabetically"""
-    return db.query(Target).order_by(Target.care_home_name).all()
+    """Get a page of targets sorted alphabetically, optionally filtered
+    by a search term or by the first letter of the care home name."""
+    not_modified = await check_etag(db, request, response, TARGET_TABLES)
+    if not_modified:
+        return not_modified
+
+    query = select(Target)
+
+    if q:
+        query = filter_by_search(query, [Target.care_home_name, Target.telephone, Target.notes], q)
+    if letter:
+        query = filter_by_letter(query, Target.care_home_name, letter)
+
+    items, next_cursor = await keyset_page(db, query, Target.care_home_name, Target.id, cursor, limit)
+    return page_response(response, items, next_cursor, serialize_target)
 
 
 @app.get("/api/targets/{target_id}", response_model=TargetResponse)
-def get_target(
+async def get_target(
     target_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Get a single target by ID"""
-    target = db.query(Target).filter(Target.id == target_id).first()
+    not_modified = await check_etag(db, request, response, TARGET_TABLES)
+    if not_modified:
+        return not_modified
+
+    target = await db.get(Target, target_id)
     if not target:
         raise HTTPException(status_code=404, detail="Target not found")
     return target
 
 
 @app.post("/api/targets", response_model=TargetResponse, status_code=status.HTTP_201_CREATED)
-def create_target(
+async def create_target(
     target: TargetCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Create a new target"""
     db_target = Target(**target.model_dump())
     db.add(db_target)
-    db.commit()
-    db.refresh(db_target)
+    bump_versions(db, "targets")
+    await db.commit()
+    await db.refresh(db_target)
+    search_index.upsert("target", db_target)
     return db_target
 
 
 @app.put("/api/targets/{target_id}", response_model=TargetResponse)
-def update_target(
+async def update_target(
     target_id: int,
     target: TargetUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Update a target"""
-    db_target = db.query(Target).filter(Target.id == target_id).first()
+    db_target = await db.get(Target, target_id)
     if not db_target:
         raise HTTPException(status_code=404, detail="Target not found")
 
@@ -517,102 +958,347 @@ def update_target(
     for field, value in update_data.items():
         setattr(db_target, field, value)
 
-    db.commit()
-    db.refresh(db_target)
+    bump_versions(db, "targets")
+    await db.commit()
+    await db.refresh(db_target)
+    search_index.upsert("target", db_target)
     return db_target
 
 
 @app.delete("/api/targets/{target_id}")
-def delete_target(
+async def delete_target(
     target_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Delete a target (and any associated callbacks via cascade)"""
-    db_target = db.query(Target).filter(Target.id == target_id).first()
+    db_target = await db.get(Target, target_id)
     if not db_target:
         raise HTTPException(status_code=404, detail="Target not found")
 
-    db.delete(db_target)
-    db.commit()
+    await db.delete(db_target)
+    bump_versions(db, "targets", "callbacks")
+    await db.commit()
+    dashboard_cache.clear()
+    search_index.remove("target", target_id)
     return {"success": True, "message": "Target deleted"}
 
 
 @app.post("/api/targets/{target_id}/promote", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
-def promote_target_to_contact(
+async def promote_target_to_contact(
     target_id: int,
     contact: ContactCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
     """Promote a target to a contact. Re-links any existing callbacks to the new contact,
     then deletes the target."""
-    db_target = db.query(Target).filter(Target.id == target_id).first()
+    db_target = await db.get(Target, target_id)
     if not db_target:
         raise HTTPException(status_code=404, detail="Target not found")
 
     # Create the new contact
     db_contact = Contact(**contact.model_dump())
     db.add(db_contact)
-    db.flush()  # get an id without committing
+    await db.flush()  # get an id without committing
 
     # Re-link any callbacks from the target to the new contact
-    db.query(Callback).filter(Callback.target_id == target_id).update({
-        "contact_id": db_contact.id,
-        "target_id": None
-    })
+    await db.execute(update(Callback).where(Callback.target_id == target_id).values(
+        contact_id=db_contact.id,
+        target_id=None
+    ))
 
     # Delete the target
-    db.delete(db_target)
-    db.commit()
-    db.refresh(db_contact)
+    await db.delete(db_target)
+    bump_versions(db, "contacts", "callbacks", "targets")
+    await db.commit()
+    dashboard_cache.clear()
+    await db.refresh(db_contact)
+    search_index.remove("target", target_id)
+    search_index.upsert("contact", db_contact)
     return db_contact
 
 
+# ============== Search ==============
+
+@app.get("/api/search", response_model=List[SearchResult])
+async def search_contacts_and_targets(
+    q: str = Query(..., min_length=1),
+    type: Optional[str] = Query(None, pattern="^(contact|target)$"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(get_current_session)
+):
+    """Fuzzy search across contacts and targets (name, person, phone, email, postcode, notes),
+    best match first. Optionally restricted to one type."""
+    kinds = {type} if type else {"contact", "target"}
+    results = await search(db, q.strip(), kinds, limit)
+    return [{"type": kind, "score": round(score, 3), kind: row} for kind, row, score in results]
+
+
+# ============== Change Feed ==============
+
+# How each synced table's rows are loaded and serialized, as on their own endpoints
+CHANGE_FEEDS = {
+    "contacts": (Contact, (), serialize_contact),
+    "call_logs": (CallLog, CALL_LOG_OPTIONS, serialize_call_log),
+    "callbacks": (Callback, CALLBACK_OPTIONS, serialize_callback),
+    "bookings": (Booking, BOOKING_OPTIONS, serialize_booking),
+    "targets": (Target, (), serialize_target),
+}
+
+
+@app.get("/api/changes", response_model=ChangeFeed)
+async def get_changes(
+    since: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(get_current_session)
+):
+    """Rows created, updated or deleted after the cursor `since`. Without `since`, or if the
+    changes cannot be listed (too many, or an expired or unknown cursor), returns reset=true
+    and a cursor to start from after reloading."""
+    # Read the counters first: anything committed after this is at a later version
+    now = datetime.utcnow()
+    cursor = encode_cursor(now, await current_versions(db))
+    since_cursor = decode_cursor(since) if since is not None else None
+    if since_cursor is None or is_expired(since_cursor[0], now):
+        return {"cursor": cursor, "reset": True, "changes": {}}
+    ids = await changed_ids(db, since_cursor[1])
+    if ids is None:
+        return {"cursor": cursor, "reset": True, "changes": {}}
+
+    changes = {}
+    for table, (upserted, deleted) in ids.items():
+        model, options, serializer = CHANGE_FEEDS[table]
+        rows = []
+        if upserted:
+            rows = (await db.scalars(
+                select(model).options(*options).filter(model.id.in_(upserted)).order_by(model.id)
+            )).unique().all()
+        changes[table] = {"upserted": serializer.many(rows), "deleted": deleted}
+
+    body = {"cursor": cursor, "reset": False, "changes": changes}
+    if not FAST_SERIALIZATION:
+        return body
+    mark_serialization_start()
+    return FastJSONResponse(body)
+
+
+# ============== Reports ==============
+
+def parse_month(value: str):
+    try:
+        year, month = value.split("-")
+        return date(int(year), int(month), 1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid month, expected YYYY-MM")
+
+
+@app.get("/api/reports/revenue", response_model=RevenueReport)
+async def revenue_report(
+    request: Request,
+    response: Response,
+    from_month: Optional[str] = Query(None, alias="from"),
+    to_month: Optional[str] = Query(None, alias="to"),
+    contact_id: Optional[int] = None,
+    group_by: str = Query("month", pattern="^(month|contact)$"),
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(get_current_session)
+):
+    """Booking counts and fee totals per fee status, by month or by care home, for the
+    months from/to (YYYY-MM, inclusive). Read from the booking summaries (see reports.py),
+    so the cost depends on the months asked for, not on how many bookings there are."""
+    not_modified = await check_etag(db, request, response, BOOKING_TABLES)
+    if not_modified:
+        return not_modified
+
+    filters = []
+    if from_month:
+        filters.append(BookingSummary.month >= parse_month(from_month))
+    if to_month:
+        filters.append(BookingSummary.month <= parse_month(to_month))
+    if contact_id:
+        filters.append(BookingSummary.contact_id == contact_id)
+    elif group_by == "month":
+        filters.append(BookingSummary.contact_id == ALL_CONTACTS)
+    else:
+        filters.append(BookingSummary.contact_id != ALL_CONTACTS)
+    bookings = func.sum(BookingSummary.booking_count).label("bookings")
+    fees = func.sum(BookingSummary.fee_total).label("fees")
+
+    if group_by == "month":
+        result = await db.execute(
+            select(BookingSummary.month, BookingSummary.fee_status, bookings, fees)
+            .filter(*filters)
+            .group_by(BookingSummary.month, BookingSummary.fee_status)
+            .order_by(BookingSummary.month, BookingSummary.fee_status)
+        )
+        rows = [
+            {"month": row.month.strftime("%Y-%m"), "fee_status": row.fee_status.value,
+             "bookings": row.bookings, "fees": float(row.fees)}
+            for row in result
+        ]
+    else:
+        result = await db.execute(
+            select(BookingSummary.contact_id, Contact.care_home_name, BookingSummary.fee_status, bookings, fees)
+            .join(Contact, Contact.id == BookingSummary.contact_id)
+            .filter(*filters)
+            .group_by(BookingSummary.contact_id, Contact.care_home_name, BookingSummary.fee_status)
+            .order_by(Contact.care_home_name, BookingSummary.contact_id, BookingSummary.fee_status)
+        )
+        rows = [
+            {"contact_id": row.contact_id, "care_home_name": row.care_home_name, "fee_status": row.fee_status.value,
+             "bookings": row.bookings, "fees": float(row.fees)}
+            for row in result
+        ]
+
+    totals = {}
+    for row in rows:
+        total = totals.setdefault(row["fee_status"], {"fee_status": row["fee_status"], "bookings": 0, "fees": 0.0})
+        total["bookings"] += row["bookings"]
+        total["fees"] = round(total["fees"] + row["fees"], 2)
+    return {"group_by": group_by, "rows": rows, "totals": list(totals.values())}
+
+
+# ============== Live Updates ==============
+
+@app.get("/api/events")
+async def stream_events(token: str = Depends(get_current_session)):
+    """Server-Sent Events stream: a `changes` event (changed tables, fresh dashboard
+    stats) after every committed write; see events.py"""
+    return StreamingResponse(
+        hub.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ============== CSV Export ==============
+
+@app.get("/api/export/{name}.csv")
+async def export_csv(name: str, token: str = Depends(get_current_session)):
+    """Stream a whole table as CSV (contacts, bookings, call-logs or callbacks)"""
+    if name not in EXPORTS:
+        raise HTTPException(status_code=404, detail="Unknown export")
+    filename = EXPORTS[name][0]
+    return StreamingResponse(
+        stream_csv(name),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+# ============== Bulk Import ==============
+
+@app.post("/api/import/{kind}", response_model=ImportResult)
+async def bulk_import(
+    kind: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(get_current_session)
+):
+    """
+    Import contacts or targets from a CSV (with a header row) or NDJSON request body.
+    Rows are validated against ContactCreate/TargetCreate and inserted in chunks;
+    invalid rows are skipped and reported by row number.
+    """
+    if kind not in IMPORTS:
+        raise HTTPException(status_code=404, detail="Unknown import")
+
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        is_csv = True
+    elif "ndjson" in content_type or "jsonlines" in content_type:
+        is_csv = False
+    else:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson")
+
+    try:
+        body = (await request.body()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8")
+
+    result = await run_in_threadpool(import_records, kind, body, is_csv)
+    if result["imported"]:
+        bump_versions(db, IMPORTS[kind][0].__tablename__)
+        await db.commit()
+        dashboard_cache.clear()
+        search_index.reset()
+    return result
+
+
+# ============== Internal ==============
+
+@app.get("/api/internal/pool")
+async def pool_status(token: str = Depends(get_current_session)):
+    """Connection pool statistics for the async (API) and sync (startup/import) engines"""
+    return get_pool_stats()
+
+
 # ============== Dashboard Stats ==============
 
+# Stats are cached briefly and cleared by every Contact, Callback and Booking write
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+dashboard_cache = TTLCache(ttl=DASHBOARD_CACHE_TTL)
+
+
 @app.get("/api/dashboard/stats")
-def get_dashboard_stats(
-    db: Session = Depends(get_db),
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(get_current_session)
 ):
-    """Get dashboard statistics"""
-    from datetime import datetime, timedelta
-    
+    """Get dashboard statistics (one aggregate query, cached per day)"""
+    return await dashboard_stats(db)
+
+
+async def dashboard_stats(db: AsyncSession) -> dict:
     today = datetime.now().date()
-    
-    total_contacts = db.query(Contact).count()
-    total_bookings = db.query(Booking).count()
+    cached = dashboard_cache.get(today)
+    if cached is not None:
+        return cached
+
     today_start = datetime.combine(today, datetime.min.time())
-    upcoming_bookings = db.query(Booking).filter(
-        Booking.booking_from >= today_start
-    ).count()
-    
-    awaiting_callbacks = db.query(Callback).filter(
-        Callback.callback_type == CallbackType.AWAITING_CALLBACK
-    ).count()
-    
-    to_call_back = db.query(Callback).filter(
-        Callback.callback_type == CallbackType.TO_CALL_BACK
-    ).count()
-    
-    unpaid_bookings = db.query(Booking).filter(
-        Booking.fee_status.in_([FeeStatus.UNPAID, FeeStatus.INVOICED])
-    ).count()
-    
-    invoiced_bookings = db.query(Booking).filter(
-        Booking.fee_status == FeeStatus.INVOICED
-    ).count()
-    
-    return {
-        "total_contacts": total_contacts,
-        "total_bookings": total_bookings,
-        "upcoming_bookings": upcoming_bookings,
-        "awaiting_callbacks": awaiting_callbacks,
-        "to_call_back": to_call_back,
-        "unpaid_bookings": unpaid_bookings,
-        "invoiced_bookings": invoiced_bookings
+    not_paid = Booking.fee_status.in_([FeeStatus.UNPAID, FeeStatus.INVOICED])
+
+    # One aggregate row per table, cross-joined into a single result row
+    contact_stats = select(func.count().label("total_contacts")).select_from(Contact).subquery()
+    booking_stats = select(
+        func.count().label("total_bookings"),
+        func.count(case((Booking.booking_from >= today_start, 1))).label("upcoming_bookings"),
+        func.count(case((not_paid, 1))).label("unpaid_bookings"),
+        func.count(case((Booking.fee_status == FeeStatus.INVOICED, 1))).label("invoiced_bookings")
+    ).select_from(Booking).subquery()
+    callback_stats = select(
+        func.count(case((Callback.callback_type == CallbackType.AWAITING_CALLBACK, 1))).label("awaiting_callbacks"),
+        func.count(case((Callback.callback_type == CallbackType.TO_CALL_BACK, 1))).label("to_call_back")
+    ).select_from(Callback).subquery()
+
+    row = (await db.execute(
+        select(contact_stats, booking_stats, callback_stats).select_from(
+            contact_stats.join(booking_stats, true()).join(callback_stats, true())
+        )
+    )).one()
+
+    stats = {
+        "total_contacts": row.total_contacts,
+        "total_bookings": row.total_bookings,
+        "upcoming_bookings": row.upcoming_bookings,
+        "awaiting_callbacks": row.awaiting_callbacks,
+        "to_call_back": row.to_call_back,
+        "unpaid_bookings": row.unpaid_bookings,
+        "invoiced_bookings": row.invoiced_bookings
     }
+    dashboard_cache.set(today, stats)
+    return stats
+
+
+async def live_dashboard_stats() -> dict:
+    """Stats for the live update events, computed once per event for every open tab"""
+    async with AsyncSessionLocal() as db:
+        return await dashboard_stats(db)
+
+
+hub.stats_source = live_dashboard_stats
 
 
 # ============== Static Files & Page ===============
@@ -622,24 +1308,40 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 FRONTEND_DIR = os.path.join(BASE_DIR, "frontend")
 
 
+# HTML, CSS and JS are not content-hashed, so browsers revalidate them on each use (cheap 304s);
+# their precompressed .br/.gz copies (written at deploy, see compression.py) are served to
+# clients that accept them
+REVALIDATE = "no-cache"
+IMMUTABLE = "public, max-age=31536000, immutable"
+pages = PrecompressedStaticFiles(directory=FRONTEND_DIR, cache_control=REVALIDATE)
+
+
 @app.get("/")
-def serve_homepage():
+async def serve_homepage(request: Request):
     """Serve the public homepage"""
-    return FileResponse(os.path.join(FRONTEND_DIR, "index.html"))
+    return await pages.get_response("index.html", request.scope)
 
 
 @app.get("/crm")
-def serve_crm():
+async def serve_crm(request: Request):
     """Serve the CRM page"""
-    return FileResponse(os.path.join(FRONTEND_DIR, "crm.html"))
+    return await pages.get_response("crm.html", request.scope)
 
 @app.get("/terms")
-def serve_terms():
+async def serve_terms(request: Request):
     """Serve the Terms of Booking page"""
-    return FileResponse(os.path.join(FRONTEND_DIR, "terms.html"))
+    return await pages.get_response("terms.html", request.scope)
 
 
 # Mount static files (CSS, JS, Images)
-app.mount("/css", StaticFiles(directory=os.path.join(FRONTEND_DIR, "css")), name="css")
-app.mount("/js", StaticFiles(directory=os.path.join(FRONTEND_DIR, "js")), name="js")
+app.mount("/css", PrecompressedStaticFiles(directory=os.path.join(FRONTEND_DIR, "css"), cache_control=REVALIDATE), name="css")
+app.mount("/js", PrecompressedStaticFiles(directory=os.path.join(FRONTEND_DIR, "js"), cache_control=REVALIDATE), name="js")
+# Resized WebP/AVIF images from build_images.py (hashed file names); must be mounted before /images
+app.mount(
+    "/images/optimized",
+    PrecompressedStaticFiles(
+        directory=os.path.join(FRONTEND_DIR, "images", "optimized"), check_dir=False, cache_control=IMMUTABLE
+    ),
+    name="optimized-images"
+)
 app.mount("/images", StaticFiles(directory=os.path.join(FRONTEND_DIR, "images")), name="images")
@@ -0,0 +1,263 @@
+"""
+Request metrics.
+
+MetricsMiddleware times every request and, through database.count_queries(), the SQL
+statements behind it. The results are kept per route template (/api/contacts/{contact_id},
+not each id) and rendered in the Prometheus text format by render_metrics() for GET /metrics.
+
+API responses also get a Server-Timing header, which browser devtools show in the network panel:
+
+    db          time spent in SQL statements (desc: how many)
+    app         the rest of the handler: auth, Python work, waiting on the pool
+    serialize   from the endpoint returning to the response starting (validation, JSON encoding)
+    total       from the request arriving to the response starting
+
+Serialization is measured by TimedRoute, which main.py installs as the app's route class.
+"""
+from contextvars import ContextVar
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from typing import Optional
+import asyncio
+import functools
+import threading
+import time
+
+from database import count_queries
+
+# Seconds; the Prometheus client's default buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Label for requests no route matched (static files, 404s), so odd URLs can't create new series
+OTHER_ROUTE = "other"
+
+
+# ============== Metric Types ==============
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    """One metric family: a value (or histogram) per combination of label values"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = f'le="{_format_value(float(bound))}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+# ============== Registry ==============
+
+ROUTE_LABELS = ("method", "route")
+
+REQUESTS = Counter("elise_http_requests_total", "HTTP requests by route and status code.", ROUTE_LABELS + ("status",))
+IN_FLIGHT = Gauge("elise_http_requests_in_flight", "HTTP requests currently being handled.")
+LATENCY = Histogram(
+    "elise_http_request_duration_seconds", "Time from request to the end of the response body.", ROUTE_LABELS
+)
+DB_QUERIES = Histogram(
+    "elise_http_request_db_queries", "SQL statements executed per request.", ROUTE_LABELS, buckets=QUERY_BUCKETS
+)
+DB_TIME = Histogram("elise_http_request_db_seconds", "Time spent in SQL statements per request.", ROUTE_LABELS)
+SERIALIZE_TIME = Histogram(
+    "elise_http_request_serialize_seconds",
+    "Time from the endpoint returning to the response starting (validation and JSON encoding).",
+    ROUTE_LABELS
+)
+
+REGISTRY = [REQUESTS, IN_FLIGHT, LATENCY, DB_QUERIES, DB_TIME, SERIALIZE_TIME]
+IN_FLIGHT.inc(amount=0)  # always exported, even before the first request
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Response adds the charset
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ============== Request Timing ==============
+
+class RequestTimer:
+    """Timestamps of one request, filled in as it goes through the middleware and route"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.endpoint_done: Optional[float] = None
+
+
+_current_timer: ContextVar[Optional[RequestTimer]] = ContextVar("current_request_timer", default=None)
+
+
+def mark_serialization_start():
+    """Start the serialize phase now; endpoints that build their own response body call this
+    before doing so (the first mark wins, TimedRoute marks again when the endpoint returns)"""
+    timer = _current_timer.get()
+    if timer is not None and timer.endpoint_done is None:
+        timer.endpoint_done = time.perf_counter()
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that notes when the endpoint function returns, so the time FastAPI then
+    spends turning its result into a response can be reported as serialization"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        call = self.dependant.call
+        if asyncio.iscoroutinefunction(call):
+            @functools.wraps(call)
+            async def timed_call(**values):
+                try:
+                    return await call(**values)
+                finally:
+                    mark_serialization_start()
+        else:
+            @functools.wraps(call)
+            def timed_call(**values):
+                try:
+                    return call(**values)
+                finally:
+                    mark_serialization_start()
+        self.dependant.call = timed_call
+
+
+def route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", OTHER_ROUTE) if route is not None else OTHER_ROUTE
+
+
+def server_timing(db: float, queries: int, app: float, serialize: Optional[float], total: float) -> str:
+    entries = [f'db;dur={db * 1000:.1f};desc="{queries} queries"', f"app;dur={app * 1000:.1f}"]
+    if serialize is not None:
+        entries.append(f"serialize;dur={serialize * 1000:.1f}")
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class MetricsMiddleware:
+    """Record latency, status, in-flight count and SQL work for every HTTP request,
+    and add a Server-Timing header to responses under `timing_prefix`"""
+
+    def __init__(self, app, timing_prefix: str = "/api/"):
+        self.app = app
+        self.timing_prefix = timing_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        timer_token = _current_timer.set(timer)
+        status_code = 500
+        timings = None  # (db, serialize) once the response has started
+        add_header = scope["path"].startswith(self.timing_prefix)
+
+        async def send_with_timing(message):
+            nonlocal status_code, timings
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                now = time.perf_counter()
+                serialize = now - timer.endpoint_done if timer.endpoint_done is not None else None
+                timings = (counter.duration, serialize)
+                if add_header:
+                    total = now - timer.started
+                    app_time = max(0.0, total - counter.duration - (serialize or 0.0))
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(counter.duration, counter.count, app_time, serialize, total))
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            with count_queries() as counter:
+                await self.app(scope, receive, send_with_timing)
+        finally:
+            IN_FLIGHT.dec()
+            _current_timer.reset(timer_token)
+            labels = (scope["method"], route_label(scope))
+            LATENCY.observe(time.perf_counter() - timer.started, *labels)
+            REQUESTS.inc(*labels, str(status_code))
+            DB_QUERIES.observe(counter.count, *labels)
+            DB_TIME.observe(timings[0] if timings else counter.duration, *labels)
+            if timings and timings[1] is not None:
+                SERIALIZE_TIME.observe(timings[1], *labels)
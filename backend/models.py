@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Numeric, ForeignKey, Enum, Index, null
 from sqlalchemy.orm import relationship
 from database import Base
+from datetime import datetime
 import enum
 
 
@@ -19,13 +20,14 @@ class Contact(Base):
     __tablename__ = "contacts"
 
     id = Column(Integer, primary_key=True, index=True)
-    care_home_name = Column(String(255), nullable=False)
+    care_home_name = Column(String(255), nullable=False, index=True)
     telephone = Column(String(50), nullable=True)
     contact_person = Column(String(255), nullable=True)
     email = Column(String(255), nullable=True)
     address = Column(Text, nullable=True)
     postcode = Column(String(20), nullable=True)
     website = Column(String(255), nullable=True)
+    change_version = Column(Integer, nullable=True, onupdate=null(), index=True)  # see changes.py
 
     # Relationships
     call_logs = relationship("CallLog", back_populates="contact", cascade="all, delete-orphan")
@@ -37,9 +39,10 @@ class CallLog(Base):
     __tablename__ = "call_logs"
 
     id = Column(Integer, primary_key=True, index=True)
-    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False)
-    call_datetime = Column(DateTime, nullable=False)
+    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False, index=True)
+    call_datetime = Column(DateTime, nullable=False, index=True)
     notes = Column(Text, nullable=True)
+    change_version = Column(Integer, nullable=True, onupdate=null(), index=True)  # see changes.py
 
     # Relationships
     contact = relationship("Contact", back_populates="call_logs")
@@ -47,14 +50,19 @@ class CallLog(Base):
 
 class Callback(Base):
     __tablename__ = "callbacks"
+    __table_args__ = (
+        # Callback lists filter on type and order by callback date
+        Index("ix_callbacks_callback_type_callback_datetime", "callback_type", "callback_datetime"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=True)
-    target_id = Column(Integer, ForeignKey("targets.id"), nullable=True)
+    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=True, index=True)
+    target_id = Column(Integer, ForeignKey("targets.id"), nullable=True, index=True)
     original_call_datetime = Column(DateTime, nullable=False)
     notes = Column(Text, nullable=True)
-    callback_datetime = Column(DateTime, nullable=False)
+    callback_datetime = Column(DateTime, nullable=False, index=True)
     callback_type = Column(Enum(CallbackType), nullable=False)
+    change_version = Column(Integer, nullable=True, onupdate=null(), index=True)  # see changes.py
 
     # Relationships
     contact = relationship("Contact", back_populates="callbacks")
@@ -63,15 +71,23 @@ class Callback(Base):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Date-window queries (calendar) filter on both ends of the booking;
+        # this also serves plain ORDER BY booking_from
+        Index("ix_bookings_booking_from_booking_to", "booking_from", "booking_to"),
+        # Fee status filters (Accounts tab, dashboard) ordered by booking date
+        Index("ix_bookings_fee_status_booking_from", "fee_status", "booking_from"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False)
+    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False, index=True)
     booking_from = Column(DateTime, nullable=False)
     booking_to = Column(DateTime, nullable=False)
     booking_type = Column(Text, nullable=True)
     more_info = Column(Text, nullable=True)
     fee_agreed = Column(Numeric(10, 2), nullable=True)
     fee_status = Column(Enum(FeeStatus), default=FeeStatus.UNPAID, nullable=False)
+    change_version = Column(Integer, nullable=True, onupdate=null(), index=True)  # see changes.py
 
     # Relationships
     contact = relationship("Contact", back_populates="bookings")
@@ -81,9 +97,59 @@ class Target(Base):
     __tablename__ = "targets"
 
     id = Column(Integer, primary_key=True, index=True)
-    care_home_name = Column(String(255), nullable=False)
+    care_home_name = Column(String(255), nullable=False, index=True)
     telephone = Column(String(50), nullable=True)
     notes = Column(Text, nullable=True)
+    change_version = Column(Integer, nullable=True, onupdate=null(), index=True)  # see changes.py
 
     # Relationships
     callbacks = relationship("Callback", back_populates="target", cascade="all, delete-orphan")   
+
+
+class BookingSummary(Base):
+    """Booking count and fee total per month, fee status and contact (contact_id 0 for
+    all contacts together), kept up to date by every booking write (see reports.py)"""
+    __tablename__ = "booking_summaries"
+    __table_args__ = (
+        # Per care home reports over a range of months
+        Index("ix_booking_summaries_contact_id_month", "contact_id", "month"),
+    )
+
+    month = Column(Date, primary_key=True)  # first day of the month of booking_from
+    fee_status = Column(Enum(FeeStatus), primary_key=True)
+    # No foreign key: a derived row must never block deleting its contact
+    contact_id = Column(Integer, primary_key=True)
+    booking_count = Column(Integer, nullable=False, default=0)
+    fee_total = Column(Numeric(12, 2), nullable=False, default=0)
+
+
+class AuthSession(Base):
+    """Login sessions for SESSION_BACKEND=database (see session_store.py)"""
+    __tablename__ = "auth_sessions"
+
+    token_hash = Column(String(64), primary_key=True)  # sha256 of the token, never the token itself
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class TableVersion(Base):
+    """A counter per table, bumped by every write to it; list and detail ETags are built from these (see etags.py)"""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class Tombstone(Base):
+    """A deleted row of one of the synced tables, kept so GET /api/changes can report the delete (see changes.py)"""
+    __tablename__ = "tombstones"
+
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String(64), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    change_version = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        # The change feed asks for each table's deletes after a version
+        Index("ix_tombstones_table_name_change_version", "table_name", "change_version"),
+    )
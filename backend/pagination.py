@@ -0,0 +1,64 @@
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from datetime import datetime
+from typing import Optional
+import base64
+import json
+
+# Page size limits for the list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    """Encode the sort key and id of the last row on a page as an opaque cursor"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str, is_datetime: bool = False):
+    """Decode a cursor back into (sort_value, id). Raises a 400 if it has been tampered with."""
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if is_datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def keyset_page(db, query, sort_column, id_column, cursor: Optional[str], limit: int,
+                      descending: bool = False, is_datetime: bool = False):
+    """
+    Apply keyset pagination to a SELECT ordered on (sort_column, id_column) and run it.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, is_datetime)
+        if descending:
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id)
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > row_id)
+            ))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column, id_column)
+
+    # Fetch one extra row to find out whether there is another page
+    rows = (await db.scalars(query.limit(limit + 1))).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    items = rows[:limit]
+    last = items[-1]
+    next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return items, next_cursor
@@ -0,0 +1,157 @@
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+import os
+import threading
+import time
+
+
+# ============== Pool Settings ==============
+
+def env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, "true" if default else "false").strip().lower() in ("1", "true", "yes", "on")
+
+
+# Defaults: recycle connections every 30 minutes and ping them on checkout,
+# so a database restart costs one reconnect instead of a failed request
+DB_POOL_SIZE = env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = env_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = env_int("DB_POOL_TIMEOUT", 30)        # seconds to wait for a free connection
+DB_POOL_RECYCLE = env_int("DB_POOL_RECYCLE", 1800)      # seconds; -1 never recycles
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+DB_CONNECT_TIMEOUT = env_int("DB_CONNECT_TIMEOUT", 10)  # seconds to open a new connection
+
+
+# ============== Pool Statistics ==============
+
+class PoolStats:
+    """Counters for one engine's connection pool, fed by pool events"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.connect_total = 0.0
+        self.connect_max = 0.0
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_connect(self, seconds: float):
+        with self._lock:
+            self.connects += 1
+            self.connect_total += seconds
+            self.connect_max = max(self.connect_max, seconds)
+
+    def record_invalidation(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            stats = {
+                "pool": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / self.waits * 1000, 3) if self.waits else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "connect_avg_ms": round(self.connect_total / self.connects * 1000, 3) if self.connects else 0.0,
+                "connect_max_ms": round(self.connect_max * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        return stats
+
+
+class TimedPoolMixin:
+    """
+    Time how long each checkout waits for a connection (including opening a new
+    one). SQLAlchemy has no event for the start of a checkout, so this wraps the
+    pool's internal _do_get; everything else is gathered from pool events.
+    """
+    stats: PoolStats = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.stats is not None:
+                self.stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.stats is not None:
+            self.stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# ============== Engine Wiring ==============
+
+def pool_options(driver: str, is_async: bool) -> dict:
+    """create_engine() keyword arguments for the configured pool (SQLite keeps its defaults)"""
+    if driver == "sqlite":
+        return {}
+    connect_args = {"timeout": DB_CONNECT_TIMEOUT} if is_async else {"connect_timeout": DB_CONNECT_TIMEOUT}
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def track_pool(engine, stats: PoolStats):
+    """Feed an engine's pool events into `stats` (pass async_engine.sync_engine for async engines)"""
+    if isinstance(engine.pool, TimedPoolMixin):
+        engine.pool.stats = stats
+
+    @event.listens_for(engine, "do_connect")
+    def _time_connect(dialect, connection_record, cargs, cparams):
+        started = time.perf_counter()
+        connection = dialect.connect(*cargs, **cparams)
+        stats.record_connect(time.perf_counter() - started)
+        return connection
+
+    @event.listens_for(engine.pool, "checkout")
+    def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.record_checkout()
+
+    @event.listens_for(engine.pool, "invalidate")
+    def _count_invalidation(dbapi_connection, connection_record, exception):
+        stats.record_invalidation()
@@ -0,0 +1,184 @@
+"""
+Callback reminders, sent to the open CRM tabs as live update events (see events.py):
+
+    data: {"type": "callback_due", "callbacks": [{...callback...}]}
+
+ReminderScheduler keeps the To Call Back callbacks due within the next WINDOW in a min-heap
+ordered by callback_datetime and sleeps until the earliest one is due. The heap is loaded
+with one indexed range query per WINDOW (ix_callbacks_callback_type_callback_datetime).
+Between loads, callback writes keep it up to date: mapper events note each changed callback
+in Session.info, and the scheduler adds, moves or drops its entry once the write commits.
+Nothing polls the callbacks table.
+
+Entries are never removed from the middle of the heap. A moved or dropped callback leaves
+a stale entry behind, and it is skipped when it reaches the top. Due callbacks are read back
+before the reminder goes out, so one changed by another worker process is not announced.
+Like the hub, the scheduler lives in this process: with several workers, each sends its
+own reminders to the tabs connected to it.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import event, select
+from sqlalchemy.orm import object_session
+from typing import Awaitable, Callable, Optional
+import asyncio
+import heapq
+import os
+
+from database import AsyncSessionLocal
+from events import hub, on_commit
+from models import Callback, CallbackType
+
+CALLBACK_REMINDERS = os.getenv("CALLBACK_REMINDERS", "true").strip().lower() in ("1", "true", "yes", "on")
+
+# How far ahead each load of the heap reaches
+WINDOW = timedelta(hours=24)
+# Longest sleep between checks of the clock (callback times are local, and clocks get changed)
+MAX_SLEEP = 300
+# Seconds to wait after a database error before trying again
+RETRY_DELAY = 60
+
+REMINDER_CHANGES_KEY = "callback_reminders"  # Session.info: {callback id: due time, or None}
+
+
+class ReminderScheduler:
+    """Sends a callback_due event when each To Call Back callback falls due"""
+
+    def __init__(self, window: timedelta = WINDOW):
+        self.window = window
+        self.due_source: Optional[Callable[[list], Awaitable[list]]] = None  # set by main.py
+        self._heap = []  # (due time, callback id)
+        self._due = {}   # callback id -> due time of its current heap entry
+        self._window_end: Optional[datetime] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(self, callback_id: int, due_at: Optional[datetime]):
+        """Add or move a callback's reminder, or drop it if due_at is None"""
+        if due_at is None or self._window_end is None or due_at >= self._window_end or due_at <= datetime.now():
+            # Later ones are picked up by the load of their window; past ones are not reminded
+            self._due.pop(callback_id, None)
+            return
+        if self._due.get(callback_id) == due_at:
+            return
+        self._due[callback_id] = due_at
+        heapq.heappush(self._heap, (due_at, callback_id))
+        self._wakeup.set()
+
+    def apply_changes(self, changes: dict):
+        """Commit hook: bring the heap up to date with committed callback writes (the
+        importer commits from a worker thread, so the heap is only touched on the loop)"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._apply, changes)
+
+    def _apply(self, changes: dict):
+        for callback_id, due_at in changes.items():
+            self.schedule(callback_id, due_at)
+
+    def pop_due(self, now: datetime) -> list:
+        """Ids of the callbacks due by now, taken off the heap"""
+        ids = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, callback_id = heapq.heappop(self._heap)
+            if self._due.get(callback_id) == due_at:
+                del self._due[callback_id]
+                ids.append(callback_id)
+        return ids
+
+    async def load_window(self, start: datetime):
+        """Add the callbacks due in [start, start + window) to the heap"""
+        end, previous_end = start + self.window, self._window_end
+        # Set first, so writes committed while the query runs are scheduled rather than dropped
+        self._window_end = end
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(select(Callback.id, Callback.callback_datetime).filter(
+                    Callback.callback_type == CallbackType.TO_CALL_BACK,
+                    Callback.callback_datetime >= start,
+                    Callback.callback_datetime < end
+                ))).all()
+        except Exception:
+            self._window_end = previous_end  # load it again on the retry
+            raise
+        for callback_id, due_at in rows:
+            # A write committed during the query is newer than what the query read
+            if callback_id not in self._due:
+                self._due[callback_id] = due_at
+                heapq.heappush(self._heap, (due_at, callback_id))
+
+    async def send(self, ids: list):
+        if not hub.has_subscribers or self.due_source is None:
+            return
+        callbacks = await self.due_source(ids)
+        if callbacks:
+            hub.publish({"type": "callback_due", "callbacks": callbacks})
+
+    async def run(self):
+        while True:
+            try:
+                self._wakeup.clear()
+                now = datetime.now()
+                if self._window_end is None:
+                    await self.load_window(now)
+                    continue
+                if now >= self._window_end:
+                    # Start where the last window ended, so nothing in between is missed
+                    await self.load_window(self._window_end)
+                    continue
+                ids = self.pop_due(now)
+                if ids:
+                    await self.send(ids)
+                    continue
+
+                next_at = min(self._heap[0][0], self._window_end) if self._heap else self._window_end
+                timeout = min((next_at - now).total_seconds(), MAX_SLEEP)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Callback reminder error: {e}")
+                await asyncio.sleep(RETRY_DELAY)
+
+    def start(self):
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = self._loop.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        self._loop = None
+        self._heap, self._due, self._window_end = [], {}, None
+
+
+scheduler = ReminderScheduler()
+on_commit(REMINDER_CHANGES_KEY, scheduler.apply_changes)
+
+
+# ============== Callback Writes ==============
+
+def _note(callback: Callback, due_at: Optional[datetime]):
+    session = object_session(callback)
+    if session is not None:
+        session.info.setdefault(REMINDER_CHANGES_KEY, {})[callback.id] = due_at
+
+
+@event.listens_for(Callback, "after_insert")
+@event.listens_for(Callback, "after_update")
+def _callback_written(mapper, connection, callback):
+    is_reminded = callback.callback_type == CallbackType.TO_CALL_BACK
+    _note(callback, callback.callback_datetime if is_reminded else None)
+
+
+@event.listens_for(Callback, "after_delete")
+def _callback_deleted(mapper, connection, callback):
+    _note(callback, None)
@@ -0,0 +1,154 @@
+"""
+Booking summaries for GET /api/reports/revenue.
+
+booking_summaries holds one row per (month, fee status, contact) with the number of bookings
+and their total fee_agreed, plus one per (month, fee status) with contact_id ALL_CONTACTS for
+the whole business: a month costs a report three rows, however many care homes had
+bookings in it. Mapper events on Booking adjust the affected rows in the same transaction
+as every insert, update and delete (contact deletes cascading to bookings included).
+
+Bulk writes that bypass the ORM (the benchmark dataset, manual SQL) leave the summaries
+stale; rebuild them from the bookings table with:
+
+    python reports.py rebuild
+"""
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import delete, event, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+import argparse
+import time
+
+from models import Booking, BookingSummary
+
+summaries = BookingSummary.__table__
+KEY_COLUMNS = (summaries.c.month, summaries.c.fee_status, summaries.c.contact_id)
+ALL_CONTACTS = 0  # contact_id of the rows totalling every contact
+CHUNK_SIZE = 5000
+
+
+def month_of(moment) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def _amount(fee) -> Decimal:
+    return Decimal(str(fee)) if fee is not None else Decimal(0)
+
+
+# ============== Incremental Updates ==============
+
+def add_to_summary(connection, key: tuple, count: int, amount: Decimal):
+    """Add count and amount (either may be negative) to the summary row for key"""
+    month, fee_status, contact_id = key
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = dialect_insert(summaries).values(
+            month=month, fee_status=fee_status, contact_id=contact_id, booking_count=count, fee_total=amount
+        )
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=list(KEY_COLUMNS),
+            set_={
+                "booking_count": summaries.c.booking_count + statement.excluded.booking_count,
+                "fee_total": summaries.c.fee_total + statement.excluded.fee_total,
+            }
+        ))
+    else:
+        matches = [column == value for column, value in zip(KEY_COLUMNS, key)]
+        result = connection.execute(update(summaries).where(*matches).values(
+            booking_count=summaries.c.booking_count + count, fee_total=summaries.c.fee_total + amount
+        ))
+        if result.rowcount == 0:
+            connection.execute(insert(summaries).values(
+                month=month, fee_status=fee_status, contact_id=contact_id, booking_count=count, fee_total=amount
+            ))
+
+    if count < 0:
+        # Months a contact no longer has bookings in drop out of the table
+        matches = [column == value for column, value in zip(KEY_COLUMNS, key)]
+        connection.execute(delete(summaries).where(*matches, summaries.c.booking_count <= 0))
+
+
+def adjust(connection, key: tuple, count: int, amount: Decimal):
+    """Apply a booking's change to its contact's row and to the all-contacts row"""
+    month, fee_status, contact_id = key
+    add_to_summary(connection, key, count, amount)
+    add_to_summary(connection, (month, fee_status, ALL_CONTACTS), count, amount)
+
+
+def _previous(state, name: str):
+    """An attribute's value as of the last flush"""
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return state.attrs[name].value
+
+
+@event.listens_for(Booking, "after_insert")
+def _booking_inserted(mapper, connection, booking):
+    key = (month_of(booking.booking_from), booking.fee_status, booking.contact_id)
+    adjust(connection, key, 1, _amount(booking.fee_agreed))
+
+
+@event.listens_for(Booking, "after_update")
+def _booking_updated(mapper, connection, booking):
+    state = inspect(booking)
+    old_key = (month_of(_previous(state, "booking_from")), _previous(state, "fee_status"), _previous(state, "contact_id"))
+    new_key = (month_of(booking.booking_from), booking.fee_status, booking.contact_id)
+    old_amount = _amount(_previous(state, "fee_agreed"))
+    new_amount = _amount(booking.fee_agreed)
+    if old_key == new_key:
+        if old_amount != new_amount:
+            adjust(connection, new_key, 0, new_amount - old_amount)
+        return
+    adjust(connection, old_key, -1, -old_amount)
+    adjust(connection, new_key, 1, new_amount)
+
+
+@event.listens_for(Booking, "after_delete")
+def _booking_deleted(mapper, connection, booking):
+    key = (month_of(booking.booking_from), booking.fee_status, booking.contact_id)
+    adjust(connection, key, -1, -_amount(booking.fee_agreed))
+
+
+# ============== Rebuild ==============
+
+def rebuild_summaries(connection) -> int:
+    """Recompute every summary row from the bookings table; returns how many rows there are"""
+    totals = {}
+    rows = connection.execution_options(yield_per=CHUNK_SIZE).execute(
+        select(Booking.booking_from, Booking.fee_status, Booking.contact_id, Booking.fee_agreed)
+    )
+    for booking_from, fee_status, contact_id, fee_agreed in rows:
+        month = month_of(booking_from)
+        for key in ((month, fee_status, contact_id), (month, fee_status, ALL_CONTACTS)):
+            count, amount = totals.get(key, (0, Decimal(0)))
+            totals[key] = (count + 1, amount + _amount(fee_agreed))
+
+    connection.execute(delete(summaries))
+    values = [
+        {"month": month, "fee_status": fee_status, "contact_id": contact_id, "booking_count": count, "fee_total": amount}
+        for (month, fee_status, contact_id), (count, amount) in totals.items()
+    ]
+    for start in range(0, len(values), CHUNK_SIZE):
+        connection.execute(insert(summaries), values[start:start + CHUNK_SIZE])
+    return len(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Booking summary maintenance")
+    parser.add_argument("command", choices=["rebuild"], help="rebuild: recompute the summaries from the bookings table")
+    parser.parse_args()
+
+    from database import engine
+
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        count = rebuild_summaries(connection)
+    print(f"Rebuilt {count} booking summary rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 from enum import Enum
 
 
@@ -161,6 +161,113 @@ class BookingResponse(BookingBase):
         from_attributes = True
 
 
+# Page Schemas (keyset-paginated list responses)
+class ContactPage(BaseModel):
+    items: List[ContactResponse]
+    next_cursor: Optional[str] = None
+
+
+class TargetPage(BaseModel):
+    items: List[TargetResponse]
+    next_cursor: Optional[str] = None
+
+
+class CallLogPage(BaseModel):
+    items: List[CallLogResponse]
+    next_cursor: Optional[str] = None
+
+
+class CallbackPage(BaseModel):
+    items: List[CallbackResponse]
+    next_cursor: Optional[str] = None
+
+
+class BookingPage(BaseModel):
+    items: List[BookingResponse]
+    next_cursor: Optional[str] = None
+
+
+# Search Schemas
+class SearchResult(BaseModel):
+    type: str  # "contact" or "target"
+    score: float
+    contact: Optional[ContactResponse] = None
+    target: Optional[TargetResponse] = None
+
+
+# Import Schemas
+class ImportRowError(BaseModel):
+    row: int  # 1-based record number in the upload (header excluded)
+    error: str
+
+
+class ImportResult(BaseModel):
+    total: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+
+
+# Change Feed Schemas
+class TableChanges(BaseModel):
+    upserted: List[Dict[str, Any]] = []  # rows created or updated, as the resource's *Response
+    deleted: List[int] = []              # ids of deleted rows
+
+
+class ChangeFeed(BaseModel):
+    cursor: str   # pass as `since` on the next call
+    reset: bool   # the changes could not be listed: reload everything, then carry on from `cursor`
+    changes: Dict[str, TableChanges]  # by table: contacts, call_logs, callbacks, bookings, targets
+
+
+# Report Schemas
+class RevenueTotal(BaseModel):
+    fee_status: FeeStatusEnum
+    bookings: int
+    fees: float
+
+
+class MonthRevenue(BaseModel):
+    month: str  # "YYYY-MM"
+    fee_status: FeeStatusEnum
+    bookings: int
+    fees: float
+
+
+class ContactRevenue(BaseModel):
+    contact_id: int
+    care_home_name: str
+    fee_status: FeeStatusEnum
+    bookings: int
+    fees: float
+
+
+class MonthRevenueReport(BaseModel):
+    group_by: Literal["month"]
+    rows: List[MonthRevenue]
+    totals: List[RevenueTotal]  # per fee status, over every row
+
+
+class ContactRevenueReport(BaseModel):
+    group_by: Literal["contact"]
+    rows: List[ContactRevenue]
+    totals: List[RevenueTotal]  # per fee status, over every row
+
+
+RevenueReport = Union[MonthRevenueReport, ContactRevenueReport]
+
+
+# Availability Schemas
+class FreeSlot(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class Availability(BaseModel):
+    duration: int  # minutes: the shortest slot listed
+    slots: List[FreeSlot]
+
+
 # Auth Schema
 class PasswordCheck(BaseModel):
     password: str
@@ -0,0 +1,204 @@
+from sqlalchemy import func, literal, literal_column, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import threading
+
+from database import engine
+from models import Contact, Target
+
+# Minimum score for a fuzzy (non-substring) match
+SIMILARITY_THRESHOLD = 0.4
+
+# The text each row is searched on. On Postgres these exact expressions carry
+# GIN trigram indexes (alembic revisions 003 and 006), so they must stay in sync with it.
+CONTACT_DOCUMENT = (
+    "coalesce(care_home_name, '') || ' ' || coalesce(contact_person, '') || ' ' || "
+    "coalesce(telephone, '') || ' ' || coalesce(email, '') || ' ' || coalesce(postcode, '')"
+)
+TARGET_DOCUMENT = (
+    "coalesce(care_home_name, '') || ' ' || coalesce(telephone, '') || ' ' || coalesce(notes, '')"
+)
+
+
+def is_postgres() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+LIKE_ESCAPE = "\\"
+
+
+def contains_pattern(q: str) -> str:
+    """LIKE pattern matching q anywhere, with % and _ in q matched literally (use with
+    escape=LIKE_ESCAPE)"""
+    escaped = q.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", LIKE_ESCAPE + "%").replace("_", LIKE_ESCAPE + "_")
+    return f"%{escaped}%"
+
+
+# ============== Trigram Helpers ==============
+
+def trigrams(value: str) -> set:
+    """Trigrams of each word, padded the way pg_trgm does it"""
+    grams = set()
+    for word in value.lower().split():
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def contact_document(contact) -> str:
+    return " ".join(filter(None, [
+        contact.care_home_name, contact.contact_person, contact.telephone, contact.email, contact.postcode
+    ]))
+
+
+def target_document(target) -> str:
+    return " ".join(filter(None, [target.care_home_name, target.telephone, target.notes]))
+
+
+# ============== In-Memory Index (non-Postgres) ==============
+
+class TrigramIndex:
+    """
+    Inverted trigram index over contacts and targets, for databases without pg_trgm.
+    Built from the database on first search and kept current by the write handlers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = asyncio.Lock()
+        self._built = False
+        self._documents = {}  # (kind, id) -> (lowercased text, trigrams)
+        self._postings = {}   # trigram -> set of (kind, id)
+
+    def _add(self, key, document: str):
+        grams = trigrams(document)
+        self._documents[key] = (document.lower(), grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def _remove(self, key):
+        entry = self._documents.pop(key, None)
+        if entry is None:
+            return
+        for gram in entry[1]:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    async def _build(self, db: AsyncSession):
+        """Load every contact and target, then swap them in under the lock"""
+        contacts = (await db.scalars(select(Contact))).all()
+        targets = (await db.scalars(select(Target))).all()
+        with self._lock:
+            for contact in contacts:
+                self._add(("contact", contact.id), contact_document(contact))
+            for target in targets:
+                self._add(("target", target.id), target_document(target))
+            self._built = True
+
+    def upsert(self, kind: str, row):
+        """Re-index a contact or target after it is created or updated"""
+        with self._lock:
+            if not self._built:
+                return  # picked up when the index is first built
+            self._remove((kind, row.id))
+            document = contact_document(row) if kind == "contact" else target_document(row)
+            self._add((kind, row.id), document)
+
+    def reset(self):
+        """Forget everything; the index is rebuilt on the next search (e.g. after a bulk import)"""
+        with self._lock:
+            self._documents.clear()
+            self._postings.clear()
+            self._built = False
+
+    def remove(self, kind: str, row_id: int):
+        with self._lock:
+            if self._built:
+                self._remove((kind, row_id))
+
+    async def search(self, db: AsyncSession, q: str, kinds, limit: int):
+        """Return [(kind, id, score)] best first. Substring matches always score 1.0."""
+        if not self._built:
+            async with self._build_lock:
+                if not self._built:
+                    await self._build(db)
+
+        with self._lock:
+            needle = q.lower()
+            query_grams = trigrams(q)
+            shared = {}
+            for gram in query_grams:
+                for key in self._postings.get(gram, ()):
+                    shared[key] = shared.get(key, 0) + 1
+
+            results = []
+            for key, count in shared.items():
+                if key[0] not in kinds:
+                    continue
+                document = self._documents[key][0]
+                score = 1.0 if needle in document else count / len(query_grams)
+                if score >= SIMILARITY_THRESHOLD:
+                    results.append((key[0], key[1], score))
+
+        results.sort(key=lambda r: r[2], reverse=True)
+        return results[:limit]
+
+
+search_index = TrigramIndex()
+
+
+# ============== Search ==============
+
+def postgres_search_query(model, document_sql: str, q: str, limit: int):
+    """Trigram match ('<%' word similarity, or plain substring) served by the GIN index"""
+    document = literal_column(f"({document_sql})")
+    score = func.word_similarity(q, document).label("score")
+    return select(model, score).filter(or_(
+        literal(q).op("<%")(document),
+        document.ilike(contains_pattern(q), escape=LIKE_ESCAPE)
+    )).order_by(score.desc()).limit(limit)
+
+
+async def _postgres_search(db: AsyncSession, model, document_sql: str, q: str, limit: int):
+    document_text = contact_document if model is Contact else target_document
+    needle = q.lower()
+    rows = await db.execute(postgres_search_query(model, document_sql, q, limit))
+    return [
+        (row, 1.0 if needle in document_text(row).lower() else float(score))
+        for row, score in rows
+    ]
+
+
+async def search(db: AsyncSession, q: str, kinds, limit: int):
+    """
+    Rank contacts and targets against a free-text query.
+    Returns [(kind, row, score)] best first.
+    """
+    results = []
+
+    if is_postgres():
+        # Lower the '<%' cut-off from its 0.6 default so single typos still match
+        await db.execute(text(f"SET LOCAL pg_trgm.word_similarity_threshold = {SIMILARITY_THRESHOLD}"))
+        if "contact" in kinds:
+            results += [("contact", row, score) for row, score in await _postgres_search(db, Contact, CONTACT_DOCUMENT, q, limit)]
+        if "target" in kinds:
+            results += [("target", row, score) for row, score in await _postgres_search(db, Target, TARGET_DOCUMENT, q, limit)]
+    else:
+        matches = await search_index.search(db, q, kinds, limit)
+        contact_ids = [row_id for kind, row_id, _ in matches if kind == "contact"]
+        target_ids = [row_id for kind, row_id, _ in matches if kind == "target"]
+        rows = {}
+        if contact_ids:
+            contacts = await db.scalars(select(Contact).filter(Contact.id.in_(contact_ids)))
+            rows.update({("contact", c.id): c for c in contacts})
+        if target_ids:
+            targets = await db.scalars(select(Target).filter(Target.id.in_(target_ids)))
+            rows.update({("target", t.id): t for t in targets})
+        results = [(kind, rows[(kind, row_id)], score) for kind, row_id, score in matches if (kind, row_id) in rows]
+
+    results.sort(key=lambda r: r[2], reverse=True)
+    return results[:limit]
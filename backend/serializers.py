@@ -0,0 +1,115 @@
+"""
+Fast JSON path for large list responses.
+
+With a response_model, FastAPI validates every ORM row into a Pydantic model, dumps it back
+to a dict and then encodes that with the json module. Rows from our own tables already
+satisfy the *Response schemas, so list endpoints can instead read the attributes straight
+into dicts (RowSerializer) and encode them with orjson (FastJSONResponse).
+
+FAST_SERIALIZATION=false switches the list endpoints back to the response_model path.
+The response_model stays declared either way, so the OpenAPI docs are unchanged.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from fastapi.responses import JSONResponse
+from operator import attrgetter, itemgetter
+from pydantic import BaseModel
+from typing import Any, Optional, Union, get_args, get_origin
+import enum
+import os
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the json module (still skipping validation)
+    orjson = None
+
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "true").strip().lower() in ("1", "true", "yes", "on")
+
+
+# ============== Responses ==============
+
+def _default(value):
+    # Types orjson does not encode itself
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson (UTC datetimes end in 'Z', as Pydantic writes them)"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+# ============== Row Serializers ==============
+
+def _unwrap_optional(annotation):
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _enum_value(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _converter(annotation):
+    """Function turning an ORM attribute into the JSON value the schema field produces
+    (None when the value can be used as it is)"""
+    annotation = _unwrap_optional(annotation)
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return RowSerializer(annotation)
+        if issubclass(annotation, enum.Enum):
+            # The models' enums are separate classes from the schemas' enums; both share values
+            return _enum_value
+        if issubclass(annotation, bool):
+            return None
+        if issubclass(annotation, float):
+            return float  # Numeric columns load as Decimal
+        if orjson is None and issubclass(annotation, (datetime, date, time)):
+            return lambda value: value.isoformat()
+    return None
+
+
+class RowSerializer:
+    """
+    Build the dict a Pydantic schema would produce for an ORM row, without validating it.
+    Fields (including nested schemas, e.g. a booking's contact) are read from the schema
+    once, so the serializer follows any change to the schema.
+    """
+
+    def __init__(self, schema: type):
+        self.schema = schema
+        self.names = tuple(schema.model_fields)
+        self._getter = attrgetter(*self.names)
+        self._dict_getter = itemgetter(*self.names)
+        self._converters = []
+        for name, field in schema.model_fields.items():
+            converter = _converter(field.annotation)
+            if converter is not None:
+                self._converters.append((name, converter))
+
+    def __call__(self, row) -> Optional[dict]:
+        if row is None:
+            return None
+        try:
+            # Loaded column values sit in the instance __dict__; reading them there skips
+            # SQLAlchemy's attribute instrumentation, the main per-row cost left
+            values = self._dict_getter(row.__dict__)
+        except KeyError:
+            values = self._getter(row)  # something unloaded: let SQLAlchemy load it
+        data = dict(zip(self.names, values)) if len(self.names) > 1 else {self.names[0]: values}
+        for name, convert in self._converters:
+            value = data[name]
+            if value is not None:
+                data[name] = convert(value)
+        return data
+
+    def many(self, rows) -> list:
+        return [self(row) for row in rows]
@@ -0,0 +1,207 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+
+from database import AsyncSessionLocal
+from models import AuthSession
+
+
+def generate_session_token() -> str:
+    """
+    Generate a secure random session token.
+    """
+    return secrets.token_urlsafe(32)
+
+
+class SessionBackend(ABC):
+    """Where login sessions live. Every backend expires sessions after `ttl` seconds."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+
+    @abstractmethod
+    async def create(self) -> str:
+        """Start a session and return its token"""
+
+    @abstractmethod
+    async def validate(self, token: str) -> bool:
+        """True if the token belongs to a live session"""
+
+    @abstractmethod
+    async def invalidate(self, token: str) -> bool:
+        """End the token's session (logout); True if there was one"""
+
+
+# ============== In-Memory ==============
+
+class MemorySessionBackend(SessionBackend):
+    """
+    Sessions in a dict in this process, swept by a background thread.
+    Fast, but each worker has its own sessions and a restart logs everyone out.
+    """
+
+    def __init__(self, ttl: float, sweep_interval: float = 300):
+        super().__init__(ttl)
+        self._sessions = {}  # token -> expiry (time.monotonic)
+        self._lock = threading.Lock()
+        self._sweeper = threading.Thread(target=self._sweep_forever, args=(sweep_interval,), daemon=True)
+        self._sweeper.start()
+
+    def _sweep_forever(self, interval: float):
+        while True:
+            time.sleep(interval)
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Drop expired sessions; returns how many were removed"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [token for token, expires_at in self._sessions.items() if expires_at <= now]
+            for token in expired:
+                del self._sessions[token]
+        return len(expired)
+
+    async def create(self) -> str:
+        token = generate_session_token()
+        with self._lock:
+            self._sessions[token] = time.monotonic() + self.ttl
+        return token
+
+    async def validate(self, token: str) -> bool:
+        with self._lock:
+            expires_at = self._sessions.get(token)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    async def invalidate(self, token: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(token, None) is not None
+
+
+# ============== Database ==============
+
+class DatabaseSessionBackend(SessionBackend):
+    """
+    Sessions in the auth_sessions table, shared by every worker and kept across restarts.
+    Lookups go through a small LRU cache; cached entries are re-read after `cache_ttl`
+    seconds so a logout in another worker takes effect within that window.
+    """
+
+    def __init__(self, ttl: float, cache_size: int = 1024, cache_ttl: float = 60):
+        super().__init__(ttl)
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache = OrderedDict()  # token hash -> (session expiry, cached until)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        # Only a hash is stored, so a leaked table cannot be replayed as tokens
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, token_hash: str):
+        with self._lock:
+            entry = self._cache.get(token_hash)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._cache[token_hash]
+                return None
+            self._cache.move_to_end(token_hash)
+            return entry[0]
+
+    def _cache_put(self, token_hash: str, expires_at: datetime):
+        with self._lock:
+            self._cache[token_hash] = (expires_at, time.monotonic() + self.cache_ttl)
+            self._cache.move_to_end(token_hash)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_drop(self, token_hash: str):
+        with self._lock:
+            self._cache.pop(token_hash, None)
+
+    async def create(self) -> str:
+        token = generate_session_token()
+        token_hash = self._hash(token)
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl)
+        async with AsyncSessionLocal() as db:
+            # Logins are rare, so this is a cheap place to clear out expired sessions
+            await db.execute(delete(AuthSession).where(AuthSession.expires_at <= now))
+            db.add(AuthSession(token_hash=token_hash, expires_at=expires_at))
+            await db.commit()
+        self._cache_put(token_hash, expires_at)
+        return token
+
+    async def validate(self, token: str) -> bool:
+        token_hash = self._hash(token)
+        expires_at = self._cache_get(token_hash)
+        if expires_at is None:
+            async with AsyncSessionLocal() as db:
+                expires_at = await db.scalar(
+                    select(AuthSession.expires_at).where(AuthSession.token_hash == token_hash)
+                )
+            if expires_at is None:
+                return False
+            self._cache_put(token_hash, expires_at)
+        return expires_at > datetime.utcnow()
+
+    async def invalidate(self, token: str) -> bool:
+        token_hash = self._hash(token)
+        self._cache_drop(token_hash)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(delete(AuthSession).where(AuthSession.token_hash == token_hash))
+            await db.commit()
+        return result.rowcount > 0
+
+
+# ============== Signed Tokens ==============
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class SignedTokenBackend(SessionBackend):
+    """
+    Stateless tokens: the expiry is inside the token, signed with HMAC-SHA256.
+    Validation is a signature check with no lookup, so any worker accepts any token.
+    Logout cannot revoke a token before it expires (the client just forgets it),
+    so keep SESSION_TTL short with this backend. Changing the secret logs everyone out.
+    """
+
+    def __init__(self, ttl: float, secret: bytes):
+        super().__init__(ttl)
+        self._secret = secret
+
+    def _sign(self, payload: str) -> str:
+        return _b64encode(hmac.new(self._secret, payload.encode("utf-8"), hashlib.sha256).digest())
+
+    async def create(self) -> str:
+        claims = {"exp": int(time.time() + self.ttl), "nonce": secrets.token_urlsafe(8)}
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        return f"{payload}.{self._sign(payload)}"
+
+    async def validate(self, token: str) -> bool:
+        payload, _, signature = token.partition(".")
+        if not payload or not hmac.compare_digest(signature.encode("utf-8"), self._sign(payload).encode("ascii")):
+            return False
+        try:
+            claims = json.loads(_b64decode(payload))
+            return float(claims["exp"]) > time.time()
+        except (ValueError, KeyError, TypeError):
+            return False
+
+    async def invalidate(self, token: str) -> bool:
+        return await self.validate(token)
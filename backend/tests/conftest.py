@@ -0,0 +1,38 @@
+"""
+Test setup: a throwaway SQLite database, migrated before the first test, with the app
+driven in-process through httpx (pip install pytest httpx aiosqlite).
+
+The environment is set here because database.py reads DATABASE_URL when it is imported.
+"""
+import os
+import sys
+import tempfile
+
+TEST_DIR = tempfile.mkdtemp(prefix="elise-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+os.environ["DB_AUTO_MIGRATE"] = "true"
+os.environ["SESSION_BACKEND"] = "memory"
+os.environ["CALLBACK_REMINDERS"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from auth import CRM_PASSWORD
+from database import check_schema_revision
+import main
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_database():
+    check_schema_revision()
+
+
+@pytest.fixture
+def client():
+    """A logged-in client for the app. Tests share one database, so each creates the rows it
+    needs rather than relying on ids."""
+    with TestClient(main.app) as client:
+        token = client.post("/api/auth/login", json={"password": CRM_PASSWORD}).json()["token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+        yield client
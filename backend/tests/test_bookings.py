@@ -0,0 +1,80 @@
+"""
+Booking periods are half-open, [booking_from, booking_to): a booking that ends before it
+starts is rejected with a 400, one that overlaps another with a 409, even when several
+arrive at once, and one may start the minute the previous one ends.
+"""
+from datetime import datetime, timedelta
+import asyncio
+
+import httpx
+
+from auth import CRM_PASSWORD
+import main
+
+# Far from the bookings other tests create; each test uses its own day
+DAY = datetime(2032, 3, 1, 10, 0)
+
+
+def create_contact(client) -> int:
+    response = client.post("/api/contacts", json={"care_home_name": "Booking Home"})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def booking_body(contact_id: int, start: datetime, hours: float = 1) -> dict:
+    return {"contact_id": contact_id, "booking_from": start.isoformat(),
+            "booking_to": (start + timedelta(hours=hours)).isoformat()}
+
+
+def test_overlapping_booking_is_rejected(client):
+    contact_id = create_contact(client)
+    first = client.post("/api/bookings", json=booking_body(contact_id, DAY, hours=2))
+    assert first.status_code == 201
+
+    response = client.post("/api/bookings", json=booking_body(contact_id, DAY + timedelta(hours=1)))
+    assert response.status_code == 409
+    assert str(first.json()["id"]) in response.json()["detail"]
+
+
+def test_back_to_back_bookings_are_accepted(client):
+    contact_id = create_contact(client)
+    start = DAY + timedelta(days=1)
+    assert client.post("/api/bookings", json=booking_body(contact_id, start)).status_code == 201
+    assert client.post("/api/bookings", json=booking_body(contact_id, start + timedelta(hours=1))).status_code == 201
+    assert client.post("/api/bookings", json=booking_body(contact_id, start - timedelta(hours=1))).status_code == 201
+
+
+def test_booking_must_end_after_it_starts(client):
+    contact_id = create_contact(client)
+    start = DAY + timedelta(days=2)
+    for hours in (0, -1):
+        response = client.post("/api/bookings", json=booking_body(contact_id, start, hours=hours))
+        assert response.status_code == 400
+
+
+def test_update_into_another_booking_is_rejected(client):
+    contact_id = create_contact(client)
+    start = DAY + timedelta(days=3)
+    assert client.post("/api/bookings", json=booking_body(contact_id, start)).status_code == 201
+    later = client.post("/api/bookings", json=booking_body(contact_id, start + timedelta(hours=3))).json()
+
+    response = client.put(f"/api/bookings/{later['id']}", json={"booking_from": (start + timedelta(minutes=30)).isoformat()})
+    assert response.status_code == 409
+    # Moving it within its own period is fine
+    response = client.put(f"/api/bookings/{later['id']}", json={"booking_to": (start + timedelta(hours=3, minutes=30)).isoformat()})
+    assert response.status_code == 200
+
+
+async def create_at_once(body: dict, count: int) -> list:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        token = (await client.post("/api/auth/login", json={"password": CRM_PASSWORD})).json()["token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        responses = await asyncio.gather(*[client.post("/api/bookings", json=body, headers=headers) for _ in range(count)])
+    return sorted(response.status_code for response in responses)
+
+
+def test_concurrent_overlapping_creates_book_once(client):
+    contact_id = create_contact(client)
+    body = booking_body(contact_id, DAY + timedelta(days=4))
+    assert asyncio.run(create_at_once(body, 5)) == [201, 409, 409, 409, 409]
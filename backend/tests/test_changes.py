@@ -0,0 +1,94 @@
+"""
+The change feed: rows written after a cursor are listed once their transaction commits,
+however long it ran, deletes are listed from their tombstones, and a cursor the feed cannot
+serve (none, unknown, expired, or too many changes behind) gets a reset.
+"""
+from datetime import datetime
+
+import changes
+from database import SessionLocal
+from etags import bump_versions
+from models import Contact
+
+
+def feed(client, since=None) -> dict:
+    params = {"since": since} if since is not None else {}
+    response = client.get("/api/changes", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def create_contact(client, name="Feed Home") -> dict:
+    response = client.post("/api/contacts", json={"care_home_name": name})
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_without_a_cursor_resets(client):
+    body = feed(client)
+    assert body["reset"] is True
+    assert body["changes"] == {}
+
+
+def test_lists_writes_after_the_cursor(client):
+    contact = create_contact(client)
+    cursor = feed(client)["cursor"]
+
+    assert client.put(f"/api/contacts/{contact['id']}", json={"care_home_name": "Feed Home Renamed"}).status_code == 200
+    added = create_contact(client, "Feed Home Added")
+
+    body = feed(client, cursor)
+    assert body["reset"] is False
+    assert [row["id"] for row in body["changes"]["contacts"]["upserted"]] == [contact["id"], added["id"]]
+    assert body["changes"]["contacts"]["upserted"][0]["care_home_name"] == "Feed Home Renamed"
+    assert feed(client, body["cursor"])["changes"] == {}
+
+
+def test_delete_is_listed_from_its_tombstone(client):
+    contact = create_contact(client)
+    cursor = feed(client)["cursor"]
+
+    assert client.delete(f"/api/contacts/{contact['id']}").status_code == 200
+
+    body = feed(client, cursor)
+    assert body["reset"] is False
+    assert body["changes"]["contacts"] == {"upserted": [], "deleted": [contact["id"]]}
+
+
+def test_write_committed_after_the_cursor_is_listed(client):
+    # The row is written before the cursor is handed out but committed after it
+    with SessionLocal() as db:
+        contact = Contact(care_home_name="Feed Home Slow")
+        db.add(contact)
+        db.flush()
+        bump_versions(db, "contacts")
+        cursor = feed(client)["cursor"]
+        db.commit()
+        contact_id = contact.id
+
+    body = feed(client, cursor)
+    assert [row["id"] for row in body["changes"]["contacts"]["upserted"]] == [contact_id]
+
+
+def test_unknown_cursor_resets(client):
+    for cursor in ("not a cursor", datetime.utcnow().isoformat()):
+        body = feed(client, cursor)
+        assert body["reset"] is True
+        assert feed(client, body["cursor"])["reset"] is False
+
+
+def test_expired_cursor_resets(client):
+    _, versions = changes.decode_cursor(feed(client)["cursor"])
+    expired = changes.encode_cursor(datetime.utcnow() - changes.TOMBSTONE_RETENTION, versions)
+    assert feed(client, expired)["reset"] is True
+
+
+def test_too_many_changes_resets(client, monkeypatch):
+    monkeypatch.setattr(changes, "MAX_CHANGES", 2)
+    cursor = feed(client)["cursor"]
+    for name in ("Feed Home 1", "Feed Home 2"):
+        create_contact(client, name)
+    assert feed(client, cursor)["reset"] is False
+
+    create_contact(client, "Feed Home 3")
+    assert feed(client, cursor)["reset"] is True
@@ -0,0 +1,77 @@
+"""
+Conditional GETs: an ETag is returned with every list and detail response, a matching
+If-None-Match gets a 304, and a committed write to any table a response is built from
+changes the ETag of that response.
+"""
+
+
+def get(client, path, etag=None, **params):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get(path, params=params, headers=headers)
+
+
+def create_contact(client, name="ETag Home") -> dict:
+    response = client.post("/api/contacts", json={"care_home_name": name})
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_unchanged_list_is_not_modified(client):
+    create_contact(client)
+    first = get(client, "/api/contacts", letter="E")
+    etag = first.headers["ETag"]
+
+    again = get(client, "/api/contacts", etag, letter="E")
+    assert again.status_code == 304
+    # Compression may mark one of them weak (W/); If-None-Match compares them weakly
+    assert again.headers["ETag"].removeprefix("W/") == etag.removeprefix("W/")
+    assert again.content == b""
+
+
+def test_etag_depends_on_the_query(client):
+    create_contact(client)
+    assert get(client, "/api/contacts", letter="E").headers["ETag"] != get(client, "/api/contacts", letter="F").headers["ETag"]
+
+
+def test_write_changes_the_etag(client):
+    etag = get(client, "/api/contacts").headers["ETag"]
+    contact = create_contact(client)
+
+    response = get(client, "/api/contacts", etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    etag = response.headers["ETag"]
+    client.put(f"/api/contacts/{contact['id']}", json={"telephone": "0141 555 0000"})
+    assert get(client, "/api/contacts", etag).status_code == 200
+
+
+def test_embedded_rows_invalidate_the_list(client):
+    # Bookings embed their contact, so renaming the contact must change the bookings ETag
+    contact = create_contact(client, "ETag Venue")
+    client.post("/api/bookings", json={
+        "contact_id": contact["id"], "booking_from": "2031-05-01T10:00", "booking_to": "2031-05-01T11:00"
+    })
+    etag = get(client, "/api/bookings").headers["ETag"]
+    assert get(client, "/api/bookings", etag).status_code == 304
+
+    client.put(f"/api/contacts/{contact['id']}", json={"care_home_name": "ETag Venue Renamed"})
+    assert get(client, "/api/bookings", etag).status_code == 200
+
+
+def test_failed_write_keeps_the_etag(client):
+    etag = get(client, "/api/targets").headers["ETag"]
+    assert client.put("/api/targets/999999", json={"notes": "missing"}).status_code == 404
+    assert get(client, "/api/targets", etag).status_code == 304
+
+
+def test_detail_etag(client):
+    contact = create_contact(client)
+    path = f"/api/contacts/{contact['id']}"
+    etag = get(client, path).headers["ETag"]
+    assert get(client, path, etag).status_code == 304
+
+    client.put(path, json={"postcode": "G1 1AA"})
+    response = get(client, path, etag)
+    assert response.status_code == 200
+    assert response.json()["postcode"] == "G1 1AA"
@@ -0,0 +1,88 @@
+"""
+List endpoints join the contacts and targets their rows embed, so the SQL statements behind
+a page must not grow with the rows on it: an N+1 regression adds one statement per row.
+"""
+from datetime import datetime, timedelta
+import asyncio
+
+import httpx
+
+from auth import CRM_PASSWORD
+from database import SessionLocal, count_queries
+from models import Booking, Callback, CallbackType, CallLog, Contact, Target
+from pagination import MAX_PAGE_SIZE
+from search import search_index
+import main
+
+# Statements a list request may run: the ETag version lookup and the page itself (the
+# per-contact lists also look up the contact; search looks up contacts and targets)
+QUERY_BOUND = 3
+
+FIRST = datetime(2026, 1, 5, 9, 0)
+LIST_ENDPOINTS = [
+    ("/api/contacts", {}),
+    ("/api/targets", {}),
+    ("/api/call-logs", {}),
+    ("/api/callbacks", {}),
+    ("/api/callbacks/due", {"before": "2100-01-01T00:00:00"}),
+    ("/api/bookings", {}),
+    ("/api/contacts/1/bookings", {"when": "past"}),  # the seeded bookings are all in the past
+    ("/api/contacts/1/callbacks", {}),
+    ("/api/contacts/1/call-logs", {}),
+    ("/api/search", {"q": "home", "limit": 100}),
+]
+
+
+def seed(start: int, count: int):
+    """Rows start..start+count-1: a contact and target each, with a call log, callback and
+    booking for each contact, plus the same for contact 1 (the per-contact lists), and a
+    callback for each target"""
+    with SessionLocal() as db:
+        for i in range(start, start + count):
+            contact = Contact(care_home_name=f"Test Home {i}")
+            target = Target(care_home_name=f"Target Home {i}")
+            db.add_all([contact, target])
+            db.flush()
+            moment = FIRST + timedelta(days=i)
+            for contact_id in {contact.id, 1}:
+                db.add(CallLog(contact_id=contact_id, call_datetime=moment))
+                db.add(Callback(contact_id=contact_id, original_call_datetime=moment,
+                                callback_datetime=moment, callback_type=CallbackType.TO_CALL_BACK))
+            # A callback belongs to a contact or a target, never both
+            db.add(Callback(target_id=target.id, original_call_datetime=moment,
+                            callback_datetime=moment, callback_type=CallbackType.AWAITING_CALLBACK))
+            # One booking a day (overlapping bookings are rejected by the API, not the table)
+            db.add(Booking(contact_id=contact.id, booking_from=moment, booking_to=moment + timedelta(hours=1)))
+            db.add(Booking(contact_id=1, booking_from=moment + timedelta(hours=2),
+                           booking_to=moment + timedelta(hours=3)))
+        db.commit()
+    search_index.reset()  # written behind the API's back
+
+
+async def statement_counts() -> dict:
+    """SQL statements run by one request to each list endpoint (a full page of rows)"""
+    counts = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        token = (await client.post("/api/auth/login", json={"password": CRM_PASSWORD})).json()["token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        # Warm up first: on SQLite the first search loads the in-memory search index
+        for path, params in LIST_ENDPOINTS:
+            await client.get(path, params=params, headers=headers)
+        for path, params in LIST_ENDPOINTS:
+            with count_queries() as counter:
+                response = await client.get(path, params={"limit": MAX_PAGE_SIZE, **params}, headers=headers)
+            assert response.status_code == 200, f"{path}: {response.status_code} {response.text}"
+            counts[path] = counter.count
+    return counts
+
+
+def test_list_queries_do_not_grow_with_rows():
+    seed(0, 5)
+    few = asyncio.run(statement_counts())
+    seed(5, 45)
+    many = asyncio.run(statement_counts())
+
+    for path, count in many.items():
+        assert count <= QUERY_BOUND, f"{path} ran {count} SQL statements (bound {QUERY_BOUND})"
+        assert count == few[path], f"{path} ran {few[path]} statements for 5 rows and {count} for 50"